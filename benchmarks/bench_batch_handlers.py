@@ -0,0 +1,102 @@
+"""聚合类处理器逐事件调用与按组 ``handle_batch`` 调用的对比。
+
+运行方式::
+
+    python -m benchmarks.bench_batch_handlers
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Iterable, Sequence
+
+from benchmarks.bench_emit_many import _make_events
+from main import build_state_tree, populate_repository
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    EventABC,
+    EventContext,
+    InMemoryEventConfigRepository,
+    SkillHitMessage,
+)
+
+EVENTS = 4_096
+# 每种事件类型上注册的统计处理器数量
+AGGREGATORS = 8
+
+
+class _Stats(EventHandler[BaseEventMessage]):
+    """不输出的统计处理器，只计数。"""
+
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.damage = 0
+        self.events = 0
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        self.calls += 1
+        self._count(event)
+        return ()
+
+    def _count(self, event: EventABC[BaseEventMessage]) -> None:
+        self.events += 1
+        message = event.event_message
+        if isinstance(message, SkillHitMessage):
+            self.damage += message.damage
+
+
+class _BatchedStats(_Stats):
+    def handle_batch(
+        self,
+        events: Sequence[EventABC[BaseEventMessage]],
+        contexts: Sequence[EventContext],
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        self.calls += 1
+        for event in events:
+            self._count(event)
+        return ()
+
+
+def _run(handler_type: type[_Stats]) -> tuple[float, int]:
+    repo = InMemoryEventConfigRepository()
+    populate_repository(repo)
+    registry = EventHandlerRegistry()
+    handlers = []
+    for event_type in (SkillEventTypes.ON_HIT, EventTypes.PLAYER_HEALTH_CHANGED):
+        for _ in range(AGGREGATORS):
+            handler = handler_type()
+            registry.register(event_type, handler)
+            handlers.append(handler)
+    dispatcher = EventDispatcher(build_state_tree(repo), registry)
+    events = _make_events(EVENTS)
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+
+    start = time.perf_counter()
+    dispatcher.emit_many(events, context)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(handler.calls for handler in handlers)
+
+
+def main() -> None:
+    print(f"{EVENTS} root events, {AGGREGATORS} aggregators per event type")
+    for label, handler_type in (("per-event", _Stats), ("handle_batch", _BatchedStats)):
+        elapsed, calls = min(_run(handler_type) for _ in range(3))
+        print(
+            f"  {label:12}: {elapsed / EVENTS * 1e6:6.2f} us/root event, "
+            f"{calls} handler calls"
+        )
+
+
+if __name__ == "__main__":
+    main()
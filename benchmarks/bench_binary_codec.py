@@ -0,0 +1,123 @@
+"""二进制事件编解码与 pydantic JSON 的对比：体积、批量编码/解码吞吐。
+
+运行方式::
+
+    python -m benchmarks.bench_binary_codec
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Callable
+
+from src.event_types import EventTypes, SkillEventTypes, event_type_from_value
+from src.events import (
+    BinaryEventCodec,
+    Event,
+    PlayerHealthChangedMessage,
+    PlayerStateChangedMessage,
+    SkillHitMessage,
+)
+from src.events.base import BaseEventMessage
+
+EVENTS = 30_000
+
+
+def _make_events() -> list[Event[Any]]:
+    events: list[Event[Any]] = []
+    for index in range(EVENTS // 3):
+        player = f"player-{index % 100:03d}"
+        events.append(
+            Event(
+                SkillEventTypes.ON_HIT,
+                SkillHitMessage(skill_id="fireball", target_id=player, damage=index),
+            )
+        )
+        events.append(
+            Event(
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                PlayerHealthChangedMessage(
+                    player_id=player, value=-index, source_event="skill.on_hit"
+                ),
+            )
+        )
+        events.append(
+            Event(
+                EventTypes.PLAYER_STATE_CHANGED,
+                PlayerStateChangedMessage(
+                    player_id=player, state="dead", trail=["root", "player_flow"]
+                ),
+            )
+        )
+    return events
+
+
+_MESSAGE_TYPES: dict[str, type[BaseEventMessage]] = {
+    cls.__name__: cls
+    for cls in (SkillHitMessage, PlayerHealthChangedMessage, PlayerStateChangedMessage)
+}
+
+
+def _json_encode(events: list[Event[Any]]) -> bytes:
+    return json.dumps(
+        [
+            [
+                event.event_type.value,
+                type(event.event_message).__name__,
+                event.event_message.model_dump(mode="json"),
+            ]
+            for event in events
+        ],
+        separators=(",", ":"),
+    ).encode()
+
+
+def _json_decode(data: bytes) -> list[Event[Any]]:
+    return [
+        Event(event_type_from_value(event_type), _MESSAGE_TYPES[name](**fields))
+        for event_type, name, fields in json.loads(data)
+    ]
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(3):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    events = _make_events()
+    codec = BinaryEventCodec()
+    compact_codec = BinaryEventCodec(compact=True)
+
+    json_encode, json_data = _timed(lambda: _json_encode(events))
+    json_decode, _ = _timed(lambda: _json_decode(json_data))
+    binary_encode, binary_data = _timed(lambda: codec.encode_many(events))
+    # 解码直接在 memoryview 上进行，与共享内存/mmap 的使用方式一致
+    view = memoryview(binary_data)
+    binary_decode, decoded = _timed(lambda: codec.decode_many(view))
+    compact_decode, _ = _timed(lambda: compact_codec.decode_many(view))
+
+    assert [e.event_message.model_dump() for e in decoded] == [
+        e.event_message.model_dump() for e in events
+    ]
+
+    rate = lambda seconds: EVENTS / seconds / 1000  # noqa: E731
+    print(f"{EVENTS} events")
+    print(
+        f"  json           : {len(json_data) / EVENTS:6.1f} B/event, "
+        f"encode {rate(json_encode):7.1f}k/s, decode {rate(json_decode):7.1f}k/s"
+    )
+    print(
+        f"  binary         : {len(binary_data) / EVENTS:6.1f} B/event, "
+        f"encode {rate(binary_encode):7.1f}k/s, decode {rate(binary_decode):7.1f}k/s"
+    )
+    print(f"  binary/compact : decode {rate(compact_decode):7.1f}k/s")
+
+
+if __name__ == "__main__":
+    main()
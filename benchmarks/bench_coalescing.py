@@ -0,0 +1,133 @@
+"""技能命中级联派生的生命值事件突发：合并前后的处理器调用次数与批次耗时。
+
+每个批次包含 PLAYERS 个目标、每个目标 HITS 次交错的技能命中；状态树为每次
+命中派生一个生命值事件。合并规则按 ``player_id`` 保留最后一个 ``value``，
+派生的生命值事件在工作队列中等待时被合并。
+
+运行方式::
+
+    python -m benchmarks.bench_coalescing
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.coalescing import EventCoalescer, by_field
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    PlayerHealthChangedMessage,
+    SkillHitMessage,
+)
+
+PLAYERS = 100
+HITS = 100
+HANDLERS = 3
+ROUNDS = 5
+
+
+def _apply_damage(
+    event: EventABC[SkillHitMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    message = event.event_message
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage.compact(
+                player_id=message.target_id, value=1000 - message.damage
+            ),
+        )
+    ]
+
+
+def _make_tree() -> EventStateTree:
+    repo = InMemoryEventConfigRepository()
+    repo.register(
+        "damage",
+        LeafConfiguration(
+            listen_event=SkillEventTypes.ON_HIT,
+            condition=Always(),
+            actions=[CallableAction(_apply_damage)],
+        ),
+    )
+    root = EventBranchNode("root")
+    root.add_transition(
+        SkillEventTypes.ON_HIT,
+        EventTransition(Always(), DynamicLeafNode("damage", repo)),
+    )
+    tree = EventStateTree(root)
+    tree.compile()
+    return tree
+
+
+class _Counting(EventHandler[PlayerHealthChangedMessage]):
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.last: dict[str, int] = {}
+
+    def supports(self, event: EventABC[PlayerHealthChangedMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[PlayerHealthChangedMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        self.calls += 1
+        message = event.event_message
+        self.last[message.player_id] = message.value
+        return ()
+
+
+def main() -> None:
+    tree = _make_tree()
+    hits = [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(skill_id="nova", target_id=f"player-{player}", damage=hit),
+        )
+        for hit in range(HITS)
+        for player in range(PLAYERS)
+    ]
+    print(f"{PLAYERS} targets x {HITS} hits, {HANDLERS} health handlers")
+    for label, coalescing in (
+        ("no coalescing", None),
+        ("coalesce by player_id", EventCoalescer()),
+    ):
+        if coalescing is not None:
+            coalescing.register(EventTypes.PLAYER_HEALTH_CHANGED, by_field("player_id"))
+        handlers = [_Counting() for _ in range(HANDLERS)]
+        registry = EventHandlerRegistry()
+        for handler in handlers:
+            registry.register(EventTypes.PLAYER_HEALTH_CHANGED, handler)
+        dispatcher = EventDispatcher(tree, registry, coalescing=coalescing)
+
+        best = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            dispatcher.emit_many(hits)
+            best = min(best, time.perf_counter() - start)
+        calls = sum(handler.calls for handler in handlers) // ROUNDS
+        # 两种方式下每个目标最终看到的生命值都来自最后一次命中
+        assert handlers[0].last["player-0"] == 1000 - (HITS - 1)
+        print(f"  {label:22}: {best * 1e3:7.2f} ms/batch, {calls} handler calls")
+
+
+if __name__ == "__main__":
+    main()
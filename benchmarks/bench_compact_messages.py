@@ -0,0 +1,154 @@
+"""pydantic 消息与 ``BaseEventMessage.compact`` 轻量消息的构造耗时与内存对比。
+
+运行方式::
+
+    python -m benchmarks.bench_compact_messages
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+from main import build_state_tree
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    CallableAction,
+    ContextAttribute,
+    Event,
+    EventABC,
+    EventContext,
+    InMemoryEventConfigRepository,
+    IsInstance,
+    LeafConfiguration,
+    MessageField,
+    PlayerHealthChangedMessage,
+    PlayerStateChangedMessage,
+    SkillHitMessage,
+)
+
+OBJECTS = 100_000
+ROOT_EVENTS = 5_000
+
+
+def _construct(factory: Callable[..., BaseEventMessage]) -> tuple[float, float]:
+    """返回 (每个对象的构造耗时 us, 每个对象占用的字节数)。"""
+    start = time.perf_counter()
+    for index in range(OBJECTS):
+        factory(player_id="player-001", value=index, source_event="skill.on_hit")
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    keep = [
+        factory(player_id="player-001", value=index, source_event="skill.on_hit")
+        for index in range(OBJECTS)
+    ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return elapsed / OBJECTS * 1e6, size / OBJECTS
+
+
+def _repository(compact: bool) -> InMemoryEventConfigRepository:
+    health = (
+        PlayerHealthChangedMessage.compact if compact else PlayerHealthChangedMessage
+    )
+    state = PlayerStateChangedMessage.compact if compact else PlayerStateChangedMessage
+
+    def emit_health(
+        event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        message = event.event_message
+        return [
+            Event(
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                health(
+                    player_id=message.target_id,
+                    value=context.attributes["target_health"] - message.damage,
+                    source_event=event.event_type.value,
+                ),
+            )
+        ]
+
+    def flag_state(
+        event: EventABC[PlayerHealthChangedMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return [
+            Event(
+                EventTypes.PLAYER_STATE_CHANGED,
+                state(
+                    player_id=event.event_message.player_id,
+                    state="dead",
+                    trail=list(context.state_path),
+                ),
+            )
+        ]
+
+    repo = InMemoryEventConfigRepository()
+    repo.register(
+        "skill.damage",
+        LeafConfiguration(
+            listen_event=SkillEventTypes.ON_HIT,
+            condition=IsInstance(SkillHitMessage)
+            & (MessageField("damage") >= ContextAttribute("damage_threshold", 0)),
+            actions=[CallableAction(emit_health)],
+        ),
+    )
+    repo.register(
+        "player.health",
+        LeafConfiguration(
+            listen_event=EventTypes.PLAYER_HEALTH_CHANGED,
+            condition=IsInstance(PlayerHealthChangedMessage)
+            & (MessageField("value") <= 0),
+            actions=[CallableAction(flag_state)],
+        ),
+    )
+    return repo
+
+
+def _cascade(compact: bool) -> tuple[float, float]:
+    """返回 (每个根事件的级联耗时 us, 结果保留时每个根事件的内存字节数)。"""
+    dispatcher = EventDispatcher(
+        build_state_tree(_repository(compact)), EventHandlerRegistry()
+    )
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+    roots = [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(skill_id="fireball", target_id="player-001", damage=150),
+        )
+        for _ in range(ROOT_EVENTS)
+    ]
+    start = time.perf_counter()
+    dispatcher.emit_many(roots, context)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    results = dispatcher.emit_many(roots, context)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return elapsed / ROOT_EVENTS * 1e6, size / ROOT_EVENTS
+
+
+def main() -> None:
+    print(f"construction ({OBJECTS} PlayerHealthChangedMessage):")
+    for label, factory in (
+        ("pydantic", PlayerHealthChangedMessage),
+        ("compact ", PlayerHealthChangedMessage.compact),
+    ):
+        per_object, size = _construct(factory)
+        print(f"  {label}: {per_object:6.2f} us/object, {size:6.0f} B/object")
+
+    print(f"full cascade ({ROOT_EVENTS} root events, 2 derived events each):")
+    for label, compact in (("pydantic", False), ("compact ", True)):
+        per_root, size = _cascade(compact)
+        print(f"  {label}: {per_root:6.2f} us/root, {size:6.0f} B/root retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""JSON 叶子配置的冷启动与热启动（命中磁盘计划缓存）耗时对比。
+
+运行方式::
+
+    python -m benchmarks.bench_config_cache
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from typing import Iterable
+
+from src.events import BaseEventMessage, EventABC, EventAction, EventContext
+from src.events.serialization import BuilderRegistry, LeafConfigLoader
+
+NODES = 2_000
+ROWS_PER_NODE = 10
+
+
+class _NoopAction(EventAction):
+    def produce(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return []
+
+
+def _document() -> bytes:
+    rows = {
+        f"skill.{node}": [
+            {
+                "listen_event": "skill.on_hit",
+                "condition": {
+                    "all": [
+                        {"is_instance": ["SkillHitMessage"]},
+                        {"compare": [{"field": "skill_id"}, "==", f"skill-{row}"]},
+                        {
+                            "compare": [
+                                {"field": "damage"},
+                                ">=",
+                                {"context": "damage_threshold", "default": 0},
+                            ]
+                        },
+                    ]
+                },
+                "actions": [{"action": "noop"}],
+            }
+            for row in range(ROWS_PER_NODE)
+        ]
+        for node in range(NODES)
+    }
+    return json.dumps(rows).encode()
+
+
+def main() -> None:
+    builders = BuilderRegistry()
+    builders.register_action("noop", _NoopAction)
+    document = _document()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        uncached = LeafConfigLoader(builders)
+        start = time.perf_counter()
+        uncached.load(document)
+        cold = time.perf_counter() - start
+
+        cached = LeafConfigLoader(builders, cache_dir=cache_dir)
+        cached.load(document)  # 写入缓存
+        start = time.perf_counter()
+        cached.load(document)
+        warm = time.perf_counter() - start
+
+    print(f"rows: {NODES * ROWS_PER_NODE}, document: {len(document) / 1e6:.1f} MB")
+    print(f"cold (parse + validate + build): {cold * 1e3:8.1f} ms")
+    print(f"warm (cached plan + build)     : {warm * 1e3:8.1f} ms ({cold / warm:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""``Event.copy_with`` 默认路径与写时复制（copy_on_write）路径的对比。
+
+运行方式::
+
+    python -m benchmarks.bench_copy_with
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Iterable
+
+from main import build_state_tree
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import SkillEventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    Event,
+    EventABC,
+    EventContext,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    SkillHitMessage,
+)
+
+COPIES = 50_000
+ROOT_EVENTS = 2_000
+# 每个根事件在级联中被复制的次数
+CASCADE_DEPTH = 8
+
+
+def _measure(fn) -> tuple[float, float]:
+    """返回 (耗时 s, 分配峰值字节数)。"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def _copy_loop(copy_on_write: bool, **updates: int) -> None:
+    event = Event(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage(skill_id="fireball", target_id="player-001", damage=150),
+    )
+    keep = [
+        event.copy_with(copy_on_write=copy_on_write, **updates) for _ in range(COPIES)
+    ]
+    del keep
+
+
+def _cascade_dispatcher(copy_on_write: bool) -> EventDispatcher:
+    """每一跳把命中事件复制一次（伤害衰减），共 CASCADE_DEPTH 跳。"""
+
+    def bounce(
+        event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        message = event.event_message
+        if message.damage <= 150 - CASCADE_DEPTH:
+            return []
+        assert isinstance(event, Event)
+        return [event.copy_with(copy_on_write=copy_on_write, damage=message.damage - 1)]
+
+    repo = InMemoryEventConfigRepository()
+    repo.register(
+        "skill.damage",
+        LeafConfiguration(
+            listen_event=SkillEventTypes.ON_HIT,
+            condition=Always(),
+            actions=[CallableAction(bounce)],
+        ),
+    )
+    return EventDispatcher(build_state_tree(repo), EventHandlerRegistry())
+
+
+def _cascade(copy_on_write: bool) -> None:
+    dispatcher = _cascade_dispatcher(copy_on_write)
+    roots = [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(skill_id="fireball", target_id="player-001", damage=150),
+        )
+        for _ in range(ROOT_EVENTS)
+    ]
+    results = dispatcher.emit_many(roots, EventContext())
+    del results
+
+
+def main() -> None:
+    cases = (
+        ("copy, no updates", lambda cow: _copy_loop(cow), COPIES),
+        ("copy, 1 field updated", lambda cow: _copy_loop(cow, damage=1), COPIES),
+        (
+            f"cascade, {CASCADE_DEPTH} copies/root",
+            _cascade,
+            ROOT_EVENTS * CASCADE_DEPTH,
+        ),
+    )
+    for label, run, operations in cases:
+        print(f"{label}:")
+        for mode, cow in (("default      ", False), ("copy_on_write", True)):
+            elapsed, peak = _measure(lambda run=run, cow=cow: run(cow))
+            print(
+                f"  {mode}: {elapsed / operations * 1e6:6.2f} us/copy, "
+                f"peak {peak / operations:6.0f} B/copy"
+            )
+
+
+if __name__ == "__main__":
+    main()
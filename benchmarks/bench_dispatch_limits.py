@@ -0,0 +1,129 @@
+"""失控规则（每个事件派生两个同类型事件）在不同限额策略下的表现。
+
+运行方式::
+
+    python -m benchmarks.bench_dispatch_limits
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from typing import Iterable
+
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.limits import (
+    DispatchLimitExceeded,
+    DispatchLimits,
+    EventSpill,
+    OverflowPolicy,
+)
+from src.event_types import EventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    PlayerHealthChangedMessage,
+)
+
+ROOTS = 16
+
+
+def _echo_twice(
+    event: EventABC[BaseEventMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    # 错误配置：产出的事件再次命中自身
+    return [event.copy_with(copy_on_write=True) for _ in range(2)]
+
+
+def _make_tree() -> EventStateTree:
+    repo = InMemoryEventConfigRepository()
+    repo.register(
+        "runaway",
+        LeafConfiguration(
+            listen_event=EventTypes.PLAYER_HEALTH_CHANGED,
+            condition=Always(),
+            actions=[CallableAction(_echo_twice)],
+        ),
+    )
+    root = EventBranchNode("root")
+    root.add_transition(
+        EventTypes.PLAYER_HEALTH_CHANGED,
+        EventTransition(Always(), DynamicLeafNode("runaway", repo)),
+    )
+    tree = EventStateTree(root)
+    tree.compile()
+    return tree
+
+
+def _roots() -> list[Event[PlayerHealthChangedMessage]]:
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(player_id=f"player-{index}", value=0),
+        )
+        for index in range(ROOTS)
+    ]
+
+
+def main() -> None:
+    tree = _make_tree()
+    spill_path = os.path.join(tempfile.mkdtemp(), "overflow.spill")
+    spill = EventSpill(spill_path)
+    print(f"{ROOTS} roots, each event re-emits itself twice")
+    for label, limits in (
+        (
+            "depth<=10 reject",
+            DispatchLimits(max_depth=10, policy=OverflowPolicy.REJECT),
+        ),
+        (
+            "1k/root reject",
+            DispatchLimits(max_events_per_root=1_000, policy=OverflowPolicy.REJECT),
+        ),
+        (
+            "queue 256 drop",
+            DispatchLimits(
+                max_queue=256,
+                max_events_per_root=2_000,
+                policy=OverflowPolicy.DROP_OLDEST,
+            ),
+        ),
+        (
+            "queue 256 spill",
+            DispatchLimits(
+                max_queue=256,
+                max_depth=8,
+                policy=OverflowPolicy.SPILL,
+                spill=spill,
+            ),
+        ),
+        ("depth<=10 raise", DispatchLimits(max_depth=10)),
+    ):
+        dispatcher = EventDispatcher(tree, EventHandlerRegistry(), limits=limits)
+        start = time.perf_counter()
+        try:
+            results = dispatcher.emit_many(_roots())
+            outcome = f"{sum(map(len, results))} processed"
+        except DispatchLimitExceeded as exc:
+            outcome = f"raised at {exc.limit} (depth {exc.depth})"
+        elapsed = time.perf_counter() - start
+        print(
+            f"  {label:16}: {elapsed * 1e3:7.1f} ms, {outcome}, "
+            f"overflows {dict(dispatcher.overflow_counts)}"
+        )
+    print(f"  spilled to disk : {len(spill.drain())} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""分派指标对 ``emit_many`` 吞吐量的影响，以及导出耗时。
+
+运行方式::
+
+    python -m benchmarks.bench_dispatch_metrics
+"""
+
+from __future__ import annotations
+
+import time
+
+from benchmarks.bench_emit_many import _make_events
+from main import build_state_tree, populate_repository
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.metrics import DispatchMetrics
+from src.events import EventContext, InMemoryEventConfigRepository
+
+EVENTS = 8_192
+ROUNDS = 5
+
+
+def main() -> None:
+    repo = InMemoryEventConfigRepository()
+    populate_repository(repo)
+    tree = build_state_tree(repo)
+    events = _make_events(EVENTS)
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+    metrics = DispatchMetrics()
+
+    print(f"{EVENTS} root events, empty handler registry")
+    for label, dispatcher in (
+        ("no metrics", EventDispatcher(tree, EventHandlerRegistry())),
+        (
+            "with metrics",
+            EventDispatcher(tree, EventHandlerRegistry(), metrics=metrics),
+        ),
+    ):
+        best = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            dispatcher.emit_many(events, context)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:12}: {best / EVENTS * 1e6:6.2f} us/root event")
+
+    start = time.perf_counter()
+    text = metrics.to_prometheus()
+    elapsed = time.perf_counter() - start
+    print(f"  export      : {elapsed * 1e6:6.1f} us for {len(text)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""对比逐个 ``emit`` 与批量 ``emit_many`` 的吞吐量。
+
+运行方式::
+
+    python -m benchmarks.bench_emit_many
+"""
+
+from __future__ import annotations
+
+import time
+
+from main import build_state_tree, populate_repository
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import SkillEventTypes
+from src.events import (
+    Event,
+    EventContext,
+    InMemoryEventConfigRepository,
+    SkillHitMessage,
+)
+
+TOTAL_EVENTS = 8_192
+TICK_SIZES = (64, 256, 1_024, 8_192)
+ROUNDS = 5
+
+
+def _make_dispatcher() -> EventDispatcher:
+    repo = InMemoryEventConfigRepository()
+    populate_repository(repo)
+    # 使用空注册表，避免示例处理器的 print 干扰计时
+    return EventDispatcher(build_state_tree(repo), EventHandlerRegistry())
+
+
+def _make_events(count: int) -> list[Event[SkillHitMessage]]:
+    return [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(
+                skill_id="fireball",
+                target_id=f"player-{index % 64:03d}",
+                damage=50 + index % 200,
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    dispatcher = _make_dispatcher()
+    events = _make_events(TOTAL_EVENTS)
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+
+    best_single = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for event in events:
+            dispatcher.emit(event, context)
+        best_single = min(best_single, time.perf_counter() - start)
+
+    print(f"root events per run: {TOTAL_EVENTS}")
+    print(f"emit loop          : {TOTAL_EVENTS / best_single:>12,.0f} events/s")
+
+    for tick_size in TICK_SIZES:
+        best_batch = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for offset in range(0, TOTAL_EVENTS, tick_size):
+                dispatcher.emit_many(events[offset : offset + tick_size], context)
+            best_batch = min(best_batch, time.perf_counter() - start)
+        print(
+            f"emit_many tick={tick_size:<5}: {TOTAL_EVENTS / best_batch:>12,.0f} events/s"
+            f" ({best_single / best_batch:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""逐事件 ``emit_many`` 与列式 ``emit_batch`` 在不同批次大小下的吞吐对比。
+
+运行方式::
+
+    python -m benchmarks.bench_event_batch
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+
+from benchmarks.bench_emit_many import _make_dispatcher
+from src.event_types import SkillEventTypes
+from src.events import Event, EventBatch, EventContext, SkillHitMessage
+
+BATCH_SIZES = (10, 100, 1_000, 10_000)
+# 每个批次大小下处理的总事件数
+TOTAL_EVENTS = 20_000
+
+
+def _damage(index: int) -> int:
+    # 打散取值，使任意批次大小下超过阈值的比例相近
+    return 50 + index * 7919 % 200
+
+
+def _make_events(size: int) -> list[Event[SkillHitMessage]]:
+    return [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(
+                skill_id="fireball",
+                target_id=f"player-{index % 64:03d}",
+                damage=_damage(index),
+            ),
+        )
+        for index in range(size)
+    ]
+
+
+def _make_batch(size: int) -> EventBatch:
+    """模拟按列到达的命中数据，与 ``_make_events`` 的取值一致。"""
+    return EventBatch.from_columns(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage,
+        skill_id=["fireball"] * size,
+        target_id=[f"player-{index % 64:03d}" for index in range(size)],
+        damage=array("q", map(_damage, range(size))),
+    )
+
+
+def _best(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    dispatcher = _make_dispatcher()
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+
+    print(
+        f"{'batch':>6}  {'emit_many':>10}  {'emit_batch':>10}  "
+        f"{'from_events+batch':>18}  (us/event)"
+    )
+    for size in BATCH_SIZES:
+        rounds = max(1, TOTAL_EVENTS // size)
+        events = _make_events(size)
+        batch = _make_batch(size)
+
+        per_object = _best(
+            lambda events=events: dispatcher.emit_many(events, context), rounds
+        )
+        columnar = _best(
+            lambda batch=batch: dispatcher.emit_batch(batch, context), rounds
+        )
+        converted = _best(
+            lambda events=events: dispatcher.emit_batch(
+                EventBatch.from_events(events), context
+            ),
+            rounds,
+        )
+        scale = 1e6 / (rounds * size)
+        print(
+            f"{size:>6}  {per_object * scale:>10.2f}  {columnar * scale:>10.2f}  "
+            f"{converted * scale:>18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""事件 ID 生成策略对比：UUID 字符串、计数器字符串、Snowflake 整数。
+
+运行方式::
+
+    python -m benchmarks.bench_event_ids
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from src.events import (
+    CounterIdGenerator,
+    EventIdGenerator,
+    PlayerHealthChangedMessage,
+    SnowflakeIdGenerator,
+    UuidIdGenerator,
+    set_event_id_generator,
+)
+
+NUMBER = 100_000
+
+
+def _per_call_us(stmt) -> float:
+    return min(timeit.repeat(stmt, number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+
+def main() -> None:
+    generators: tuple[tuple[str, EventIdGenerator], ...] = (
+        ("uuid4     ", UuidIdGenerator()),
+        ("counter   ", CounterIdGenerator()),
+        ("snowflake ", SnowflakeIdGenerator(node_id=1)),
+    )
+    print(f"{'strategy':10}  {'generate':>9}  {'+ str()':>9}  {'message':>9}  (us)")
+    for label, generator in generators:
+        generate = _per_call_us(generator)
+        stringify = _per_call_us(lambda generator=generator: str(generator()))
+        previous = set_event_id_generator(generator)
+        try:
+            message = _per_call_us(
+                lambda: PlayerHealthChangedMessage(player_id="player-001", value=1)
+            )
+        finally:
+            set_event_id_generator(previous)
+        print(f"{label}  {generate:9.3f}  {stringify:9.3f}  {message:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""处理器链分派开销：逐个调用 ``supports`` 与编译后的 ``handle`` 元组对比。
+
+运行方式::
+
+    python -m benchmarks.bench_handler_chain
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Any, Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import BaseEventMessage, Event, EventABC, EventContext, SkillHitMessage
+
+HANDLERS = 60
+# 其中按内容过滤、必须调用 supports 的处理器数量
+CONTENT_FILTERS = 6
+NUMBER = 20_000
+
+
+class _TypeHandler(EventHandler[BaseEventMessage]):
+    """supports 只重复事件类型检查的处理器。"""
+
+    def __init__(self, event_type: Any, type_exact: bool):
+        self._event_type = event_type
+        self.type_exact = type_exact
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return event.event_type == self._event_type
+
+    def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return ()
+
+
+class _CriticalOnly(EventHandler[SkillHitMessage]):
+    """按内容过滤：只处理暴击。"""
+
+    def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+        return event.event_message.is_critical
+
+    def handle(
+        self, event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return ()
+
+
+def _make_registry(type_exact: bool) -> EventHandlerRegistry:
+    registry = EventHandlerRegistry()
+    event_types = (SkillEventTypes.ON_HIT, EventTypes.PLAYER_HEALTH_CHANGED)
+    for index in range(HANDLERS - CONTENT_FILTERS):
+        event_type = event_types[index % 2]
+        registry.register(event_type, _TypeHandler(event_type, type_exact))
+    for _ in range(CONTENT_FILTERS):
+        registry.register(SkillEventTypes.ON_HIT, _CriticalOnly())
+    return registry
+
+
+def _legacy_handle(registry: EventHandlerRegistry, event, context):
+    """改造前的路径：生成器逐个调用 supports 再调用 handle。"""
+    for handler in registry.chain(event.event_type):
+        if handler.supports(event):
+            yield from handler.handle(event, context)
+
+
+def main() -> None:
+    event = Event(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage(skill_id="fireball", target_id="player-001", damage=150),
+    )
+    context = EventContext()
+    plain = _make_registry(type_exact=False)
+    exact = _make_registry(type_exact=True)
+    matching = len(exact.chain(event.event_type))
+
+    cases = (
+        (
+            "supports() on every handler",
+            lambda: list(_legacy_handle(plain, event, context)),
+        ),
+        ("compiled chain, no type_exact", lambda: list(plain.handle(event, context))),
+        ("compiled chain, type_exact", lambda: list(exact.handle(event, context))),
+    )
+    print(f"{HANDLERS} handlers registered, {matching} match skill.on_hit")
+    for label, fn in cases:
+        best = min(timeit.repeat(fn, number=NUMBER, repeat=7)) / NUMBER * 1e6
+        print(f"  {label:30}: {best:6.2f} us/event")
+
+
+if __name__ == "__main__":
+    main()
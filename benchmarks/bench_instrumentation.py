@@ -0,0 +1,65 @@
+"""计时开关对分派吞吐量的影响，并输出一次热点报告。
+
+运行方式::
+
+    python -m benchmarks.bench_instrumentation
+"""
+
+from __future__ import annotations
+
+import io
+import time
+
+from benchmarks.bench_emit_many import _make_events
+from main import build_state_tree, populate_repository
+from src.event_handlers.decorator import get_global_registry
+from src.event_handlers.log_sink import EventLogSink, set_log_sink
+from src.event_router.dispatcher import EventDispatcher
+from src.events import (
+    EventContext,
+    InMemoryEventConfigRepository,
+    disable_instrumentation,
+    enable_instrumentation,
+)
+
+EVENTS = 2_048
+ROUNDS = 5
+
+
+def _measure(dispatcher: EventDispatcher, context: EventContext) -> float:
+    events = _make_events(EVENTS)
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        dispatcher.emit_many(events, context)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    # 内置处理器的日志写入内存，避免输出干扰计时
+    set_log_sink(EventLogSink(io.StringIO(), max_buffered=1_000_000))
+    repo = InMemoryEventConfigRepository()
+    populate_repository(repo)
+    dispatcher = EventDispatcher(build_state_tree(repo), get_global_registry())
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+
+    baseline = _measure(dispatcher, context)
+    instrumentation = enable_instrumentation()
+    enabled = _measure(dispatcher, context)
+    disable_instrumentation()
+    disabled = _measure(dispatcher, context)
+
+    print(f"{EVENTS} root events with the built-in handlers")
+    for label, elapsed in (
+        ("never enabled", baseline),
+        ("enabled", enabled),
+        ("disabled again", disabled),
+    ):
+        print(f"  {label:15}: {elapsed / EVENTS * 1e6:7.2f} us/root event")
+    print()
+    print(instrumentation.report(limit=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""长级联下 ``emit`` 与流式 ``iter_emit`` 的峰值内存与耗时。
+
+级联为一条链：每个生命值事件派生下一个生命值减一的事件，直到归零。
+
+运行方式::
+
+    python -m benchmarks.bench_iter_emit
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    MessageField,
+    PlayerHealthChangedMessage,
+)
+
+CHAIN_LENGTHS = (1_000, 10_000, 50_000)
+
+
+def _next_tick(
+    event: EventABC[PlayerHealthChangedMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    message = event.event_message
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage.compact(
+                player_id=message.player_id, value=message.value - 1
+            ),
+        )
+    ]
+
+
+def _make_dispatcher() -> EventDispatcher:
+    repo = InMemoryEventConfigRepository()
+    repo.register(
+        "countdown",
+        LeafConfiguration(
+            listen_event=EventTypes.PLAYER_HEALTH_CHANGED,
+            condition=MessageField("value") > 0,
+            actions=[CallableAction(_next_tick)],
+        ),
+    )
+    root = EventBranchNode("root")
+    root.add_transition(
+        EventTypes.PLAYER_HEALTH_CHANGED,
+        EventTransition(Always(), DynamicLeafNode("countdown", repo)),
+    )
+    tree = EventStateTree(root)
+    tree.compile()
+    return EventDispatcher(tree, EventHandlerRegistry())
+
+
+def _measure(run: Callable[[], int]) -> tuple[float, int, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, count
+
+
+def main() -> None:
+    dispatcher = _make_dispatcher()
+    for length in CHAIN_LENGTHS:
+        root = Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(player_id="player-001", value=length),
+        )
+        print(f"chain of {length + 1} events")
+        for label, run in (
+            ("emit", lambda root=root: len(dispatcher.emit(root))),
+            (
+                "iter_emit",
+                lambda root=root: sum(1 for _ in dispatcher.iter_emit(root)),
+            ),
+        ):
+            elapsed, peak, count = _measure(run)
+            print(
+                f"  {label:9}: {elapsed * 1e3:8.1f} ms, peak {peak / 1024:8.1f} KiB, "
+                f"{count} events"
+            )
+
+
+if __name__ == "__main__":
+    main()
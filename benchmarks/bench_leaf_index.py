@@ -0,0 +1,73 @@
+"""单个叶子节点的查找开销随配置行数的变化。
+
+每个叶子只有少量行监听被分派的事件类型，其余行分布在其他事件类型上；
+按事件类型建立索引后，分派耗时不应随总行数增长。
+
+运行方式::
+
+    python -m benchmarks.bench_leaf_index
+"""
+
+from __future__ import annotations
+
+import time
+
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    DynamicLeafNode,
+    Event,
+    EventContext,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    MessageField,
+    SkillHitMessage,
+)
+
+ROW_COUNTS = (10, 100, 1_000, 10_000)
+MATCHING_ROWS = 4
+DISPATCHES = 20_000
+
+_OTHER_EVENT_TYPES = [
+    event_type
+    for event_type in (*EventTypes, *SkillEventTypes)
+    if event_type != SkillEventTypes.ON_HIT
+]
+
+
+def _make_leaf(rows: int) -> DynamicLeafNode:
+    repo = InMemoryEventConfigRepository()
+    for index in range(rows):
+        listen_event = (
+            SkillEventTypes.ON_HIT
+            if index < MATCHING_ROWS
+            else _OTHER_EVENT_TYPES[index % len(_OTHER_EVENT_TYPES)]
+        )
+        repo.register(
+            "leaf",
+            LeafConfiguration(
+                listen_event=listen_event, condition=MessageField("damage") >= index
+            ),
+        )
+    return DynamicLeafNode("leaf", repo)
+
+
+def main() -> None:
+    event = Event(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage(skill_id="fireball", target_id="player-001", damage=2),
+    )
+    context = EventContext()
+
+    for rows in ROW_COUNTS:
+        leaf = _make_leaf(rows)
+        list(leaf._handle(event, context))  # 预热：加载并建立索引
+        start = time.perf_counter()
+        for _ in range(DISPATCHES):
+            for _ in leaf._handle(event, context):
+                pass
+        elapsed = time.perf_counter() - start
+        print(f"rows={rows:<6}: {elapsed / DISPATCHES * 1e6:6.2f} us/dispatch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""内置处理器同步写日志与写入缓冲日志输出时的分发延迟对比。
+
+输出流模拟一个较慢的终端：每次 ``write`` 固定耗时若干微秒。
+
+运行方式::
+
+    python -m benchmarks.bench_log_sink
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from benchmarks.bench_emit_many import _make_events
+from main import build_state_tree, populate_repository
+from src.event_handlers.decorator import get_global_registry
+from src.event_handlers.log_sink import EventLogSink, set_log_sink
+from src.event_router.dispatcher import EventDispatcher
+from src.events import EventContext, InMemoryEventConfigRepository
+
+EVENTS = 512
+# 模拟输出流每次写入的耗时
+WRITE_COST_US = 20
+
+
+class _SlowStream:
+    def __init__(self) -> None:
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        deadline = time.perf_counter() + WRITE_COST_US / 1e6
+        while time.perf_counter() < deadline:
+            pass
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class _PrintSink(EventLogSink):
+    """旧行为：在处理器线程中立即格式化并写出每一行。"""
+
+    def log(self, tag: str, template: str, *args: Any) -> bool:
+        stream = self._stream
+        assert stream is not None
+        stream.write(f"[{tag}] {template.format(*args)}")
+        stream.write("\n")
+        return True
+
+
+def _run(
+    sink_type: type[EventLogSink], **options: Any
+) -> tuple[float, float, int, int]:
+    stream = _SlowStream()
+    sink = sink_type(stream, **options)
+    previous = set_log_sink(sink)
+    try:
+        repo = InMemoryEventConfigRepository()
+        populate_repository(repo)
+        dispatcher = EventDispatcher(build_state_tree(repo), get_global_registry())
+        events = _make_events(EVENTS)
+        context = EventContext(
+            attributes={"target_health": 120, "damage_threshold": 100}
+        )
+        start = time.perf_counter()
+        dispatcher.emit_many(events, context)
+        dispatched = time.perf_counter() - start
+        sink.close()
+        total = time.perf_counter() - start
+    finally:
+        if previous is not None:
+            set_log_sink(previous)
+    return dispatched, total, stream.writes, sink.dropped
+
+
+def main() -> None:
+    print(f"{EVENTS} root events, {WRITE_COST_US} us per stream write")
+    for label, sink_type, options in (
+        ("print", _PrintSink, {}),
+        ("sink", EventLogSink, {}),
+        ("sink (max 256)", EventLogSink, {"max_buffered": 256}),
+    ):
+        dispatched, total, writes, dropped = min(
+            _run(sink_type, **options) for _ in range(3)
+        )
+        print(
+            f"  {label:15}: dispatch {dispatched / EVENTS * 1e6:7.2f} us/root event, "
+            f"incl. flush {total / EVENTS * 1e6:7.2f} us, "
+            f"{writes} writes, {dropped} dropped"
+        )
+
+
+if __name__ == "__main__":
+    main()
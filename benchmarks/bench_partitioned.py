@@ -0,0 +1,68 @@
+"""按键分区并行调度的吞吐量随工作者数量的变化。
+
+运行方式::
+
+    python -m benchmarks.bench_partitioned
+
+线程模式受 GIL 限制，主要用于对比；进程模式的扩展性取决于可用核心数。
+``roots_only`` 一行不传回派生事件，可看出回传完整级联的序列化开销。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.partitioned import PartitionedDispatcher
+from src.events import EventContext
+
+from .bench_emit_many import _make_dispatcher, _make_events
+
+TOTAL_EVENTS = 8_192
+WORKER_COUNTS = (1, 2, 4, 8)
+ROUNDS = 3
+
+
+def make_dispatcher() -> EventDispatcher:
+    """供工作进程调用的模块级工厂。"""
+    return _make_dispatcher()
+
+
+def main() -> None:
+    events = _make_events(TOTAL_EVENTS)
+    context = EventContext(attributes={"target_health": 120, "damage_threshold": 100})
+
+    print(f"root events per run: {TOTAL_EVENTS}, cpus: {os.cpu_count()}")
+    baseline = float("inf")
+    dispatcher = make_dispatcher()
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        dispatcher.emit_many(events, context)
+        baseline = min(baseline, time.perf_counter() - start)
+    print(f"serial                    : {TOTAL_EVENTS / baseline:>12,.0f} events/s")
+
+    for mode, use_processes, roots_only in (
+        ("threads", False, False),
+        ("processes", True, False),
+        ("processes, roots_only", True, True),
+    ):
+        for workers in WORKER_COUNTS:
+            with PartitionedDispatcher(
+                make_dispatcher, workers, use_processes=use_processes
+            ) as partitioned:
+                # 预热：启动全部分区的工作者
+                partitioned.emit_many(events, context, roots_only=True)
+                best = float("inf")
+                for _ in range(ROUNDS):
+                    start = time.perf_counter()
+                    partitioned.emit_many(events, context, roots_only=roots_only)
+                    best = min(best, time.perf_counter() - start)
+            print(
+                f"{mode:<21} x{workers:<3}: {TOTAL_EVENTS / best:>12,.0f} events/s"
+                f" ({baseline / best:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""宽扇出树上三种调度模式的峰值队列长度与首个末层事件的延迟。
+
+每个根事件派生 FANOUT 个生命值事件，每个生命值事件再派生 FANOUT 个状态
+事件；“首个末层事件延迟”为从调用开始到第一个状态事件被处理的时间。
+
+运行方式::
+
+    python -m benchmarks.bench_scheduling
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.metrics import DispatchMetrics
+from src.event_router.scheduling import SchedulingMode
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    PlayerHealthChangedMessage,
+    PlayerStateChangedMessage,
+    SkillHitMessage,
+)
+
+ROOTS = 8
+FANOUT = 32
+PRIORITIES = {EventTypes.PLAYER_STATE_CHANGED: 2, EventTypes.PLAYER_HEALTH_CHANGED: 1}
+
+
+def _spread_hits(
+    event: EventABC[SkillHitMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    target = event.event_message.target_id
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage.compact(player_id=f"{target}/{index}", value=0),
+        )
+        for index in range(FANOUT)
+    ]
+
+
+def _spread_states(
+    event: EventABC[PlayerHealthChangedMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    player_id = event.event_message.player_id
+    return [
+        Event(
+            EventTypes.PLAYER_STATE_CHANGED,
+            PlayerStateChangedMessage.compact(player_id=player_id, state=str(index)),
+        )
+        for index in range(FANOUT)
+    ]
+
+
+def _make_tree() -> EventStateTree:
+    repo = InMemoryEventConfigRepository()
+    repo.register(
+        "hits",
+        LeafConfiguration(
+            listen_event=SkillEventTypes.ON_HIT,
+            condition=Always(),
+            actions=[CallableAction(_spread_hits)],
+        ),
+    )
+    repo.register(
+        "health",
+        LeafConfiguration(
+            listen_event=EventTypes.PLAYER_HEALTH_CHANGED,
+            condition=Always(),
+            actions=[CallableAction(_spread_states)],
+        ),
+    )
+    root = EventBranchNode("root")
+    root.add_transition(
+        SkillEventTypes.ON_HIT,
+        EventTransition(Always(), DynamicLeafNode("hits", repo)),
+    )
+    root.add_transition(
+        EventTypes.PLAYER_HEALTH_CHANGED,
+        EventTransition(Always(), DynamicLeafNode("health", repo)),
+    )
+    tree = EventStateTree(root)
+    tree.compile()
+    return tree
+
+
+class _FirstSeen(EventHandler[BaseEventMessage]):
+    """记录第一个末层事件被处理的时刻。"""
+
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.first: float | None = None
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        if self.first is None:
+            self.first = time.perf_counter()
+        return ()
+
+
+def main() -> None:
+    tree = _make_tree()
+    roots = [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(skill_id="nova", target_id=f"player-{index}", damage=10),
+        )
+        for index in range(ROOTS)
+    ]
+    total = ROOTS * (1 + FANOUT + FANOUT * FANOUT)
+    print(f"{ROOTS} roots, fan-out {FANOUT} x {FANOUT}: {total} events per run")
+    for mode in SchedulingMode:
+        best: tuple[float, float, int] | None = None
+        for _ in range(3):
+            metrics = DispatchMetrics()
+            first_seen = _FirstSeen()
+            registry = EventHandlerRegistry()
+            registry.register(EventTypes.PLAYER_STATE_CHANGED, first_seen)
+            dispatcher = EventDispatcher(
+                tree,
+                registry,
+                metrics=metrics,
+                scheduling=mode,
+                priorities=PRIORITIES,
+            )
+            start = time.perf_counter()
+            dispatcher.emit_many(roots)
+            elapsed = time.perf_counter() - start
+            assert first_seen.first is not None
+            run = (elapsed, first_seen.first - start, metrics.queue_depth_max)
+            best = run if best is None or run < best else best
+        assert best is not None
+        elapsed, first, peak = best
+        print(
+            f"  {mode.value:8}: total {elapsed * 1e3:7.1f} ms, "
+            f"first leaf-level event {first * 1e3:7.3f} ms, peak queue {peak}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""SQLite 仓库的建树开销：逐节点加载与 ``load_many`` 批量预加载对比。
+
+运行方式::
+
+    python -m benchmarks.bench_sqlite_preload
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+from src.event_types import SkillEventTypes
+from src.events import (
+    Always,
+    DynamicLeafNode,
+    EventBranchNode,
+    EventStateTree,
+    EventTransition,
+    LeafConfiguration,
+    MessageField,
+)
+from src.events.sqlite_repository import PickleRowCodec, SQLiteEventConfigRepository
+
+LEAF_COUNTS = (1_000, 10_000, 30_000)
+
+
+def _populate(repo: SQLiteEventConfigRepository, leaves: int) -> None:
+    for index in range(leaves):
+        repo.replace(
+            f"skill.{index}",
+            [
+                LeafConfiguration(
+                    listen_event=SkillEventTypes.ON_HIT,
+                    condition=MessageField("skill_id") == f"skill-{index}",
+                )
+            ],
+        )
+
+
+def _build(repo: SQLiteEventConfigRepository, leaves: int) -> EventStateTree:
+    root = EventBranchNode("root")
+    for index in range(leaves):
+        root.add_transition(
+            SkillEventTypes.ON_HIT,
+            EventTransition(Always(), DynamicLeafNode(f"skill.{index}", repo)),
+        )
+    return EventStateTree(root)
+
+
+def main() -> None:
+    for leaves in LEAF_COUNTS:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.db")
+            _populate(SQLiteEventConfigRepository(path, PickleRowCodec()), leaves)
+
+            repo = SQLiteEventConfigRepository(path, PickleRowCodec())
+            tree = _build(repo, leaves)
+            start = time.perf_counter()
+            for leaf in tree._iter_leaves():
+                leaf.reload()
+            per_node = time.perf_counter() - start
+
+            tree = _build(repo, leaves)
+            start = time.perf_counter()
+            tree.preload()
+            bulk = time.perf_counter() - start
+            repo.close()
+
+        print(
+            f"leaves={leaves:<6}: per-node {per_node * 1e3:8.1f} ms,"
+            f" load_many {bulk * 1e3:8.1f} ms ({per_node / bulk:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""挂起定时器数量对 ``TickScheduler`` 登记与到期代价的影响。
+
+对每个规模，先登记 N 个随机延迟的一次性定时器，记录平均登记耗时；再推进
+若干 tick，按到期定时器数折算每个定时器的到期处理耗时（含一次批量分派）。
+两者都应与 N 无关。
+
+运行方式::
+
+    python -m benchmarks.bench_tick_scheduler
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.timers import TickScheduler
+from src.event_types import EventTypes
+from src.events import (
+    Event,
+    EventBranchNode,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+)
+
+SIZES = (10_000, 100_000, 1_000_000)
+# 延迟在 [1, HORIZON] 中均匀分布，每个 tick 平均到期 N / HORIZON 个定时器
+HORIZON = 10_000
+TICKS = 200
+
+
+def main() -> None:
+    tree = EventStateTree(EventBranchNode("root"))
+    tree.compile()
+    event = Event(
+        EventTypes.PLAYER_HEALTH_CHANGED,
+        PlayerHealthChangedMessage.compact(player_id="player-1", value=0),
+    )
+    rng = random.Random(0)
+    print(f"delays uniform in [1, {HORIZON}], expiry measured over {TICKS} ticks")
+    for size in SIZES:
+        scheduler = TickScheduler(
+            EventDispatcher(tree, EventHandlerRegistry()), emit_tick_events=False
+        )
+        delays = [rng.randint(1, HORIZON) for _ in range(size)]
+        schedule = scheduler.schedule
+
+        start = time.perf_counter()
+        for delay in delays:
+            schedule(event, delay=delay)
+        scheduled = time.perf_counter() - start
+
+        pending = len(scheduler)
+        start = time.perf_counter()
+        scheduler.advance(TICKS)
+        expired_time = time.perf_counter() - start
+        expired = pending - len(scheduler)
+
+        print(
+            f"  {size:>9} pending: schedule {scheduled / size * 1e9:6.0f} ns/timer, "
+            f"expiry {expired_time / max(expired, 1) * 1e9:6.0f} ns/timer "
+            f"({expired} fired)"
+        )
+
+
+if __name__ == "__main__":
+    main()
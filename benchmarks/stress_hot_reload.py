@@ -0,0 +1,132 @@
+"""热更新压力测试：分派循环运行的同时不断替换叶子配置。
+
+后台线程持续以新“代”的规则整体替换 ``skill.damage`` 的配置行，另一个线程
+并发调用 ``EventStateTree.refresh``；主线程循环分派事件并检查：
+
+- 单次分派产生的事件全部来自同一代规则（快照替换是原子的）；
+- 观察到的代号单调不减（不会回退到旧快照）。
+
+运行方式::
+
+    python -m benchmarks.stress_hot_reload
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    PlayerHealthChangedMessage,
+    SkillHitMessage,
+)
+
+DURATION_SECONDS = 3.0
+ROWS_PER_GENERATION = 8
+
+
+def _rows(generation: int) -> list[LeafConfiguration]:
+    def emit(
+        event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return [
+            Event(
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                PlayerHealthChangedMessage(
+                    player_id="player-001", value=generation, source_event="reload"
+                ),
+            )
+        ]
+
+    return [
+        LeafConfiguration(
+            listen_event=SkillEventTypes.ON_HIT,
+            condition=Always(),
+            actions=[CallableAction(emit)],
+        )
+        for _ in range(ROWS_PER_GENERATION)
+    ]
+
+
+def main() -> None:
+    repo = InMemoryEventConfigRepository({"skill.damage": _rows(0)})
+    root = EventBranchNode("root")
+    root.add_transition(
+        SkillEventTypes.ON_HIT,
+        EventTransition(Always(), DynamicLeafNode("skill.damage", repo)),
+    )
+    tree = EventStateTree(root)
+    tree.compile()
+    dispatcher = EventDispatcher(tree, EventHandlerRegistry())
+
+    stop = threading.Event()
+    reloads = 0
+
+    def writer() -> None:
+        nonlocal reloads
+        generation = 0
+        while not stop.is_set():
+            generation += 1
+            repo.replace("skill.damage", _rows(generation))
+            reloads += 1
+            time.sleep(0.0005)
+
+    def refresher() -> None:
+        while not stop.is_set():
+            tree.refresh()
+            time.sleep(0.0002)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=refresher)]
+    for thread in threads:
+        thread.start()
+
+    event = Event(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage(skill_id="fireball", target_id="player-001", damage=1),
+    )
+    dispatches = 0
+    last_generation = -1
+    deadline = time.perf_counter() + DURATION_SECONDS
+    try:
+        while time.perf_counter() < deadline:
+            processed = dispatcher.emit(event)
+            generations = {
+                derived.event_message.value
+                for derived in processed[1:]
+                if isinstance(derived.event_message, PlayerHealthChangedMessage)
+            }
+            assert len(processed) == 1 + ROWS_PER_GENERATION, len(processed)
+            assert len(generations) == 1, f"mixed generations: {generations}"
+            (generation,) = generations
+            assert generation >= last_generation, (generation, last_generation)
+            last_generation = generation
+            dispatches += 1
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    print(
+        f"dispatches: {dispatches}, reloads: {reloads}, last generation seen: {last_generation}"
+    )
+    print("OK: every dispatch saw a single, non-decreasing rule generation")
+
+
+if __name__ == "__main__":
+    main()
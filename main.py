@@ -1,23 +1,31 @@
 from __future__ import annotations
 
-from typing import Iterable, Literal
+import operator
+from array import array
+from itertools import repeat
+from typing import Iterable
 
 from src.event_handlers.decorator import get_global_registry
+from src.event_handlers.log_sink import get_log_sink
 from src.event_router.dispatcher import EventDispatcher
 from src.event_types import EventTypes, SkillEventTypes
-from src.events import CallableCondition  # 具体的消息模型
 from src.events import (
+    Always,
     BaseEventMessage,
     CallableAction,
+    ContextAttribute,
     DynamicLeafNode,
     Event,
     EventABC,
+    EventBatch,
     EventBranchNode,
     EventContext,
     EventStateTree,
     EventTransition,
     InMemoryEventConfigRepository,
+    IsInstance,
     LeafConfiguration,
+    MessageField,
     PlayerHealthChangedMessage,
     PlayerStateChangedMessage,
     SkillHitMessage,
@@ -31,12 +39,7 @@ def build_state_tree(repo: InMemoryEventConfigRepository) -> EventStateTree:
     skill_branch = EventBranchNode("skill_flow")
     player_branch = EventBranchNode("player_flow")
 
-    def always(
-        event: EventABC[BaseEventMessage], context: EventContext
-    ) -> Literal[True]:
-        return True
-
-    any_event = CallableCondition(always)
+    any_event = Always()
 
     root.add_transition(
         SkillEventTypes.ON_HIT,
@@ -59,7 +62,9 @@ def build_state_tree(repo: InMemoryEventConfigRepository) -> EventStateTree:
         EventTransition(any_event, player_leaf),
     )
 
-    return EventStateTree(root)
+    tree = EventStateTree(root)
+    tree.compile()
+    return tree
 
 
 def populate_repository(repo: InMemoryEventConfigRepository) -> None:
@@ -69,15 +74,10 @@ def populate_repository(repo: InMemoryEventConfigRepository) -> None:
         "skill.damage",
         LeafConfiguration(
             listen_event=SkillEventTypes.ON_HIT,
-            condition=CallableCondition(
-                lambda event, context: (
-                    isinstance(event.event_message, SkillHitMessage)
-                    and event.event_message.damage
-                    >= context.attributes.get("damage_threshold", 0)
-                )
-            ),
+            condition=IsInstance(SkillHitMessage)
+            & (MessageField("damage") >= ContextAttribute("damage_threshold", 0)),
             actions=[
-                CallableAction(_emit_health_change),
+                CallableAction(_emit_health_change, batch_fn=_emit_health_changes),
             ],
         ),
     )
@@ -86,14 +86,10 @@ def populate_repository(repo: InMemoryEventConfigRepository) -> None:
         "player.health",
         LeafConfiguration(
             listen_event=EventTypes.PLAYER_HEALTH_CHANGED,
-            condition=CallableCondition(
-                lambda event, context: (
-                    isinstance(event.event_message, PlayerHealthChangedMessage)
-                    and event.event_message.value <= 0
-                )
-            ),
+            condition=IsInstance(PlayerHealthChangedMessage)
+            & (MessageField("value") <= 0),
             actions=[
-                CallableAction(_flag_player_state),
+                CallableAction(_flag_player_state, batch_fn=_flag_player_states),
             ],
         ),
     )
@@ -110,7 +106,7 @@ def _emit_health_change(
     return [
         Event(
             EventTypes.PLAYER_HEALTH_CHANGED,
-            PlayerHealthChangedMessage(
+            PlayerHealthChangedMessage.compact(
                 player_id=message.target_id,
                 value=remaining,
                 source_event=event.event_type.value,
@@ -119,6 +115,26 @@ def _emit_health_change(
     ]
 
 
+def _emit_health_changes(
+    batch: EventBatch, context: EventContext
+) -> Iterable[EventBatch]:
+    """按列计算整批命中造成的生命值变化。"""
+
+    target_health = context.attributes.get("target_health", 0)
+    return [
+        EventBatch.from_columns(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage,
+            player_id=batch.column("target_id"),
+            value=array(
+                "q",
+                map(operator.sub, repeat(target_health), batch.column("damage")),
+            ),
+            source_event=[batch.event_type.value] * len(batch),
+        )
+    ]
+
+
 def _flag_player_state(
     event: EventABC[PlayerHealthChangedMessage], context: EventContext
 ) -> Iterable[EventABC[BaseEventMessage]]:
@@ -129,7 +145,7 @@ def _flag_player_state(
     return [
         Event(
             EventTypes.PLAYER_STATE_CHANGED,
-            PlayerStateChangedMessage(
+            PlayerStateChangedMessage.compact(
                 player_id=message.player_id,
                 state="dead",
                 trail=list(context.state_path),
@@ -138,6 +154,23 @@ def _flag_player_state(
     ]
 
 
+def _flag_player_states(
+    batch: EventBatch, context: EventContext
+) -> Iterable[EventBatch]:
+    """整批标记玩家状态变化。"""
+
+    size = len(batch)
+    return [
+        EventBatch.from_columns(
+            EventTypes.PLAYER_STATE_CHANGED,
+            PlayerStateChangedMessage,
+            player_id=batch.column("player_id"),
+            state=["dead"] * size,
+            trail=[list(context.state_path) for _ in range(size)],
+        )
+    ]
+
+
 def main() -> None:
     repo = InMemoryEventConfigRepository()
     populate_repository(repo)
@@ -173,6 +206,8 @@ def main() -> None:
     )
 
     processed = dispatcher.emit(initial_event, context=context)
+    # 处理器日志在后台线程写出，先刷新以保证输出顺序
+    get_log_sink().flush()
 
     print(f"Processed {len(processed)} events:")
     for evt in processed:
@@ -4,7 +4,7 @@ import src.event_handlers.game_handlers
 import src.event_handlers.player_handlers
 import src.event_handlers.skill_handlers
 
-from .base import EventHandler
+from .base import AsyncEventHandler, EventHandler
 from .decorator import (
     auto_register,
     clear_registry,
@@ -13,11 +13,13 @@ from .decorator import (
     register_handler,
 )
 from .game_handlers import GameStatsHandler
+from .log_sink import EventLogSink, get_log_sink, log, set_log_sink
 from .player_handlers import PlayerHealthLogger
 from .registry import EventHandlerRegistry
 
 __all__ = [
     "EventHandler",
+    "AsyncEventHandler",
     "EventHandlerRegistry",
     "event_handler",
     "auto_register",
@@ -26,4 +28,8 @@ __all__ = [
     "clear_registry",
     "PlayerHealthLogger",
     "GameStatsHandler",
+    "EventLogSink",
+    "get_log_sink",
+    "set_log_sink",
+    "log",
 ]
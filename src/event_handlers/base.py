@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Generic, Iterable, TypeVar
+from typing import Generic, Iterable, Sequence, TypeVar
 
 from src.events.base import BaseEventMessage, EventABC, EventContext
 
@@ -11,6 +11,9 @@ T = TypeVar("T", bound=BaseEventMessage)
 class EventHandler(Generic[T], ABC):
     """Base contract for user-defined event handlers."""
 
+    # supports 只重复注册时的事件类型检查时设为 True，注册表将不再调用 supports
+    type_exact: bool = False
+
     @abstractmethod
     def supports(self, event: EventABC[T]) -> bool: ...
 
@@ -18,3 +21,35 @@ class EventHandler(Generic[T], ABC):
     def handle(
         self, event: EventABC[T], context: EventContext
     ) -> Iterable[EventABC[BaseEventMessage]]: ...
+
+    def handle_batch(
+        self, events: Sequence[EventABC[T]], contexts: Sequence[EventContext]
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        """一次处理一组同类型事件，``contexts`` 与 ``events`` 一一对应。
+
+        覆盖此方法的处理器会被 ``EventDispatcher`` 按组调用（每组连续出队的
+        同类型事件调用一次），适合统计、聚合类处理器；传入的事件已经过
+        ``supports`` 筛选。默认实现逐个调用 ``handle``。
+        """
+        produced: list[EventABC[BaseEventMessage]] = []
+        for event, context in zip(events, contexts):
+            produced.extend(self.handle(event, context))
+        return produced
+
+
+def overrides_handle_batch(handler: EventHandler[BaseEventMessage]) -> bool:
+    """处理器是否提供了自己的 ``handle_batch``。"""
+    return type(handler).handle_batch is not EventHandler.handle_batch
+
+
+class AsyncEventHandler(EventHandler[T]):
+    """异步事件处理器契约，需配合 ``AsyncEventDispatcher`` 使用。
+
+    同步的 ``EventDispatcher`` 无法等待 ``handle`` 返回的协程，分派时会跳过
+    这类处理器。
+    """
+
+    @abstractmethod
+    async def handle(  # type: ignore[override]
+        self, event: EventABC[T], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]: ...
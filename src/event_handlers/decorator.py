@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import inspect
 from functools import wraps
-from typing import Any, Callable, Iterable, TypeVar, cast
-
-from src.event_handlers.base import EventHandler
-from src.event_handlers.registry import EventHandlerRegistry
-from src.event_types import EventType
+from typing import Any, Awaitable, Callable, Iterable, TypeVar, cast
+
+from src.event_handlers.base import AsyncEventHandler, EventHandler
+from src.event_handlers.registry import (
+    EventHandlerRegistry,
+    Subscription,
+    compile_subscription,
+)
 from src.events.base import BaseEventMessage, EventABC, EventContext
 
-HandlerFunc = Callable[..., Iterable[EventABC[BaseEventMessage]]]
+HandlerFunc = Callable[
+    ...,
+    Iterable[EventABC[BaseEventMessage]]
+    | Awaitable[Iterable[EventABC[BaseEventMessage]]],
+]
 F = TypeVar("F", bound=HandlerFunc)
 HandlerType = TypeVar("HandlerType", bound=EventHandler[Any])
 
@@ -31,11 +39,12 @@ def get_global_registry() -> EventHandlerRegistry:
     return _global_registry
 
 
-def event_handler(event_type: EventType) -> Callable[[F], F]:
+def event_handler(event_type: Subscription) -> Callable[[F], F]:
     """事件处理器装饰器，用于自动注册处理器到全局注册表。
 
     Args:
-        event_type: 要处理的事件类型
+        event_type: 要处理的事件类型，也可以是通配符 ``"*"``（等同于
+            ``EventTypes.DEFAULT``）或前缀订阅 ``"player.*"``
 
     Returns:
         装饰器函数
@@ -48,6 +57,9 @@ def event_handler(event_type: EventType) -> Callable[[F], F]:
     """
 
     def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            return _register_async_function(event_type, func)
+
         @wraps(func)
         def wrapper(
             event: EventABC[Any], context: EventContext
@@ -56,17 +68,25 @@ def event_handler(event_type: EventType) -> Callable[[F], F]:
 
         # 创建处理器类
         class FunctionEventHandler(EventHandler[BaseEventMessage]):
+            type_exact = True
+
             def __init__(self, handler_func: HandlerFunc):
                 self._handler_func = handler_func
                 self._event_type = event_type
+                self._matches = compile_subscription(event_type)
 
             def supports(self, event: EventABC[BaseEventMessage]) -> bool:
-                return event.event_type == self._event_type
+                return self._matches(event.event_type)
 
             def handle(
                 self, event: EventABC[BaseEventMessage], context: EventContext
             ) -> list[EventABC[BaseEventMessage]]:
-                return list(self._handler_func(event, context))
+                return list(
+                    cast(
+                        Iterable[EventABC[BaseEventMessage]],
+                        self._handler_func(event, context),
+                    )
+                )
 
             def __repr__(self) -> str:
                 return f"FunctionEventHandler({self._event_type}, {self._handler_func.__name__})"
@@ -77,14 +97,57 @@ def event_handler(event_type: EventType) -> Callable[[F], F]:
         registry.register(event_type, handler_instance)
 
         # 将处理器实例附加到函数上，以便后续访问
-        setattr(wrapper, "_event_handler", handler_instance)
-        setattr(wrapper, "_event_type", event_type)
+        wrapper._event_handler = handler_instance  # type: ignore[attr-defined]
+        wrapper._event_type = event_type  # type: ignore[attr-defined]
 
         return cast(F, wrapper)
 
     return decorator
 
 
+def _register_async_function(event_type: Subscription, func: F) -> F:
+    """为 ``async def`` 处理函数创建并注册 ``AsyncEventHandler``。"""
+
+    @wraps(func)
+    async def wrapper(
+        event: EventABC[Any], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return await cast(
+            Awaitable[Iterable[EventABC[BaseEventMessage]]], func(event, context)
+        )
+
+    class AsyncFunctionEventHandler(AsyncEventHandler[BaseEventMessage]):
+        type_exact = True
+
+        def __init__(self, handler_func: HandlerFunc):
+            self._handler_func = handler_func
+            self._event_type = event_type
+            self._matches = compile_subscription(event_type)
+
+        def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+            return self._matches(event.event_type)
+
+        async def handle(
+            self, event: EventABC[BaseEventMessage], context: EventContext
+        ) -> list[EventABC[BaseEventMessage]]:
+            result = self._handler_func(event, context)
+            return list(
+                await cast(Awaitable[Iterable[EventABC[BaseEventMessage]]], result)
+            )
+
+        def __repr__(self) -> str:
+            return f"AsyncFunctionEventHandler({self._event_type}, {self._handler_func.__name__})"
+
+    registry = get_global_registry()
+    handler_instance: EventHandler[BaseEventMessage] = AsyncFunctionEventHandler(func)
+    registry.register(event_type, handler_instance)
+
+    wrapper._event_handler = handler_instance  # type: ignore[attr-defined]
+    wrapper._event_type = event_type  # type: ignore[attr-defined]
+
+    return cast(F, wrapper)
+
+
 class auto_register:
     """类装饰器，用于自动注册 EventHandler 子类到全局注册表。
 
@@ -102,7 +165,7 @@ class auto_register:
                 return []
     """
 
-    def __init__(self, event_type: EventType):
+    def __init__(self, event_type: Subscription):
         self.event_type = event_type
 
     def __call__(self, cls: type[HandlerType]) -> type[HandlerType]:
@@ -115,13 +178,13 @@ class auto_register:
         registry.register(self.event_type, handler_instance)
 
         # 在类上标记注册信息
-        setattr(cls, "_registered_event_type", self.event_type)
-        setattr(cls, "_is_auto_registered", True)
+        cls._registered_event_type = self.event_type  # type: ignore[attr-defined]
+        cls._is_auto_registered = True  # type: ignore[attr-defined]
 
         return cls
 
 
-def register_handler(event_type: EventType, handler: EventHandler[Any]) -> None:
+def register_handler(event_type: Subscription, handler: EventHandler[Any]) -> None:
     """手动注册事件处理器到全局注册表。
 
     Args:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from src.events.base import EventABC, EventContext, BaseEventMessage
 from src.event_handlers.base import EventHandler
@@ -11,8 +11,10 @@ from src.events import (
     PlayerStateChangedMessage,
     SkillHitMessage,
     SystemTickMessage,
+    message_model,
 )
 from src.event_handlers.decorator import event_handler, auto_register
+from src.event_handlers.log_sink import log
 
 
 # 游戏统计处理器（使用类装饰器，因为需要维护状态）
@@ -22,6 +24,8 @@ from src.event_handlers.decorator import event_handler, auto_register
 class GameStatsHandler(EventHandler[BaseEventMessage]):
     """游戏统计处理器，收集和分析游戏数据。"""
 
+    type_exact = True
+
     def __init__(self):
         self.total_damage = 0
         self.health_changes = 0
@@ -43,19 +47,40 @@ class GameStatsHandler(EventHandler[BaseEventMessage]):
         Returns:
             空列表，不产生新事件
         """
-        if isinstance(event.event_message, SkillHitMessage):
+        self._count(event)
+        self._report()
+        return []
+
+    def handle_batch(
+        self,
+        events: Sequence[EventABC[BaseEventMessage]],
+        contexts: Sequence[EventContext],
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        """批量收集统计数据，每组事件只输出一次汇总。"""
+        for event in events:
+            self._count(event)
+        self._report()
+        return []
+
+    def _count(self, event: EventABC[BaseEventMessage]) -> None:
+        # 派生事件可能是轻量消息，按模型类判断
+        model = message_model(event.event_message)
+        if issubclass(model, SkillHitMessage):
             self.total_damage += event.event_message.damage
-        elif isinstance(event.event_message, PlayerHealthChangedMessage):
+        elif issubclass(model, PlayerHealthChangedMessage):
             self.health_changes += 1
-        elif isinstance(event.event_message, PlayerStateChangedMessage):
+        elif issubclass(model, PlayerStateChangedMessage):
             self.state_changes += 1
 
-        print(
-            f"[game-stats] 总伤害: {self.total_damage}, 生命值变化: {self.health_changes}, 状态变化: {self.state_changes}"
+    def _report(self) -> None:
+        log(
+            "game-stats",
+            "总伤害: {}, 生命值变化: {}, 状态变化: {}",
+            self.total_damage,
+            self.health_changes,
+            self.state_changes,
         )
 
-        return []
-
 
 # 使用装饰器创建各种游戏事件处理器
 @event_handler(EventTypes.PLAYER_HEALTH_CHANGED)
@@ -72,7 +97,7 @@ def game_log_health(
         空列表，不产生新事件
     """
     timestamp = context.attributes.get("timestamp", "未知时间")
-    print(f"[game-log] [{timestamp}] 玩家生命值变化: {event.event_message}")
+    log("game-log", "[{}] 玩家生命值变化: {}", timestamp, event.event_message)
 
     return []
 
@@ -91,7 +116,7 @@ def game_log_state(
         空列表，不产生新事件
     """
     timestamp = context.attributes.get("timestamp", "未知时间")
-    print(f"[game-log] [{timestamp}] 玩家状态变化: {event.event_message}")
+    log("game-log", "[{}] 玩家状态变化: {}", timestamp, event.event_message)
 
     return []
 
@@ -110,7 +135,7 @@ def game_log_player_created(
         空列表，不产生新事件
     """
     timestamp = context.attributes.get("timestamp", "未知时间")
-    print(f"[game-log] [{timestamp}] 玩家创建: {event.event_message}")
+    log("game-log", "[{}] 玩家创建: {}", timestamp, event.event_message)
 
     return []
 
@@ -129,7 +154,7 @@ def handle_system_tick(
         空列表，不产生新事件
     """
     tick_count = context.attributes.get("tick_count", 0)
-    print(f"[system-tick] 系统时钟 #{tick_count}")
+    log("system-tick", "系统时钟 #{}", tick_count)
 
     return []
 
@@ -147,7 +172,7 @@ def handle_player_created(
     Returns:
         空列表，不产生新事件
     """
-    print(f"[player-created] 新玩家加入游戏: {event.event_message}")
+    log("player-created", "新玩家加入游戏: {}", event.event_message)
     return []
 
 
@@ -169,8 +194,12 @@ def monitor_skill_performance(
     efficiency = (
         "高" if message.damage >= 100 else "中" if message.damage >= 50 else "低"
     )
-    print(
-        f"[skill-monitor] 技能 {message.skill_id} 效率: {efficiency} (伤害: {message.damage})"
+    log(
+        "skill-monitor",
+        "技能 {} 效率: {} (伤害: {})",
+        message.skill_id,
+        efficiency,
+        message.damage,
     )
 
     return []
@@ -190,9 +219,9 @@ def trace_event_flow(
     Returns:
         空列表，不产生新事件
     """
-    print(f"[event-trace] 开始处理事件: {event.event_type.value}")
-    print(f"[event-trace] 当前状态路径: {' -> '.join(context.state_path)}")
-    print(f"[event-trace] 上下文属性键: {list(context.attributes.keys())}")
+    log("event-trace", "开始处理事件: {}", event.event_type.value)
+    log("event-trace", "当前状态路径: {}", " -> ".join(context.state_path))
+    log("event-trace", "上下文属性键: {}", list(context.attributes.keys()))
 
     return []
 
@@ -218,16 +247,25 @@ def analyze_game_balance(
     )
 
     if damage_percentage > 80:
-        print(
-            f"[balance-analysis] 技能 {message.skill_id} 伤害过高，占目标生命值 {damage_percentage:.1f}%"
+        log(
+            "balance-analysis",
+            "技能 {} 伤害过高，占目标生命值 {:.1f}%",
+            message.skill_id,
+            damage_percentage,
         )
     elif damage_percentage < 20:
-        print(
-            f"[balance-analysis] 技能 {message.skill_id} 伤害过低，仅占目标生命值 {damage_percentage:.1f}%"
+        log(
+            "balance-analysis",
+            "技能 {} 伤害过低，仅占目标生命值 {:.1f}%",
+            message.skill_id,
+            damage_percentage,
         )
     else:
-        print(
-            f"[balance-analysis] 技能 {message.skill_id} 伤害适中，占目标生命值 {damage_percentage:.1f}%"
+        log(
+            "balance-analysis",
+            "技能 {} 伤害适中，占目标生命值 {:.1f}%",
+            message.skill_id,
+            damage_percentage,
         )
 
     return []
@@ -247,10 +285,10 @@ def debug_event(
     Returns:
         空列表，不产生新事件
     """
-    print(f"[debug] 事件类型: {event.event_type}")
-    print(f"[debug] 事件消息: {event.event_message}")
-    print(f"[debug] 上下文路径: {context.state_path}")
-    print(f"[debug] 上下文属性: {context.attributes}")
-    print("---")
+    log("debug", "事件类型: {}", event.event_type)
+    log("debug", "事件消息: {}", event.event_message)
+    log("debug", "上下文路径: {}", context.state_path)
+    log("debug", "上下文属性: {}", context.attributes)
+    log("debug", "---")
 
     return []
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+from collections import deque
+from typing import Any, TextIO
+
+# 记录时做浅拷贝的内置可变容器，避免写出前被修改
+_SNAPSHOT_TYPES = (dict, list, set, bytearray)
+
+
+class EventLogSink:
+    """处理器使用的缓冲日志输出，格式化与写入都在后台线程完成。
+
+    ``log`` 只把 (标签, 模板, 参数) 追加到内存队列，不做字符串格式化，也不
+    触碰 I/O；后台线程在积压达到 ``flush_size`` 条或距上次写出超过
+    ``flush_interval`` 秒时批量格式化并写出。队列达到 ``max_buffered`` 条后
+    新记录会被丢弃并计数，下一次写出时附带丢弃提示。``close`` 之后的记录同样
+    被丢弃并计数。
+
+    参数在写出时才格式化。``dict``/``list``/``set``/``bytearray`` 参数在记录时
+    做浅拷贝；其他对象（如消息模型）在写出前不应再被修改。
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        *,
+        max_buffered: int = 10_000,
+        flush_size: int = 256,
+        flush_interval: float = 0.1,
+    ):
+        if max_buffered <= 0 or flush_size <= 0:
+            raise ValueError("max_buffered 与 flush_size 必须为正数")
+        self._stream = stream
+        self._max_buffered = max_buffered
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._records: deque[tuple[str, str, tuple[Any, ...]]] = deque()
+        self._dropped = 0
+        self._reported_dropped = 0
+        # 丢弃计数可能被多个记录线程同时递增
+        self._dropped_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # 保证同一时刻只有一个线程在格式化和写出
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._worker: threading.Thread | None = None
+
+    @property
+    def dropped(self) -> int:
+        """因缓冲区已满而丢弃的记录数。"""
+        return self._dropped
+
+    def log(self, tag: str, template: str, *args: Any) -> bool:
+        """追加一条记录，输出为 ``[tag] template.format(*args)``。
+
+        返回 ``False`` 表示记录因缓冲区已满或已关闭被丢弃。
+        """
+        records = self._records
+        if self._closed or len(records) >= self._max_buffered:
+            with self._dropped_lock:
+                self._dropped += 1
+            return False
+        for arg in args:
+            if isinstance(arg, _SNAPSHOT_TYPES):
+                args = tuple(
+                    value.copy() if isinstance(value, _SNAPSHOT_TYPES) else value
+                    for value in args
+                )
+                break
+        # deque.append 在持有 GIL 时是原子的，无需加锁
+        records.append((tag, template, args))
+        if self._worker is None:
+            self.start()
+        elif len(records) >= self._flush_size:
+            self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """启动后台写出线程（首次 ``log`` 时会自动启动）。"""
+        with self._write_lock:
+            if self._worker is not None or self._closed:
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="event-log-sink", daemon=True
+            )
+            self._worker.start()
+
+    def flush(self) -> None:
+        """在调用线程中立即写出当前积压的全部记录。"""
+        with self._write_lock:
+            self._drain()
+
+    def close(self) -> None:
+        """停止后台线程并写出剩余记录，之后的 ``log`` 调用会被丢弃。"""
+        self._closed = True
+        self._wakeup.set()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            with self._write_lock:
+                self._drain()
+
+    def _drain(self) -> None:
+        records = self._records
+        if not records and self._dropped == self._reported_dropped:
+            return
+        lines: list[str] = []
+        popleft = records.popleft
+        for _ in range(len(records)):
+            tag, template, args = popleft()
+            try:
+                text = template.format(*args) if args else template
+            except Exception as exc:  # noqa: BLE001 - 格式化失败不能中断写出
+                text = f"<日志格式化失败: {exc!r}> {template}"
+            lines.append(f"[{tag}] {text}\n")
+        dropped = self._dropped
+        if dropped != self._reported_dropped:
+            lines.append(
+                f"[log-sink] 缓冲区已满，丢弃 {dropped - self._reported_dropped} 条记录\n"
+            )
+            self._reported_dropped = dropped
+        stream = self._stream or sys.stdout
+        stream.write("".join(lines))
+        stream.flush()
+
+
+# 全局日志输出实例
+_global_sink: EventLogSink | None = None
+
+
+def get_log_sink() -> EventLogSink:
+    """获取全局日志输出实例，首次调用时创建并在进程退出时写出剩余记录。"""
+    global _global_sink
+    if _global_sink is None:
+        _global_sink = EventLogSink()
+        atexit.register(_global_sink.close)
+    return _global_sink
+
+
+def set_log_sink(sink: EventLogSink) -> EventLogSink | None:
+    """替换全局日志输出实例，返回之前的实例（不会自动关闭）。"""
+    global _global_sink
+    previous, _global_sink = _global_sink, sink
+    return previous
+
+
+def log(tag: str, template: str, *args: Any) -> bool:
+    """写入全局日志输出，参见 ``EventLogSink.log``。"""
+    return get_log_sink().log(tag, template, *args)
@@ -4,6 +4,7 @@ from typing import Iterable
 
 from src.event_handlers.base import EventHandler
 from src.event_handlers.decorator import auto_register, event_handler
+from src.event_handlers.log_sink import log
 from src.event_types import EventTypes
 from src.events import PlayerHealthChangedMessage, PlayerStateChangedMessage
 from src.events.base import BaseEventMessage, EventABC, EventContext
@@ -13,6 +14,8 @@ from src.events.base import BaseEventMessage, EventABC, EventContext
 class PlayerHealthLogger(EventHandler[PlayerHealthChangedMessage]):
     """使用装饰器自动注册的玩家生命值记录器。"""
 
+    type_exact = True
+
     def supports(self, event: EventABC[PlayerHealthChangedMessage]) -> bool:
         """检查事件是否为玩家生命值变化事件。"""
         return event.event_type == EventTypes.PLAYER_HEALTH_CHANGED
@@ -22,7 +25,7 @@ class PlayerHealthLogger(EventHandler[PlayerHealthChangedMessage]):
     ) -> Iterable[EventABC[BaseEventMessage]]:
         """处理玩家生命值变化事件。"""
         message = event.event_message
-        print(f"[health-logger] 玩家 {message.player_id} 当前生命值: {message.value}")
+        log("health-logger", "玩家 {} 当前生命值: {}", message.player_id, message.value)
 
         return []
 
@@ -48,15 +51,19 @@ def handle_player_health(
         "危险" if message.value <= 20 else "正常" if message.value > 50 else "警告"
     )
 
-    print(
-        f"[player-health] 玩家 {message.player_id} 生命值变化: {message.value} ({health_status})"
+    log(
+        "player-health",
+        "玩家 {} 生命值变化: {} ({})",
+        message.player_id,
+        message.value,
+        health_status,
     )
 
     # 如果生命值过低，发出警告
     if message.value <= 0:
-        print(f"[player-health] 玩家 {message.player_id} 已经死亡！")
+        log("player-health", "玩家 {} 已经死亡！", message.player_id)
     elif message.value <= 20:
-        print(f"[player-health] 玩家 {message.player_id} 生命值极低，需要治疗！")
+        log("player-health", "玩家 {} 生命值极低，需要治疗！", message.player_id)
 
     return []
 
@@ -76,8 +83,12 @@ def log_health_change(
     """
     message = event.event_message
     source = message.source_event or "未知"
-    print(
-        f"[health-log] {message.player_id}: 来源={source}, 当前生命值={message.value}"
+    log(
+        "health-log",
+        "{}: 来源={}, 当前生命值={}",
+        message.player_id,
+        source,
+        message.value,
     )
 
     return []
@@ -100,22 +111,34 @@ def check_health_threshold(
 
     # 检查不同阈值
     if message.value <= 0:
-        print(f"[health-threshold] {message.player_id}: 死亡状态")
+        log("health-threshold", "{}: 死亡状态", message.player_id)
     elif message.value <= 10:
-        print(
-            f"[health-threshold] {message.player_id}: 濒死状态 (生命值: {message.value})"
+        log(
+            "health-threshold",
+            "{}: 濒死状态 (生命值: {})",
+            message.player_id,
+            message.value,
         )
     elif message.value <= 30:
-        print(
-            f"[health-threshold] {message.player_id}: 重伤状态 (生命值: {message.value})"
+        log(
+            "health-threshold",
+            "{}: 重伤状态 (生命值: {})",
+            message.player_id,
+            message.value,
         )
     elif message.value <= 60:
-        print(
-            f"[health-threshold] {message.player_id}: 轻伤状态 (生命值: {message.value})"
+        log(
+            "health-threshold",
+            "{}: 轻伤状态 (生命值: {})",
+            message.player_id,
+            message.value,
         )
     else:
-        print(
-            f"[health-threshold] {message.player_id}: 健康状态 (生命值: {message.value})"
+        log(
+            "health-threshold",
+            "{}: 健康状态 (生命值: {})",
+            message.player_id,
+            message.value,
         )
 
     return []
@@ -137,8 +160,12 @@ def handle_player_state(
     """
     message = event.event_message
     trail_str = " -> ".join(message.trail) if message.trail else "无路径"
-    print(
-        f"[player-state] 玩家 {message.player_id} 状态变更为: {message.state} (路径: {trail_str})"
+    log(
+        "player-state",
+        "玩家 {} 状态变更为: {} (路径: {})",
+        message.player_id,
+        message.state,
+        trail_str,
     )
 
     return []
@@ -158,14 +185,14 @@ def log_state_transition(
         空列表，不产生新事件
     """
     message = event.event_message
-    print(f"[state-transition] {message.player_id}: 转换到状态 '{message.state}'")
+    log("state-transition", "{}: 转换到状态 '{}'", message.player_id, message.state)
 
     # 可以根据状态执行不同的逻辑
     if message.state == "dead":
-        print(f"[state-transition] {message.player_id}: 玩家已死亡，需要复活或重新开始")
+        log("state-transition", "{}: 玩家已死亡，需要复活或重新开始", message.player_id)
     elif message.state == "respawning":
-        print(f"[state-transition] {message.player_id}: 玩家正在复活中...")
+        log("state-transition", "{}: 玩家正在复活中...", message.player_id)
     elif message.state == "active":
-        print(f"[state-transition] {message.player_id}: 玩家状态活跃，可以继续游戏")
+        log("state-transition", "{}: 玩家状态活跃，可以继续游戏", message.player_id)
 
     return []
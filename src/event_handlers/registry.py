@@ -1,33 +1,241 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Any, DefaultDict, Generator, Iterable, TypeVar
+from typing import Any, Callable, DefaultDict, Generator, Iterable, Sequence, TypeVar
 
-from src.event_handlers.base import EventHandler
-from src.event_types import EventType
+from src.event_handlers.base import (
+    AsyncEventHandler,
+    EventHandler,
+    overrides_handle_batch,
+)
+from src.event_types import EventType, EventTypes
 from src.events.base import BaseEventMessage, EventABC, EventContext
+from src.events.instrumentation import (
+    add_instrumentation_listener,
+    describe,
+    get_instrumentation,
+)
 
 T = TypeVar("T", bound=BaseEventMessage)
 
+# 订阅键：具体事件类型、通配符 "*"（或 EventTypes.DEFAULT）、前缀 "player.*"
+Subscription = EventType | str
+
+WILDCARD = "*"
+
+HandleFn = Callable[[EventABC[Any], EventContext], Iterable[EventABC[BaseEventMessage]]]
+SupportsFn = Callable[[EventABC[Any]], bool]
+# 编译后的处理器：(需要先调用的 supports，type_exact 时为 None；handle)
+BoundHandler = tuple[SupportsFn | None, HandleFn]
+
+
+def compile_subscription(subscription: Subscription) -> Callable[[EventType], bool]:
+    """把订阅键编译为事件类型匹配函数。"""
+    if subscription is EventTypes.DEFAULT or subscription == WILDCARD:
+        return lambda event_type: True
+    if isinstance(subscription, str) and subscription.endswith(".*"):
+        prefix = subscription[:-1]
+        return lambda event_type: event_type.value.startswith(prefix)
+    if isinstance(subscription, str) and "*" in subscription:
+        raise ValueError(f"不支持的订阅模式: {subscription!r}")
+    return lambda event_type: event_type == subscription
+
 
 class EventHandlerRegistry:
-    """Stores handlers grouped by event type for quick lookup."""
+    """Stores handlers grouped by event type for quick lookup.
+
+    除具体事件类型外，还支持通配订阅（``"*"`` 或 ``EventTypes.DEFAULT``）与
+    前缀订阅（``"player.*"``）。每个事件类型的处理器链在首次使用时按注册顺序
+    预先算好并缓存，注册变化时才失效，因此分派时只有一次字典查找。
+
+    ``AsyncEventHandler`` 只由 ``AsyncEventDispatcher`` 调用，不进入同步分派
+    使用的处理函数链（``handlers_for``、``split_for``）。
+    """
 
     def __init__(self):
-        self._handlers: DefaultDict[EventType, list[EventHandler[Any]]] = defaultdict(
-            list
+        self._handlers: DefaultDict[Subscription, list[EventHandler[Any]]] = (
+            defaultdict(list)
         )
+        # 全部注册记录，按注册顺序保存 (匹配函数, 处理器)
+        self._registrations: list[
+            tuple[Callable[[EventType], bool], EventHandler[Any]]
+        ] = []
+        self._chains: dict[EventType, tuple[EventHandler[Any], ...]] = {}
+        self._compiled: dict[EventType, tuple[BoundHandler, ...]] = {}
+        # 按批处理的处理器与其余处理器分开编译，供 EventDispatcher 使用
+        self._split: dict[
+            EventType, tuple[tuple[BoundHandler, ...], tuple[EventHandler[Any], ...]]
+        ] = {}
+        # AsyncEventDispatcher 使用：(同步处理函数链, 异步处理器)
+        self._async_split: dict[
+            EventType,
+            tuple[tuple[BoundHandler, ...], tuple[AsyncEventHandler[Any], ...]],
+        ] = {}
+        add_instrumentation_listener(self)
 
-    def register(self, event_type: EventType, handler: EventHandler[Any]) -> None:
+    def register(self, event_type: Subscription, handler: EventHandler[Any]) -> None:
+        matches = compile_subscription(event_type)
         self._handlers[event_type].append(handler)
+        self._registrations.append((matches, handler))
+        self._chains = {}
+        self._compiled = {}
+        self._split = {}
+        self._async_split = {}
+
+    def _instrumentation_changed(self) -> None:
+        # 计时开关变化后重新编译处理函数链
+        self._compiled = {}
+        self._split = {}
+        self._async_split = {}
+
+    def chain(self, event_type: EventType) -> tuple[EventHandler[Any], ...]:
+        """该事件类型对应的处理器链（含通配与前缀订阅），按注册顺序排列。"""
+        chain = self._chains.get(event_type)
+        if chain is None:
+            chain = tuple(
+                handler
+                for matches, handler in self._registrations
+                if matches(event_type)
+            )
+            self._chains[event_type] = chain
+        return chain
+
+    def sync_chain(self, event_type: EventType) -> tuple[EventHandler[Any], ...]:
+        """同步分派可用的处理器链，排除了 ``AsyncEventHandler``。"""
+        return tuple(
+            handler
+            for handler in self.chain(event_type)
+            if not isinstance(handler, AsyncEventHandler)
+        )
+
+    def handlers_for(self, event_type: EventType) -> tuple[BoundHandler, ...]:
+        """编译后的处理器链，每项为 ``(supports, handle)`` 绑定方法。
+
+        ``type_exact`` 处理器的 ``supports`` 为 ``None``，调用方直接调用
+        ``handle``；其余处理器由调用方先调用 ``supports``，不额外包装闭包。
+        """
+        compiled = self._compiled.get(event_type)
+        if compiled is None:
+            compiled = tuple(_bind(handler) for handler in self.sync_chain(event_type))
+            self._compiled[event_type] = compiled
+        return compiled
+
+    def split_for(
+        self, event_type: EventType
+    ) -> tuple[tuple[BoundHandler, ...], tuple[EventHandler[Any], ...]]:
+        """返回 (逐事件处理函数链, 覆盖了 ``handle_batch`` 的处理器)。"""
+        split = self._split.get(event_type)
+        if split is None:
+            chain = self.sync_chain(event_type)
+            split = (
+                tuple(
+                    _bind(handler)
+                    for handler in chain
+                    if not overrides_handle_batch(handler)
+                ),
+                tuple(handler for handler in chain if overrides_handle_batch(handler)),
+            )
+            self._split[event_type] = split
+        return split
+
+    def async_split_for(
+        self, event_type: EventType
+    ) -> tuple[tuple[BoundHandler, ...], tuple[AsyncEventHandler[Any], ...]]:
+        """返回 (同步处理函数链, 异步处理器)，供 ``AsyncEventDispatcher`` 使用。
+
+        同步部分与 ``handlers_for`` 相同，是 ``(supports, handle)`` 对；异步处理器
+        仍需调用方按 ``type_exact`` 决定是否先调用 ``supports``。
+        """
+        split = self._async_split.get(event_type)
+        if split is None:
+            split = (
+                self.handlers_for(event_type),
+                tuple(
+                    handler
+                    for handler in self.chain(event_type)
+                    if isinstance(handler, AsyncEventHandler)
+                ),
+            )
+            self._async_split[event_type] = split
+        return split
+
+    def batch_handlers_for(
+        self, event_type: EventType
+    ) -> tuple[EventHandler[Any], ...]:
+        return self.split_for(event_type)[1]
+
+    def has_handlers(self, event_type: EventType) -> bool:
+        return bool(self.chain(event_type))
 
     def iter_handlers(self, event: EventABC[T]) -> Iterable[EventHandler[Any]]:
-        for handler in self._handlers.get(event.event_type, []):
-            if handler.supports(event):
+        for handler in self.chain(event.event_type):
+            if handler.type_exact or handler.supports(event):
                 yield handler
 
     def handle(
         self, event: EventABC[T], context: EventContext
     ) -> Generator[EventABC[BaseEventMessage], Any, None]:
-        for handler in self.iter_handlers(event):
-            yield from handler.handle(event, context)
+        for supports, handle in self.handlers_for(event.event_type):
+            if supports is None or supports(event):
+                yield from handle(event, context)
+
+    def handle_unbatched(
+        self, event: EventABC[T], context: EventContext
+    ) -> Generator[EventABC[BaseEventMessage], Any, None]:
+        """只运行不按批处理的处理器；按批处理的处理器由调用方分组调用。"""
+        for supports, handle in self.split_for(event.event_type)[0]:
+            if supports is None or supports(event):
+                yield from handle(event, context)
+
+    def handle_group(
+        self,
+        event_type: EventType,
+        events: Sequence[EventABC[Any]],
+        contexts: Sequence[EventContext],
+    ) -> list[EventABC[BaseEventMessage]]:
+        """把一组同类型事件交给按批处理的处理器，每个处理器调用一次。"""
+        produced: list[EventABC[BaseEventMessage]] = []
+        instrumentation = get_instrumentation()
+        for handler in self.batch_handlers_for(event_type):
+            if handler.type_exact:
+                selected, selected_contexts = events, contexts
+            else:
+                pairs = [
+                    (event, context)
+                    for event, context in zip(events, contexts)
+                    if handler.supports(event)
+                ]
+                if not pairs:
+                    continue
+                selected = [event for event, _ in pairs]
+                selected_contexts = [context for _, context in pairs]
+            if instrumentation is None:
+                produced.extend(handler.handle_batch(selected, selected_contexts))
+            else:
+                with instrumentation.measure("handler", describe(handler)):
+                    produced.extend(handler.handle_batch(selected, selected_contexts))
+        return produced
+
+
+def _bind(handler: EventHandler[Any]) -> BoundHandler:
+    """编译单个处理器；启用计时时包装为计时版本（含 ``supports`` 判断）。"""
+    instrumentation = get_instrumentation()
+    if instrumentation is None:
+        return (None if handler.type_exact else handler.supports, handler.handle)
+    return (
+        None,
+        instrumentation.timed_iter("handler", describe(handler), _filtered(handler)),
+    )
+
+
+def _filtered(handler: EventHandler[Any]) -> HandleFn:
+    if handler.type_exact:
+        return handler.handle
+    supports, handle = handler.supports, handler.handle
+
+    def filtered(
+        event: EventABC[Any], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return handle(event, context) if supports(event) else ()
+
+    return filtered
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Iterable
 
 from src.event_handlers.decorator import event_handler
+from src.event_handlers.log_sink import log
 from src.event_types import SkillEventTypes
 from src.events import SkillHitMessage
 from src.events.base import BaseEventMessage, EventABC, EventContext
@@ -23,8 +24,12 @@ def handle_skill_hit(
         空列表，不产生新事件
     """
     message = event.event_message
-    print(
-        f"[skill-hit-handler] 技能命中：{message.skill_id} -> {message.target_id} (伤害: {message.damage})"
+    log(
+        "skill-hit-handler",
+        "技能命中：{} -> {} (伤害: {})",
+        message.skill_id,
+        message.target_id,
+        message.damage,
     )
 
     return []
@@ -46,8 +51,12 @@ def handle_skill_hit_detailed(
         空列表，不产生新事件
     """
     message = event.event_message
-    print(
-        f"[skill-hit] 技能 {message.skill_id} 命中目标 {message.target_id}，造成 {message.damage} 点伤害"
+    log(
+        "skill-hit",
+        "技能 {} 命中目标 {}，造成 {} 点伤害",
+        message.skill_id,
+        message.target_id,
+        message.damage,
     )
 
     # 可以在这里添加额外的逻辑，比如：
@@ -73,8 +82,12 @@ def log_skill_damage(
     """
     message = event.event_message
     is_critical = "暴击" if message.is_critical else "普通"
-    print(
-        f"[skill-damage] {message.skill_id} 造成 {message.damage} 点伤害 ({is_critical})"
+    log(
+        "skill-damage",
+        "{} 造成 {} 点伤害 ({})",
+        message.skill_id,
+        message.damage,
+        is_critical,
     )
 
     return []
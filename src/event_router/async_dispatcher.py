@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, TypeVar
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.events.base import BaseEventMessage, EventABC, EventContext
+from src.events.tree import EventStateTree
+
+T = TypeVar("T", bound=BaseEventMessage)
+
+_Produced = list[tuple[EventABC[BaseEventMessage], EventContext]]
+
+
+class AsyncEventDispatcher:
+    """基于 asyncio 的调度器，可等待异步处理器和异步树动作。
+
+    同步处理器仍在调度循环中直接调用；异步处理器与状态树分派以
+    eager task 启动，未挂起即完成的协程不会产生额外的调度开销。
+    同一事件的多个异步处理器并发执行，``max_in_flight`` 限制同时存在的
+    异步调用（任务）数量：达到上限时先等待已有调用完成再创建新任务，因此
+    内存占用同样受限。上限按事件循环分别计数，同一个调度器可以在先后多次
+    ``asyncio.run`` 中使用。
+
+    与 ``EventDispatcher`` 不同，这里只保证因果顺序：派生事件总在
+    其来源事件之后处理，但不同分支之间的先后取决于异步调用的完成时间。
+    """
+
+    def __init__(
+        self,
+        tree: EventStateTree,
+        handler_registry: EventHandlerRegistry,
+        *,
+        max_in_flight: int = 64,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight 必须大于 0")
+        self._tree = tree
+        self._handler_registry = handler_registry
+        self._max_in_flight = max_in_flight
+        # 同一事件循环内的 emit 调用共享一个上限；信号量绑定在首次使用它的
+        # 循环上，因此按循环分别创建
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _semaphore_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_in_flight)
+        return semaphore
+
+    async def emit(
+        self, event: EventABC[T], context: EventContext | None = None
+    ) -> list[EventABC[BaseEventMessage]]:
+        context = context or EventContext()
+        self._tree.refresh()
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore_for(loop)
+        queue: Deque[tuple[EventABC[BaseEventMessage], EventContext]] = deque(
+            [(event, context)]
+        )
+        pending: set[asyncio.Task[_Produced]] = set()
+        processed: list[EventABC[BaseEventMessage]] = []
+        async_split_for = self._handler_registry.async_split_for
+
+        async def start(fn: Callable[..., Awaitable[_Produced]], *args: Any) -> None:
+            # 先取得名额再创建任务；名额未满时 acquire 不会挂起
+            await semaphore.acquire()
+            task = asyncio.eager_task_factory(
+                loop, _release_after(semaphore, fn, *args)
+            )
+            if task.done():
+                queue.extend(task.result())
+            else:
+                pending.add(task)
+
+        try:
+            while queue or pending:
+                while queue:
+                    current_event, current_context = queue.popleft()
+                    processed.append(current_event)
+
+                    await start(self._run_tree, current_event, current_context)
+                    # 按事件类型预先编译的处理函数链，与同步分派器一致
+                    sync_handlers, async_handlers = async_split_for(
+                        current_event.event_type
+                    )
+                    for supports, handle in sync_handlers:
+                        if supports is not None and not supports(current_event):
+                            continue
+                        for next_event in handle(current_event, current_context):
+                            queue.append((next_event, current_context))
+                    for handler in async_handlers:
+                        if handler.type_exact or handler.supports(current_event):
+                            await start(
+                                self._run_handler,
+                                handler,
+                                current_event,
+                                current_context,
+                            )
+
+                if pending:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        pending.discard(task)
+                        queue.extend(task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return processed
+
+    async def _run_tree(
+        self,
+        event: EventABC[BaseEventMessage],
+        context: EventContext,
+    ) -> _Produced:
+        tree_results = await self._tree.dispatch_async(event, context)
+        return [
+            (
+                next_event,
+                EventContext(state_path=(), attributes=next_context.attributes),
+            )
+            for next_event, next_context in tree_results
+        ]
+
+    async def _run_handler(
+        self,
+        handler: EventHandler[Any],
+        event: EventABC[BaseEventMessage],
+        context: EventContext,
+    ) -> _Produced:
+        handler_results = await handler.handle(event, context)  # type: ignore[misc]
+        return [(next_event, context) for next_event in handler_results]
+
+
+async def _release_after(
+    semaphore: asyncio.Semaphore, fn: Callable[..., Awaitable[_Produced]], *args: Any
+) -> _Produced:
+    try:
+        return await fn(*args)
+    finally:
+        semaphore.release()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Hashable
+
+from src.event_types import EventType
+from src.events.base import BaseEventMessage, EventABC
+from src.events.batch import EventBatch
+
+from .scheduling import WorkQueue
+
+KeyFn = Callable[[EventABC[Any]], Hashable]
+MergeFn = Callable[[EventABC[Any], EventABC[Any]], EventABC[BaseEventMessage]]
+
+
+def keep_last(
+    previous: EventABC[BaseEventMessage], current: EventABC[BaseEventMessage]
+) -> EventABC[BaseEventMessage]:
+    """默认合并方式：保留较新的事件。"""
+    return current
+
+
+def by_field(name: str) -> KeyFn:
+    """以消息字段为合并键，例如 ``by_field("player_id")``。"""
+
+    def key(event: EventABC[Any]) -> Hashable:
+        return getattr(event.event_message, name)
+
+    return key
+
+
+class EventCoalescer:
+    """按事件类型把工作队列中等待的同一实体事件合并为一个。
+
+    每个事件类型注册一个键函数与合并函数。``EventDispatcher`` 用
+    ``CoalescingQueue`` 包装工作队列：入队事件与队列中尚未处理的同类型、
+    同键事件用 ``merge(先前事件, 新事件)`` 合并，合并结果占据新事件（即最后
+    一个）的位置，先前的项作废。根事件与派生事件都参与合并。
+    """
+
+    def __init__(self) -> None:
+        self._rules: dict[EventType, tuple[KeyFn, MergeFn]] = {}
+        self.coalesced_counts: Counter[str] = Counter()
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def register(
+        self, event_type: EventType, key: KeyFn, merge: MergeFn = keep_last
+    ) -> None:
+        self._rules[event_type] = (key, merge)
+
+    def rule_for(self, event_type: EventType) -> tuple[KeyFn, MergeFn] | None:
+        return self._rules.get(event_type)
+
+
+class CoalescingQueue:
+    """在任意 ``WorkQueue`` 外层按 ``EventCoalescer`` 的规则合并等待中的事件。
+
+    被合并掉的项不从底层队列中删除，而是记为作废，在 ``take``/``peek``/
+    ``evict`` 经过时跳过（惰性删除），因此入队仍是 O(1)。``len`` 只计有效项。
+    批次（``EventBatch``）不参与合并。
+    """
+
+    __slots__ = ("_queue", "_coalescer", "_waiting", "_slots", "_stale")
+
+    def __init__(self, queue: WorkQueue, coalescer: EventCoalescer):
+        self._queue = queue
+        self._coalescer = coalescer
+        # (事件类型, 键) -> 队列中等待的有效项
+        self._waiting: dict[tuple[EventType, Hashable], Any] = {}
+        # 有效项 id -> 其 (事件类型, 键)
+        self._slots: dict[int, tuple[EventType, Hashable]] = {}
+        # 已作废项的 id；项仍留在底层队列中，id 在此期间不会被复用
+        self._stale: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._queue) - len(self._stale)
+
+    def __bool__(self) -> bool:
+        return len(self._queue) > len(self._stale)
+
+    def append(self, entry: Any) -> None:
+        item = entry[0]
+        rule = self._coalescer.rule_for(item.event_type)
+        if rule is None or isinstance(item, EventBatch):
+            self._queue.append(entry)
+            return
+        key, merge = rule
+        slot = (item.event_type, key(item))
+        previous = self._waiting.get(slot)
+        if previous is not None:
+            # 合并结果取代新项入队，位置与最后一个同键事件相同
+            self._stale.add(id(previous))
+            del self._slots[id(previous)]
+            entry = (merge(previous[0], item), *entry[1:])
+            self._coalescer.coalesced_counts[item.event_type.value] += 1
+        self._waiting[slot] = entry
+        self._slots[id(entry)] = slot
+        self._queue.append(entry)
+
+    def _release(self, entry: Any) -> bool:
+        """项离开底层队列；返回它是否有效。"""
+        identity = id(entry)
+        if identity in self._stale:
+            self._stale.discard(identity)
+            return False
+        slot = self._slots.pop(identity, None)
+        if slot is not None:
+            del self._waiting[slot]
+        return True
+
+    def _skip_stale(self) -> None:
+        queue, stale = self._queue, self._stale
+        while stale and id(queue.peek()) in stale:
+            stale.discard(id(queue.take()))
+
+    def take(self) -> Any:
+        while True:
+            entry = self._queue.take()
+            if self._release(entry):
+                return entry
+
+    def peek(self) -> Any:
+        self._skip_stale()
+        return self._queue.peek()
+
+    def evict(self) -> Any:
+        while True:
+            entry = self._queue.evict()
+            if self._release(entry):
+                return entry
+
+    def clear(self) -> None:
+        self._queue.clear()
+        self._waiting.clear()
+        self._slots.clear()
+        self._stale.clear()
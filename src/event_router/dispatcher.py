@@ -1,55 +1,371 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Any, Deque, Generator, TypeVar
+import threading
+from collections import Counter, deque
+from typing import Callable, Deque, Iterable, Iterator, Mapping, TypeVar
 
 from src.event_handlers.registry import EventHandlerRegistry
+from src.event_types import EventType
 from src.events.base import BaseEventMessage, EventABC, EventContext
-from src.events.tree import EventStateTree
+from src.events.batch import EventBatch
+from src.events.tree import EventOrBatch, EventStateTree
+
+from .coalescing import CoalescingQueue, EventCoalescer
+from .limits import DispatchLimits, QueueEntry, QueueGuard
+from .metrics import DispatchMetrics
+from .scheduling import FifoQueue, SchedulingMode, WorkQueue, make_work_queue
 
 T = TypeVar("T", bound=BaseEventMessage)
 
 
 class EventDispatcher:
-    """通过handlers和状态树协调路由事件。"""
+    """通过handlers和状态树协调路由事件。
+
+    传入 ``metrics`` 时在分派过程中更新吞吐量、队列深度与级联形态指标。
+    传入 ``limits`` 时限制工作队列长度、级联深度与每个根事件的事件总数，
+    超限的事件按 ``limits.policy`` 处理，``overflow_counts`` 按限额统计次数。
+    ``scheduling`` 选择工作队列的出队顺序（见 ``SchedulingMode``），
+    ``PRIORITY`` 模式下按 ``priorities`` 给出的事件类型优先级出队。
+    传入 ``coalescing`` 时，``emit_many`` 与 ``emit_batch`` 的工作队列按其规则
+    合并等待中的同一实体事件（根事件与派生事件均适用，见 ``EventCoalescer``）。
+    """
 
     def __init__(
         self,
         tree: EventStateTree,
         handler_registry: EventHandlerRegistry,
+        *,
+        metrics: DispatchMetrics | None = None,
+        limits: DispatchLimits | None = None,
+        scheduling: SchedulingMode = SchedulingMode.BFS,
+        priorities: Mapping[EventType, int] | None = None,
+        coalescing: EventCoalescer | None = None,
     ):
         self._tree = tree
         self._handler_registry = handler_registry
+        self._metrics = metrics
+        self._limits = limits
+        self._scheduling = SchedulingMode(scheduling)
+        self._priorities = dict(priorities or {})
+        self._coalescing = coalescing
+        self.overflow_counts: Counter[str] = Counter()
+        # emit_many 复用的空闲工作队列，按线程保存，避免每批次重新分配
+        self._idle_queues = threading.local()
+
+    def _new_queue(self) -> WorkQueue:
+        queue = make_work_queue(self._scheduling, self._priorities)
+        if self._coalescing is not None:
+            return CoalescingQueue(queue, self._coalescing)
+        return queue
+
+    def _acquire_queue(self) -> WorkQueue:
+        """取出当前线程的空闲队列；正在使用中（重入调用）时新建一个。"""
+        idle = self._idle_queues
+        queue = getattr(idle, "queue", None)
+        if queue is None:
+            return self._new_queue()
+        idle.queue = None
+        return queue
+
+    def _release_queue(self, queue: WorkQueue) -> None:
+        queue.clear()
+        self._idle_queues.queue = queue
+
+    def _record_overflow(self, limit: str) -> None:
+        self.overflow_counts[limit] += 1
+        if self._metrics is not None:
+            self._metrics.overflow_total[limit] += 1
+
+    def _enqueue_fn(self, queue: WorkQueue) -> Callable[[QueueEntry], None]:
+        """未配置限额时直接入队，否则经过 ``QueueGuard`` 检查。"""
+        if self._limits is None:
+            return queue.append
+        return QueueGuard(self._limits, queue, self._record_overflow).admit
 
     def emit(
         self, event: EventABC[T], context: EventContext | None = None
     ) -> list[EventABC[BaseEventMessage]]:
+        return self.emit_many((event,), context)[0]
+
+    def iter_emit(
+        self, event: EventABC[T], context: EventContext | None = None
+    ) -> Iterator[EventABC[BaseEventMessage]]:
+        """流式版本的 ``emit``：按相同的广度优先顺序逐个产出已处理事件。
+
+        不保留已处理事件列表，队列中保存的是各事件尚未读取的派生流（处理器
+        产出与 ``EventStateTree.iter_dispatch``），处理器与树动作在读取到它们
+        的产出时才执行；调用方停止迭代后其余级联不会再被处理。深度与根事件
+        预算照常生效。覆盖了 ``handle_batch`` 的处理器在此模式下逐事件调用
+        ``handle``。支持 ``BFS`` 与 ``DFS`` 调度；``PRIORITY`` 需要先取出派生
+        事件才能排序，与惰性求值矛盾，因此不支持。同理，待处理项是惰性流，
+        无法按 ``limits.max_queue`` 计数，也无法与等待中的事件合并，配置了
+        ``max_queue`` 或 ``coalescing`` 时同样抛出 ``ValueError``。
+        """
+        if self._scheduling is SchedulingMode.PRIORITY:
+            raise ValueError("iter_emit 不支持 PRIORITY 调度")
+        if self._limits is not None and self._limits.max_queue is not None:
+            raise ValueError("iter_emit 不支持 limits.max_queue")
+        if self._coalescing is not None:
+            raise ValueError("iter_emit 不支持 coalescing")
+        depth_first = self._scheduling is SchedulingMode.DFS
         context = context or EventContext()
-        queue: Deque[tuple[EventABC[BaseEventMessage], EventContext]] = deque(
-            [(event, context)]
-        )
-        processed: list[EventABC[BaseEventMessage]] = []
+        self._tree.refresh()
+        # 已通过限额检查、等待产出的事件（最多一项）
+        ready = FifoQueue()
+        admit = self._enqueue_fn(ready)
+        # 尚未读完的派生流及其中事件的深度
+        pending: Deque[
+            tuple[Iterator[tuple[EventABC[BaseEventMessage], EventContext]], int]
+        ] = deque()
 
-        while queue:
-            current_event, current_context = queue.popleft()
-            processed.append(current_event)
+        handle = self._handler_registry.handle
+        iter_dispatch = self._tree.iter_dispatch
+        metrics = self._metrics
+        processed = 0
+
+        admit((event, context, 0, 0))
+        while ready or pending:
+            if not ready:
+                # 深度优先时从最新的派生流读取
+                stream, depth = pending[-1] if depth_first else pending[0]
+                for next_event, next_context in stream:
+                    admit((next_event, next_context, 0, depth))
+                    break
+                else:
+                    if depth_first:
+                        pending.pop()
+                    else:
+                        pending.popleft()
+                continue
 
-            handler_results: Generator[EventABC[BaseEventMessage], Any, None] = (
-                self._handler_registry.handle(current_event, current_context)
+            current, current_context, _, depth = ready.take()
+            processed += 1
+            if metrics is not None:
+                metrics.observe_dispatch(current.event_type, 1, (), len(pending), depth)
+            yield current  # type: ignore[misc]
+
+            handler_stream = (
+                _with_context(handle(current, current_context), current_context),
+                depth + 1,
+            )
+            tree_stream = (
+                _fresh_contexts(iter_dispatch(current, current_context), metrics),
+                depth + 1,
             )
-            tree_results = self._tree.dispatch(current_event, current_context)
+            # 两种模式下都先读处理器产出，再读树的产出
+            if depth_first:
+                pending.append(tree_stream)
+                pending.append(handler_stream)
+            else:
+                pending.append(handler_stream)
+                pending.append(tree_stream)
+
+        if metrics is not None:
+            metrics.observe_cascade(processed)
 
-            for next_event in handler_results:
-                queue.append((next_event, current_context))
-            for next_event, next_context in tree_results:
-                queue.append(
+    def emit_many(
+        self, events: Iterable[EventABC[T]], context: EventContext | None = None
+    ) -> list[list[EventABC[BaseEventMessage]]]:
+        """通过同一个工作队列批量处理多个根事件。
+
+        每个根事件的处理顺序与单独调用 ``emit`` 一致，
+        返回值按根事件的输入顺序给出各自的已处理事件列表。覆盖了
+        ``handle_batch`` 的处理器按“连续出队的同类型事件”分组调用一次，
+        其产出排在队尾，归入组内第一个事件所属的根事件。根事件同样受限额
+        约束，被拒绝的根事件对应空列表。
+
+        配置了 ``coalescing`` 时，入队的事件与队列中尚未处理的同类型、同键事件
+        合并，合并结果排在最后一个同键事件的位置，归入其所属的根事件；被合并
+        掉的事件不会被处理，也不出现在结果中。
+        """
+        context = context or EventContext()
+        # 批次之间同步叶子配置的热更新，未变化时只比较版本号
+        self._tree.refresh()
+        # 队列按线程独占：并发调用各用各的，重入调用（例如处理器内部再次批量
+        # 发送）时当前线程的队列正被占用，会新建一个
+        queue = self._acquire_queue()
+        results: list[list[EventABC[BaseEventMessage]]] = []
+
+        # 热路径上预先绑定方法，省去每个事件的属性查找
+        registry = self._handler_registry
+        handle = registry.handle_unbatched
+        batch_handlers_for = registry.batch_handlers_for
+        dispatch = self._tree.dispatch
+        take = queue.take
+        peek = queue.peek
+        append = self._enqueue_fn(queue)
+        metrics = self._metrics
+
+        # 交给按批处理器的当前分组：连续出队的同类型事件
+        group_type: EventType | None = None
+        group_events: list[EventABC[BaseEventMessage]] = []
+        group_contexts: list[EventContext] = []
+        group_index = 0
+        group_depth = 0
+
+        try:
+            for index, event in enumerate(events):
+                results.append([])
+                append((event, context, index, 0))
+
+            while queue or group_events:
+                # 下一个事件类型不同（或队列已空）时结束当前分组
+                if group_events and (
+                    not queue or peek()[0].event_type is not group_type
+                ):
+                    # 分组产出的事件归入组内第一个事件所属的根事件
+                    produced = registry.handle_group(
+                        group_type,  # type: ignore[arg-type]
+                        group_events,
+                        group_contexts,
+                    )
+                    for next_event in produced:
+                        append(
+                            (
+                                next_event,
+                                group_contexts[0],
+                                group_index,
+                                group_depth + 1,
+                            )
+                        )
+                    group_events = []
+                    group_contexts = []
+                    continue
+
+                current_event, current_context, index, depth = take()  # type: ignore[assignment]
+                event_type = current_event.event_type
+                results[index].append(current_event)
+
+                handler_results = handle(current_event, current_context)
+                tree_results = dispatch(current_event, current_context)
+
+                if batch_handlers_for(event_type):
+                    if not group_events:
+                        group_type = event_type
+                        group_index = index
+                        group_depth = depth
+                    group_events.append(current_event)
+                    group_contexts.append(current_context)
+
+                for next_event in handler_results:
+                    append((next_event, current_context, index, depth + 1))
+                for next_event, next_context in tree_results:
+                    append(
+                        (
+                            next_event,
+                            EventContext(
+                                state_path=(), attributes=next_context.attributes
+                            ),
+                            index,
+                            depth + 1,
+                        )
+                    )
+                if metrics is not None:
+                    metrics.observe_dispatch(
+                        event_type, 1, tree_results, len(queue), depth
+                    )
+        finally:
+            # 异常中断时丢弃残留事件，保证复用队列下次从空开始
+            self._release_queue(queue)
+            if metrics is not None:
+                metrics.queue_depth = 0
+
+        if metrics is not None:
+            for processed in results:
+                metrics.observe_cascade(len(processed))
+        return results
+
+    def emit_batch(
+        self, batch: EventBatch, context: EventContext | None = None
+    ) -> list[EventOrBatch]:
+        """按列处理一批同类型事件。
+
+        批次沿 ``EventStateTree.dispatch_batch`` 传播，动作产出的批次继续按批
+        处理，产出的单个事件走与 ``emit`` 相同的路径。注册了处理器的事件类型
+        会把批次逐行物化后交给处理器，覆盖了 ``handle_batch`` 的处理器对整批只
+        调用一次。返回按处理顺序排列的批次与事件。整个批次视为同一个根事件，
+        限额中的事件数按批次行数计。
+        """
+        context = context or EventContext()
+        self._tree.refresh()
+        queue = self._new_queue()
+        append = self._enqueue_fn(queue)
+        append((batch, context, 0, 0))
+        processed: list[EventOrBatch] = []
+
+        registry = self._handler_registry
+        handle = registry.handle
+        has_handlers = registry.has_handlers
+        tree = self._tree
+        metrics = self._metrics
+
+        while queue:
+            current, current_context, _, depth = queue.take()
+            processed.append(current)
+            child = depth + 1
+
+            if isinstance(current, EventBatch):
+                if has_handlers(current.event_type):
+                    events = current.to_events()
+                    for event in events:
+                        for next_event in registry.handle_unbatched(
+                            event, current_context
+                        ):
+                            append((next_event, current_context, 0, child))
+                    # 按批处理器对整批只调用一次
+                    for next_event in registry.handle_group(
+                        current.event_type, events, [current_context] * len(events)
+                    ):
+                        append((next_event, current_context, 0, child))
+                tree_results = tree.dispatch_batch(current, current_context)
+            else:
+                for next_event in handle(current, current_context):
+                    append((next_event, current_context, 0, child))
+                tree_results = tree.dispatch(current, current_context)
+
+            for next_item, next_context in tree_results:
+                append(
                     (
-                        next_event,
-                        EventContext(
-                            state_path=(),
-                            attributes=next_context.attributes,
-                        ),
+                        next_item,
+                        EventContext(state_path=(), attributes=next_context.attributes),
+                        0,
+                        child,
                     )
                 )
+            if metrics is not None:
+                metrics.observe_dispatch(
+                    current.event_type,
+                    len(current) if isinstance(current, EventBatch) else 1,
+                    tree_results,
+                    len(queue),
+                    depth,
+                )
 
+        if metrics is not None:
+            metrics.queue_depth = 0
+            metrics.observe_cascade(
+                sum(
+                    len(item) if isinstance(item, EventBatch) else 1
+                    for item in processed
+                )
+            )
         return processed
+
+
+def _with_context(
+    events: Iterable[EventABC[BaseEventMessage]], context: EventContext
+) -> Iterator[tuple[EventABC[BaseEventMessage], EventContext]]:
+    for event in events:
+        yield event, context
+
+
+def _fresh_contexts(
+    results: Iterable[tuple[EventABC[BaseEventMessage], EventContext]],
+    metrics: DispatchMetrics | None,
+) -> Iterator[tuple[EventABC[BaseEventMessage], EventContext]]:
+    """树的产出以清空状态路径的上下文重新入队，与 ``emit`` 一致。"""
+    for event, context in results:
+        if metrics is not None:
+            path = context.state_path
+            metrics.node_produced_total[path[-1] if path else ""] += 1
+        yield event, EventContext(state_path=(), attributes=context.attributes)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+from src.events.base import EventContext
+from src.events.batch import EventBatch
+from src.events.tree import EventOrBatch
+
+from .scheduling import WorkQueue
+
+# 工作队列中的一项：(事件或批次, 上下文, 根事件序号, 级联深度)
+QueueEntry = tuple[EventOrBatch, EventContext, int, int]
+
+
+class OverflowPolicy(str, Enum):
+    """超出限额时对新事件的处理方式。"""
+
+    # 丢弃新事件
+    REJECT = "reject"
+    # 队列已满时先丢弃队列中最该被丢弃的项（见 WorkQueue.evict）再入队；
+    # 深度与根事件预算超限时同 REJECT
+    DROP_OLDEST = "drop_oldest"
+    # 写入 EventSpill 磁盘文件，之后可取回重新发送
+    SPILL = "spill"
+    # 抛出 DispatchLimitExceeded，中断本次分派
+    RAISE = "raise"
+
+
+class DispatchLimitExceeded(RuntimeError):
+    """``OverflowPolicy.RAISE`` 下事件超出限额。"""
+
+    def __init__(self, limit: str, event: EventOrBatch, depth: int):
+        self.limit = limit
+        self.event = event
+        self.depth = depth
+        super().__init__(
+            f"超出分派限额 {limit}: {event.event_type.value} (深度 {depth})"
+        )
+
+
+class EventSpill:
+    """把溢出的事件连同上下文与深度追加写入磁盘文件。
+
+    每次写入都在 ``with`` 块中打开并关闭文件，不长期持有文件句柄；溢出只发生
+    在过载时，打开文件的开销可以接受。``drain`` 读回全部记录并清空文件，
+    调用方可在负载下降后重新发送。
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = os.fspath(path)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def write(self, item: EventOrBatch, context: EventContext, depth: int) -> None:
+        with self._lock, open(self.path, "ab") as handle:
+            pickle.dump(
+                (item, context, depth), handle, protocol=pickle.HIGHEST_PROTOCOL
+            )
+            self._count += 1
+
+    def drain(self) -> list[tuple[EventOrBatch, EventContext, int]]:
+        """取回已溢出的 (事件, 上下文, 深度) 并清空文件。"""
+        with self._lock:
+            records: list[tuple[EventOrBatch, EventContext, int]] = []
+            if not os.path.exists(self.path):
+                return records
+            with open(self.path, "rb") as handle:
+                while True:
+                    try:
+                        records.append(pickle.load(handle))
+                    except EOFError:
+                        break
+            os.remove(self.path)
+            self._count = 0
+            return records
+
+
+@dataclass(frozen=True)
+class DispatchLimits:
+    """``EventDispatcher`` 的工作队列与级联预算。
+
+    - ``max_queue``：工作队列最多容纳的项数（一个批次算一项）
+    - ``max_depth``：事件距根事件的最大派生层数，根事件为 0
+    - ``max_events_per_root``：每个根事件（含自身）最多入队的事件数
+    """
+
+    max_queue: int | None = None
+    max_depth: int | None = None
+    max_events_per_root: int | None = None
+    policy: OverflowPolicy = OverflowPolicy.RAISE
+    spill: EventSpill | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_queue", "max_depth", "max_events_per_root"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} 不能为负数")
+        if self.policy is OverflowPolicy.SPILL and self.spill is None:
+            raise ValueError("OverflowPolicy.SPILL 需要提供 spill")
+
+
+class QueueGuard:
+    """单次分派调用的入队检查，``admit`` 可直接替代 ``WorkQueue.append``。"""
+
+    __slots__ = ("_limits", "_queue", "_admitted", "_on_overflow")
+
+    def __init__(
+        self,
+        limits: DispatchLimits,
+        queue: WorkQueue,
+        on_overflow: Callable[[str], None],
+    ):
+        self._limits = limits
+        self._queue = queue
+        # 各根事件已入队的事件数（批次按行数计）
+        self._admitted: Counter[int] = Counter()
+        self._on_overflow = on_overflow
+
+    def admit(self, entry: QueueEntry) -> None:
+        item, _, index, depth = entry
+        weight = len(item) if isinstance(item, EventBatch) else 1
+        limits = self._limits
+
+        if limits.max_depth is not None and depth > limits.max_depth:
+            self._overflow("depth", entry)
+            return
+        budget = limits.max_events_per_root
+        if budget is not None and self._admitted[index] + weight > budget:
+            self._overflow("events_per_root", entry)
+            return
+        if limits.max_queue is not None:
+            queue = self._queue
+            if len(queue) >= limits.max_queue:
+                if limits.policy is not OverflowPolicy.DROP_OLDEST or not queue:
+                    self._overflow("queue", entry)
+                    return
+                queue.evict()
+                self._on_overflow("queue")
+
+        self._admitted[index] += weight
+        self._queue.append(entry)
+
+    def _overflow(self, limit: str, entry: QueueEntry) -> None:
+        item, context, _, depth = entry
+        self._on_overflow(limit)
+        policy = self._limits.policy
+        if policy is OverflowPolicy.RAISE:
+            raise DispatchLimitExceeded(limit, item, depth)
+        if policy is OverflowPolicy.SPILL:
+            assert self._limits.spill is not None
+            self._limits.spill.write(item, context, depth)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, DefaultDict, Sequence
+
+from src.event_types import EventType
+from src.events.base import EventContext
+from src.events.batch import EventBatch
+from src.events.tree import EventOrBatch
+
+# 级联长度（每个根事件最终处理的事件数，含自身）直方图的桶上界
+CASCADE_BUCKETS: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class DispatchMetrics:
+    """分派器的吞吐量与级联形态指标，按 Prometheus 文本格式导出。
+
+    由 ``EventDispatcher(..., metrics=...)`` 在分派热路径上直接更新：计数器
+    只是普通的 ``dict``/``int`` 自增，不加锁，依赖 GIL 保证结构安全；多个
+    线程共用同一实例时，极少数并发自增可能丢失，这对监控告警可以接受。
+    导出时对各计数器做一次浅拷贝。
+
+    - ``events_total``：按事件类型统计已处理事件数（用 ``rate()`` 得到每秒吞吐）
+    - ``root_events_total`` 与 ``cascade_length``：每个根事件派生出的事件总数
+    - ``node_produced_total``：各树节点产出的事件数（扇出）
+    - ``queue_depth`` / ``queue_depth_max``：工作队列当前深度与历史峰值
+    - ``cascade_depth_max``：观测到的最大派生层数（根事件为 0）
+    - ``overflow_total``：按限额统计的超限次数（见 ``DispatchLimits``）
+    """
+
+    def __init__(self, namespace: str = "event_dispatch"):
+        self.namespace = namespace
+        self.events_total: DefaultDict[str, int] = defaultdict(int)
+        self.node_produced_total: DefaultDict[str, int] = defaultdict(int)
+        self.overflow_total: DefaultDict[str, int] = defaultdict(int)
+        self.root_events_total = 0
+        self.cascade_buckets = [0] * (len(CASCADE_BUCKETS) + 1)
+        self.cascade_sum = 0
+        self.cascade_max = 0
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        self.cascade_depth_max = 0
+
+    def observe_dispatch(
+        self,
+        event_type: EventType,
+        count: int,
+        tree_results: Sequence[tuple[EventOrBatch, EventContext]],
+        queue_depth: int,
+        cascade_depth: int = 0,
+    ) -> None:
+        """记录一次出队处理：``count`` 个事件、树的产出、处理后的队列深度以及
+        该事件距根事件的派生层数。"""
+        self.events_total[event_type.value] += count
+        if tree_results:
+            produced = self.node_produced_total
+            for item, context in tree_results:
+                path = context.state_path
+                # 产出者为状态路径的最后一个节点
+                produced[path[-1] if path else ""] += (
+                    len(item) if isinstance(item, EventBatch) else 1
+                )
+        self.queue_depth = queue_depth
+        if queue_depth > self.queue_depth_max:
+            self.queue_depth_max = queue_depth
+        if cascade_depth > self.cascade_depth_max:
+            self.cascade_depth_max = cascade_depth
+
+    def observe_cascade(self, length: int) -> None:
+        """记录一个根事件处理结束时的级联长度。"""
+        self.root_events_total += 1
+        self.cascade_sum += length
+        self.cascade_buckets[bisect_left(CASCADE_BUCKETS, length)] += 1
+        if length > self.cascade_max:
+            self.cascade_max = length
+
+    def reset(self) -> None:
+        """清零全部指标（原地清空，正在分派的调用方持有的引用仍然有效）。"""
+        self.events_total.clear()
+        self.node_produced_total.clear()
+        self.overflow_total.clear()
+        self.root_events_total = 0
+        self.cascade_buckets[:] = [0] * len(self.cascade_buckets)
+        self.cascade_sum = 0
+        self.cascade_max = 0
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        self.cascade_depth_max = 0
+
+    def to_prometheus(self) -> str:
+        """按 Prometheus 文本格式（0.0.4）输出全部指标。"""
+        ns = self.namespace
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+            return f"{ns}_{name}"
+
+        metric = header("events_total", "counter", "Events processed, by event type.")
+        for event_type, count in sorted(dict(self.events_total).items()):
+            lines.append(f'{metric}{{event_type="{_escape(event_type)}"}} {count}')
+
+        metric = header(
+            "node_produced_total", "counter", "Events produced by each tree node."
+        )
+        for node_id, count in sorted(dict(self.node_produced_total).items()):
+            lines.append(f'{metric}{{node="{_escape(node_id)}"}} {count}')
+
+        metric = header(
+            "overflow_total", "counter", "Events that hit a dispatch limit, by limit."
+        )
+        for limit, count in sorted(dict(self.overflow_total).items()):
+            lines.append(f'{metric}{{limit="{_escape(limit)}"}} {count}')
+
+        metric = header(
+            "cascade_length",
+            "histogram",
+            "Events processed per root event, including the root.",
+        )
+        cumulative = 0
+        for bound, hits in zip(CASCADE_BUCKETS, list(self.cascade_buckets)):
+            cumulative += hits
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {self.root_events_total}')
+        lines.append(f"{metric}_sum {self.cascade_sum}")
+        lines.append(f"{metric}_count {self.root_events_total}")
+
+        for name, help_text, value in (
+            ("cascade_length_max", "Longest cascade observed.", self.cascade_max),
+            (
+                "cascade_depth_max",
+                "Deepest parent-to-child chain observed (root = 0).",
+                self.cascade_depth_max,
+            ),
+            ("queue_depth", "Current work queue depth.", self.queue_depth),
+            (
+                "queue_depth_max",
+                "Peak work queue depth observed.",
+                self.queue_depth_max,
+            ),
+        ):
+            lines.append(f"{header(name, 'gauge', help_text)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | os.PathLike[str]) -> None:
+        """原子地写入文件，供 node_exporter 的 textfile collector 采集。"""
+        directory = os.path.dirname(os.fspath(path)) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".prom.tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def serve_prometheus(
+        self, port: int = 9464, host: str = "127.0.0.1"
+    ) -> ThreadingHTTPServer:
+        """在后台线程启动 HTTP 端点（任意路径均返回指标），调用方负责 ``shutdown()``。"""
+        server = ThreadingHTTPServer((host, port), _handler_for(self.to_prometheus))
+        threading.Thread(
+            target=server.serve_forever, name="event-metrics-http", daemon=True
+        ).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _handler_for(render: Callable[[], str]) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            # 不把每次抓取写到 stderr
+            pass
+
+    return MetricsHandler
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, TypeVar
+
+from src.events.base import BaseEventMessage, EventABC, EventContext
+
+from .dispatcher import EventDispatcher
+
+T = TypeVar("T", bound=BaseEventMessage)
+
+KeyExtractor = Callable[[EventABC[BaseEventMessage]], Hashable]
+DispatcherFactory = Callable[[], EventDispatcher]
+
+# 每个分区的工作进程持有的调度器，由 _init_process_worker 创建
+_process_dispatcher: EventDispatcher | None = None
+
+
+def entity_key(event: EventABC[BaseEventMessage]) -> Hashable:
+    """默认分区键：优先使用 ``player_id``，其次 ``target_id``。"""
+    message = event.event_message
+    return getattr(message, "player_id", None) or getattr(message, "target_id", None)
+
+
+def partition_of(key: Hashable, workers: int) -> int:
+    """把分区键映射到 ``[0, workers)``，跨进程与重启保持稳定。
+
+    内置 ``hash`` 对字符串按进程随机化（``PYTHONHASHSEED``），因此改用
+    ``zlib.crc32``：``str``/``bytes`` 直接取其字节，其余键取 ``repr``，
+    自定义键类型需要提供稳定的 ``repr``。
+    """
+    if isinstance(key, bytes):
+        data = key
+    elif isinstance(key, str):
+        data = key.encode()
+    else:
+        data = repr(key).encode()
+    return zlib.crc32(data) % workers
+
+
+def _init_process_worker(factory: DispatcherFactory) -> None:
+    global _process_dispatcher
+    _process_dispatcher = factory()
+
+
+def _run_process_partition(
+    events: list[EventABC[BaseEventMessage]],
+    context: EventContext | None,
+    roots_only: bool,
+) -> list[list[EventABC[BaseEventMessage]]] | list[bool]:
+    assert _process_dispatcher is not None, "工作进程未初始化"
+    return _run_partition(_process_dispatcher, events, context, roots_only)
+
+
+def _run_partition(
+    dispatcher: EventDispatcher,
+    events: list[EventABC[BaseEventMessage]],
+    context: EventContext | None,
+    roots_only: bool,
+) -> list[list[EventABC[BaseEventMessage]]] | list[bool]:
+    results = dispatcher.emit_many(events, context)
+    if roots_only:
+        # 只回传根事件是否被处理，避免序列化整个级联
+        return [bool(processed) for processed in results]
+    return results
+
+
+class PartitionedDispatcher:
+    """按键分区、在工作池中并行处理根事件的调度器。
+
+    每个根事件通过 ``key`` 哈希（见 ``partition_of``）到固定分区，同一分区内的
+    事件按输入顺序交给同一个 ``EventDispatcher.emit_many`` 处理，因此同键事件
+    的处理顺序与串行调用一致；不同键之间不保证顺序。
+
+    每个分区固定对应一个调度器实例，并独占一个单工作者的执行器，因此同一
+    分区的批次总是串行处理，并发的 ``emit_many`` 调用也不会同时进入同一个
+    调度器。线程模式下调度器在当前进程中创建；进程模式下 ``factory`` 在分区
+    的工作进程中调用一次，同一个键总是到达同一个调度器（及其树与处理器
+    状态）。进程模式下 ``factory`` 必须是可 pickle 的模块级函数。
+
+    进程模式的 ``emit_many`` 默认把每个根事件的完整级联 pickle 传回，代价
+    与级联长度成正比；只关心副作用时传入 ``roots_only=True``，工作进程只回传
+    每个根事件是否被处理。
+    """
+
+    def __init__(
+        self,
+        factory: DispatcherFactory,
+        workers: int,
+        *,
+        key: KeyExtractor = entity_key,
+        use_processes: bool = False,
+    ):
+        if workers < 1:
+            raise ValueError("workers 必须大于 0")
+        self._workers = workers
+        self._key = key
+        self._use_processes = use_processes
+        self._executors: list[Executor]
+        if use_processes:
+            self._dispatchers: list[EventDispatcher] = []
+            # 每个分区一个单进程执行器，分区与进程一一绑定
+            self._executors = [
+                ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_process_worker,
+                    initargs=(factory,),
+                )
+                for _ in range(workers)
+            ]
+        else:
+            self._dispatchers = [factory() for _ in range(workers)]
+            # 与进程模式相同，每个分区一个单线程执行器
+            self._executors = [
+                ThreadPoolExecutor(max_workers=1) for _ in range(workers)
+            ]
+
+    def emit_many(
+        self,
+        events: Iterable[EventABC[T]],
+        context: EventContext | None = None,
+        *,
+        roots_only: bool = False,
+    ) -> list[list[EventABC[BaseEventMessage]]]:
+        """并行处理一批根事件，按输入顺序返回每个根事件的结果。
+
+        ``roots_only=True`` 时每个结果列表只包含传入的根事件本身（根事件被
+        限额拒绝时为空列表），不传回派生事件。
+        """
+        partitions: list[list[EventABC[BaseEventMessage]]] = [
+            [] for _ in range(self._workers)
+        ]
+        # 记录每个根事件落在哪个分区的第几个位置，用于合并结果
+        placement: list[tuple[int, int]] = []
+        for event in events:
+            partition = partition_of(self._key(event), self._workers)
+            placement.append((partition, len(partitions[partition])))
+            partitions[partition].append(event)
+
+        futures = {
+            index: (
+                self._executors[index].submit(
+                    _run_process_partition, batch, context, roots_only
+                )
+                if self._use_processes
+                else self._executors[index].submit(
+                    _run_partition, self._dispatchers[index], batch, context, roots_only
+                )
+            )
+            for index, batch in enumerate(partitions)
+            if batch
+        }
+        partition_results = {
+            index: future.result() for index, future in futures.items()
+        }
+
+        if roots_only:
+            return [
+                [partitions[partition][position]]
+                if partition_results[partition][position]
+                else []
+                for partition, position in placement
+            ]
+        return [
+            partition_results[partition][position]  # type: ignore[misc]
+            for partition, position in placement
+        ]
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown()
+
+    def __enter__(self) -> "PartitionedDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
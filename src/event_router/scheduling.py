@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from enum import Enum
+from itertools import count
+from typing import Any, Iterator, Mapping, Protocol
+
+from src.event_types import EventType
+
+
+class SchedulingMode(str, Enum):
+    """``EventDispatcher`` 工作队列的出队顺序。
+
+    - ``BFS``：先进先出。同一次调用中深度为 d 的事件全部处理完才会处理深度
+      d+1 的事件；同一父事件的子事件按产出顺序处理。峰值队列长度约为最宽
+      一层的事件数。
+    - ``DFS``：先序深度优先。一个事件的整棵派生子树处理完后才处理它之后的
+      兄弟事件；兄弟之间、根事件之间仍按产出（输入）顺序。峰值队列长度约为
+      深度 × 扇出。
+    - ``PRIORITY``：按事件类型的优先级（数值大者先）出队，相同优先级先进
+      先出。只保证父事件先于子事件，不保证层级顺序。
+    """
+
+    BFS = "bfs"
+    DFS = "dfs"
+    PRIORITY = "priority"
+
+
+class WorkQueue(Protocol):
+    """分派器使用的工作队列接口。"""
+
+    def append(self, entry: Any) -> None: ...
+
+    def take(self) -> Any:
+        """取出下一个要处理的项。"""
+        ...
+
+    def peek(self) -> Any:
+        """查看下一个要处理的项，不取出。"""
+        ...
+
+    def evict(self) -> Any:
+        """队列已满时为新项腾出空间，取出最该被丢弃的项。"""
+        ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class FifoQueue(deque[Any]):
+    """广度优先：``take`` 与 ``evict`` 都取队首（最旧）的项。"""
+
+    take = deque.popleft
+    evict = deque.popleft
+
+    def peek(self) -> Any:
+        return self[0]
+
+
+class DepthFirstQueue:
+    """先序深度优先的工作队列。
+
+    每次 ``take`` 之后追加的项视为刚取出项的子项，归入一个新帧；帧按栈组织，
+    帧内先进先出，因此兄弟之间保持产出顺序。``evict`` 丢弃栈底最旧的项；
+    栈为空时丢弃正在产出的帧中最旧的项。``evict`` 不会关闭正在产出的帧，
+    之后追加的兄弟仍与之前的兄弟同属一帧。
+    """
+
+    __slots__ = ("_frames", "_open", "_size")
+
+    def __init__(self) -> None:
+        # 栈底在左；每帧是一个父项的（剩余）子项
+        self._frames: deque[deque[Any]] = deque()
+        self._open: deque[Any] = deque()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for frame in reversed(self._frames):
+            yield from frame
+
+    def append(self, entry: Any) -> None:
+        self._open.append(entry)
+        self._size += 1
+
+    def _push_open(self) -> None:
+        if self._open:
+            self._frames.append(self._open)
+            self._open = deque()
+
+    def take(self) -> Any:
+        self._push_open()
+        frame = self._frames[-1]
+        entry = frame.popleft()
+        if not frame:
+            self._frames.pop()
+        self._size -= 1
+        return entry
+
+    def peek(self) -> Any:
+        if self._open:
+            return self._open[0]
+        return self._frames[-1][0]
+
+    def evict(self) -> Any:
+        if self._frames:
+            frame = self._frames[0]
+            entry = frame.popleft()
+            if not frame:
+                self._frames.popleft()
+        else:
+            entry = self._open.popleft()
+        self._size -= 1
+        return entry
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self._open = deque()
+        self._size = 0
+
+
+class PriorityQueue:
+    """按事件类型优先级出队（数值大者先），同优先级先进先出。
+
+    ``evict`` 丢弃最后才会被处理的项（优先级最低、最新的项），代价为 O(n)。
+    """
+
+    __slots__ = ("_heap", "_priorities", "_sequence")
+
+    def __init__(self, priorities: Mapping[EventType, int]):
+        self._heap: list[tuple[int, int, Any]] = []
+        self._priorities = priorities
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def append(self, entry: Any) -> None:
+        # 队列项的第一个元素是事件或批次
+        priority = self._priorities.get(entry[0].event_type, 0)
+        heapq.heappush(self._heap, (-priority, next(self._sequence), entry))
+
+    def take(self) -> Any:
+        return heapq.heappop(self._heap)[2]
+
+    def peek(self) -> Any:
+        return self._heap[0][2]
+
+    def evict(self) -> Any:
+        heap = self._heap
+        last = max(range(len(heap)), key=lambda position: heap[position][:2])
+        entry = heap[last][2]
+        heap[last] = heap[-1]
+        heap.pop()
+        heapq.heapify(heap)
+        return entry
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+
+def make_work_queue(
+    mode: SchedulingMode, priorities: Mapping[EventType, int] | None = None
+) -> WorkQueue:
+    if mode is SchedulingMode.BFS:
+        return FifoQueue()
+    if mode is SchedulingMode.DFS:
+        return DepthFirstQueue()
+    if mode is SchedulingMode.PRIORITY:
+        return PriorityQueue(priorities or {})
+    raise ValueError(f"未知的调度模式: {mode!r}")
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Mapping, Sequence, Union
+
+from src.event_types import EventTypes
+from src.events.base import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventContext,
+    SystemTickMessage,
+)
+from src.events.ids import next_event_id
+
+from .dispatcher import EventDispatcher
+
+# 定时器的事件来源：固定事件，或按触发时的 tick 构造事件的函数
+EventSource = Union[
+    EventABC[BaseEventMessage], Callable[[int], EventABC[BaseEventMessage]]
+]
+
+
+class TimerFactoryError(ExceptionGroup):
+    """``tick()`` 中事件工厂抛出的异常。
+
+    其余到期事件仍已分派，``results`` 是这次 ``emit_many`` 的结果。
+    """
+
+    def __new__(
+        cls,
+        message: str,
+        errors: Sequence[Exception],
+        results: list[list[EventABC[BaseEventMessage]]],
+    ) -> TimerFactoryError:
+        self = super().__new__(cls, message, errors)
+        self.results = results
+        return self
+
+    def __init__(
+        self,
+        message: str,
+        errors: Sequence[Exception],
+        results: list[list[EventABC[BaseEventMessage]]],
+    ):
+        super().__init__(message, errors)
+
+    def derive(self, excs: Sequence[Exception]) -> TimerFactoryError:
+        return TimerFactoryError(self.message, excs, self.results)
+
+
+class TimerHandle:
+    """``TickScheduler.schedule*`` 返回的定时器，可用于取消。"""
+
+    __slots__ = ("source", "due", "interval", "remaining", "cancelled", "_scheduler")
+
+    def __init__(
+        self,
+        scheduler: TickScheduler,
+        source: EventSource,
+        due: int,
+        interval: int,
+        remaining: int | None,
+    ):
+        self._scheduler = scheduler
+        self.source = source
+        self.due = due
+        # 0 表示一次性定时器
+        self.interval = interval
+        # 周期定时器剩余的触发次数，None 表示不限
+        self.remaining = remaining
+        self.cancelled = False
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled and self.remaining != 0
+
+    def cancel(self) -> bool:
+        """取消定时器，返回是否由本次调用取消。"""
+        return self._scheduler.cancel(self)
+
+
+class TickScheduler:
+    """由 tick 驱动的延迟与周期事件调度器。
+
+    定时器按到期 tick 放入桶中（相当于槽数不受限的时间轮），登记与取消都是
+    O(1)，每个 tick 只取出当期的桶，代价与到期的定时器数成正比，与挂起的
+    定时器总数无关。取消采用惰性删除，到期时跳过。
+
+    ``tick()`` 把当期到期的事件（以及可选的 ``system.tick`` 事件）通过一次
+    ``EventDispatcher.emit_many`` 批量分派，上下文属性中带有 ``tick_count``。
+    """
+
+    def __init__(
+        self,
+        dispatcher: EventDispatcher,
+        *,
+        start_tick: int = 0,
+        emit_tick_events: bool = True,
+        attributes: Mapping[str, object] | None = None,
+    ):
+        self._dispatcher = dispatcher
+        self._tick = start_tick
+        self._emit_tick_events = emit_tick_events
+        self._attributes = dict(attributes or {})
+        self._buckets: dict[int, list[TimerHandle]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current_tick(self) -> int:
+        return self._tick
+
+    def __len__(self) -> int:
+        """挂起（未取消、未结束）的定时器数量。"""
+        return self._pending
+
+    def schedule(self, event: EventSource, *, delay: int = 1) -> TimerHandle:
+        """在 ``delay`` 个 tick 之后发送一次事件（至少为 1，即下一个 tick）。"""
+        if delay < 1:
+            raise ValueError("delay 必须至少为 1")
+        return self._add(event, delay, 0, 1)
+
+    def schedule_periodic(
+        self,
+        event: EventSource,
+        *,
+        every: int,
+        times: int | None = None,
+        delay: int | None = None,
+    ) -> TimerHandle:
+        """每 ``every`` 个 tick 发送一次事件，共 ``times`` 次（``None`` 为不限）。
+
+        首次触发在 ``delay``（默认等于 ``every``）个 tick 之后。固定事件在每次
+        触发时复制为带新事件 ID 的副本，消息其余字段共享。
+        """
+        if every < 1:
+            raise ValueError("every 必须至少为 1")
+        if times is not None and times < 1:
+            raise ValueError("times 必须至少为 1")
+        first = every if delay is None else delay
+        if first < 1:
+            raise ValueError("delay 必须至少为 1")
+        return self._add(event, first, every, times)
+
+    def cancel(self, timer: TimerHandle) -> bool:
+        with self._lock:
+            if not timer.active:
+                return False
+            timer.cancelled = True
+            self._pending -= 1
+            return True
+
+    def _add(
+        self, source: EventSource, delay: int, interval: int, remaining: int | None
+    ) -> TimerHandle:
+        # 到期 tick 必须在锁内按当前 tick 计算，否则并发的 tick() 可能先取走
+        # 该桶，定时器将永远不会触发
+        with self._lock:
+            timer = TimerHandle(self, source, self._tick + delay, interval, remaining)
+            self._buckets.setdefault(timer.due, []).append(timer)
+            self._pending += 1
+        return timer
+
+    def tick(self) -> list[list[EventABC[BaseEventMessage]]]:
+        """推进一个 tick，分派所有到期事件，返回 ``emit_many`` 的结果。
+
+        到期定时器在锁内取出并完成重新登记，事件工厂在锁外调用，因此工厂可以
+        再次调用调度器。某个工厂抛出异常时，其余到期事件照常分派，随后抛出
+        ``TimerFactoryError``，其 ``results`` 为分派结果。
+        """
+        with self._lock:
+            self._tick += 1
+            now = self._tick
+            firing: list[TimerHandle] = []
+            for timer in self._buckets.pop(now, ()):
+                if timer.cancelled:
+                    continue
+                firing.append(timer)
+                if timer.remaining is not None:
+                    timer.remaining -= 1
+                if timer.interval and timer.remaining != 0:
+                    timer.due = now + timer.interval
+                    self._buckets.setdefault(timer.due, []).append(timer)
+                else:
+                    self._pending -= 1
+
+        events: list[EventABC[BaseEventMessage]] = []
+        if self._emit_tick_events:
+            events.append(
+                Event(EventTypes.SYSTEM_TICK, SystemTickMessage.compact(tick_count=now))
+            )
+        errors: list[Exception] = []
+        for timer in firing:
+            try:
+                events.append(self._materialize(timer, now))
+            except Exception as error:  # noqa: BLE001 - 收集后在 TimerFactoryError 中抛出
+                errors.append(error)
+
+        results: list[list[EventABC[BaseEventMessage]]] = []
+        if events:
+            context = EventContext(attributes={**self._attributes, "tick_count": now})
+            results = self._dispatcher.emit_many(events, context)
+        if errors:
+            raise TimerFactoryError(
+                f"tick {now} 的定时器事件工厂抛出异常", errors, results
+            )
+        return results
+
+    def advance(self, ticks: int) -> list[list[EventABC[BaseEventMessage]]]:
+        """连续推进多个 tick，按顺序拼接各 tick 的结果。"""
+        results: list[list[EventABC[BaseEventMessage]]] = []
+        for _ in range(ticks):
+            results.extend(self.tick())
+        return results
+
+    @staticmethod
+    def _materialize(timer: TimerHandle, now: int) -> EventABC[BaseEventMessage]:
+        source = timer.source
+        if not isinstance(source, EventABC):
+            return source(now)
+        if not timer.interval:
+            return source
+        # 周期事件每次触发都需要新的事件 ID
+        return Event(
+            source.event_type,
+            source.event_message.model_copy(update={"event_id": next_event_id()}),
+        )
@@ -21,3 +21,23 @@ class SkillEventTypes(str, Enum):
 EventType = Union[EventTypes, SkillEventTypes]
 
 SKILL_ON_HIT = SkillEventTypes.ON_HIT
+
+
+_EVENT_TYPES_BY_VALUE: dict[str, EventType] = {
+    member.value: member
+    for enum_type in (EventTypes, SkillEventTypes)
+    for member in enum_type
+}
+
+
+def all_event_types() -> tuple[EventType, ...]:
+    """返回全部已定义的事件类型枚举。"""
+    return tuple(_EVENT_TYPES_BY_VALUE.values())
+
+
+def event_type_from_value(value: str) -> EventType:
+    """根据字符串值查找事件类型枚举。"""
+    try:
+        return _EVENT_TYPES_BY_VALUE[value]
+    except KeyError:
+        raise ValueError(f"未知的事件类型: {value}") from None
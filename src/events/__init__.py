@@ -2,7 +2,10 @@ from .base import (
     Event,
     EventABC,
     BaseEventMessage,
+    CompactMessage,
     EventContext,
+    message_model,
+    all_message_types,
     # Player Event Messages
     PlayerCreatedMessage,
     PlayerHealthChangedMessage,
@@ -13,10 +16,60 @@ from .base import (
     # System Event Messages
     SystemTickMessage,
 )
+from .batch import EventBatch
+from .codec import BinaryEventCodec, CodecError
+from .conditions import (
+    AllOf,
+    Always,
+    AnyOf,
+    Comparison,
+    Const,
+    ContextAttribute,
+    DeclarativeCondition,
+    IsInstance,
+    MessageField,
+    Not,
+)
+from .ids import (
+    CounterIdGenerator,
+    EventId,
+    EventIdGenerator,
+    SnowflakeIdGenerator,
+    UuidIdGenerator,
+    get_event_id_generator,
+    next_event_id,
+    set_event_id_generator,
+)
+from .instrumentation import (
+    HotSpot,
+    Instrumentation,
+    LatencyHistogram,
+    disable_instrumentation,
+    enable_instrumentation,
+    get_instrumentation,
+)
 from .repository import InMemoryEventConfigRepository
+from .serialization import (
+    BuilderRegistry,
+    ConfigFormatError,
+    JsonRowCodec,
+    LeafConfigLoader,
+    action_builder,
+    condition_builder,
+    get_global_builders,
+)
+from .sqlite_repository import (
+    LeafRowCodec,
+    PickleRowCodec,
+    SQLiteEventConfigRepository,
+)
 from .tree import (
+    AsyncCallableAction,
+    BulkEventConfigRepository,
+    AsyncEventAction,
     CallableAction,
     CallableCondition,
+    ConfigurationIndex,
     DynamicLeafNode,
     EventAction,
     EventBranchNode,
@@ -24,10 +77,15 @@ from .tree import (
     EventStateTree,
     EventTransition,
     LeafConfiguration,
+    LeafSnapshot,
+    VersionedEventConfigRepository,
 )
 
 __all__ = [
     "BaseEventMessage",
+    "CompactMessage",
+    "message_model",
+    "all_message_types",
     "Event",
     "EventABC",
     "EventContext",
@@ -40,14 +98,62 @@ __all__ = [
     "SkillEndMessage",
     # System Event Messages
     "SystemTickMessage",
+    "EventBatch",
+    # Event IDs
+    "EventId",
+    "EventIdGenerator",
+    "CounterIdGenerator",
+    "SnowflakeIdGenerator",
+    "UuidIdGenerator",
+    "get_event_id_generator",
+    "set_event_id_generator",
+    "next_event_id",
+    # Binary Codec
+    "BinaryEventCodec",
+    "CodecError",
+    # Instrumentation
+    "Instrumentation",
+    "LatencyHistogram",
+    "HotSpot",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "get_instrumentation",
     "EventStateTree",
     "EventBranchNode",
     "DynamicLeafNode",
     "EventTransition",
     "EventCondition",
     "CallableCondition",
+    "ConfigurationIndex",
+    # Declarative Conditions
+    "DeclarativeCondition",
+    "MessageField",
+    "ContextAttribute",
+    "Const",
+    "Comparison",
+    "IsInstance",
+    "AllOf",
+    "AnyOf",
+    "Not",
+    "Always",
     "EventAction",
     "CallableAction",
+    "AsyncEventAction",
+    "AsyncCallableAction",
     "LeafConfiguration",
+    "LeafSnapshot",
+    "VersionedEventConfigRepository",
     "InMemoryEventConfigRepository",
+    "BulkEventConfigRepository",
+    "SQLiteEventConfigRepository",
+    "LeafRowCodec",
+    "PickleRowCodec",
+    # Serialization
+    "BuilderRegistry",
+    "ConfigFormatError",
+    "JsonRowCodec",
+    "LeafConfigLoader",
+    "action_builder",
+    "condition_builder",
+    "get_global_builders",
 ]
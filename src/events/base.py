@@ -1,19 +1,132 @@
 from __future__ import annotations
 
+import dataclasses
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from typing import Any, Dict
-from uuid import uuid4
+from copy import copy, deepcopy
+from typing import Any, ClassVar, Dict, Self
 
 from pydantic import BaseModel, Field
 
 from src.event_types import EventType
 
+from .ids import EventId, next_event_id
+
 
 class BaseEventMessage(BaseModel):
     """Standard payload container for all events."""
 
-    event_id: str = Field(default_factory=lambda: str(uuid4()))
+    event_id: EventId = Field(default_factory=next_event_id)
+
+    @classmethod
+    def compact(cls, **fields: Any) -> CompactMessage:
+        """构造跳过校验的轻量消息，供系统内部产生的派生事件使用。
+
+        返回的是 ``CompactMessage``（基于 ``__slots__`` 的 dataclass），不是
+        ``cls`` 的实例，见 ``CompactMessage`` 的说明。
+        """
+        compact_type = _COMPACT_TYPES.get(cls) or _build_compact_type(cls)
+        return compact_type(**fields)
+
+
+class CompactMessage:
+    """``BaseEventMessage.compact`` 构造的轻量消息的基类。
+
+    每个消息模型对应一个基于 ``__slots__`` 的 dataclass 子类，字段与模型相同、
+    不做校验。它不是 pydantic 模型：``isinstance(message, 模型类)`` 不成立，
+    只提供 ``model_dump``、``model_copy`` 与 ``to_model``。按模型类判断消息
+    类型时使用 ``message_model(message)``，需要 pydantic 的其他能力（例如
+    ``model_dump_json``）或完整校验时先调用 ``to_model()``。
+    """
+
+    __slots__ = ()
+
+    # 对应的消息模型类
+    model_type: ClassVar[type[BaseEventMessage]]
+
+    def __str__(self) -> str:
+        # 与 pydantic 模型的 str() 输出保持一致
+        return " ".join(
+            f"{field.name}={getattr(self, field.name)!r}"
+            for field in dataclasses.fields(self)  # type: ignore[arg-type]
+        )
+
+    def model_dump(self) -> dict[str, Any]:
+        return {
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)  # type: ignore[arg-type]
+        }
+
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        data = self.model_dump()
+        if update:
+            data.update(update)
+        if deep:
+            data = deepcopy(data)
+        return type(self)(**data)
+
+    def to_model(self) -> BaseEventMessage:
+        """按模型完整校验，返回对应的 pydantic 模型实例。"""
+        return self.model_type.model_validate(self.model_dump())
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # 动态生成的类无法按名字导入，pickle/copy 通过模型类重建
+        return _rebuild_compact, (self.model_type, self.model_dump())
+
+
+def message_model(message: BaseEventMessage | CompactMessage) -> type[BaseEventMessage]:
+    """返回消息对应的模型类；轻量消息返回其 ``model_type``。"""
+    if isinstance(message, CompactMessage):
+        return message.model_type
+    return type(message)
+
+
+def all_message_types(
+    base: type[BaseEventMessage] = BaseEventMessage,
+) -> list[type[BaseEventMessage]]:
+    """返回 ``base`` 当前已定义的全部子类（递归，不含 ``base`` 本身）。"""
+    found: list[type[BaseEventMessage]] = []
+    for subclass in base.__subclasses__():
+        found.append(subclass)
+        found.extend(all_message_types(subclass))
+    return found
+
+
+# 模型类 -> 对应的轻量消息类
+_COMPACT_TYPES: dict[type[BaseEventMessage], type[CompactMessage]] = {}
+
+
+def _rebuild_compact(
+    model: type[BaseEventMessage], fields: dict[str, Any]
+) -> CompactMessage:
+    return model.compact(**fields)
+
+
+def _build_compact_type(model: type[BaseEventMessage]) -> type[CompactMessage]:
+    specs: list[tuple[str, Any, Any]] = []
+    for name, info in model.model_fields.items():
+        if info.default_factory is not None:
+            spec = dataclasses.field(default_factory=info.default_factory)  # type: ignore[arg-type]
+        elif info.is_required():
+            spec = dataclasses.field()
+        elif isinstance(info.default, (list, dict, set)):
+            spec = dataclasses.field(default_factory=lambda d=info.default: copy(d))
+        else:
+            spec = dataclasses.field(default=info.default)
+        specs.append((name, info.annotation, spec))
+
+    compact_type = dataclasses.make_dataclass(
+        f"Compact{model.__name__}",
+        specs,
+        bases=(CompactMessage,),
+        namespace={"model_type": model},
+        kw_only=True,
+        slots=True,
+        module=model.__module__,
+    )
+    _COMPACT_TYPES[model] = compact_type
+    return compact_type
 
 
 # Player Event Messages
@@ -111,11 +224,22 @@ class Event[T: BaseEventMessage](EventABC[T]):
         self,
         *,
         event_type: EventType | None = None,
+        copy_on_write: bool = False,
         **updates: Any,
     ) -> "Event[T]":
-        """创建事件副本，可选择更新事件类型和消息字段。"""
+        """创建事件副本，可选择更新事件类型和消息字段。
+
+        ``copy_on_write=True`` 时副本与原事件共享消息对象（消息应视为不可变），
+        直到有字段更新；更新通过 ``model_copy`` 浅拷贝完成，不再重新校验。
+        """
         new_event_type = event_type or self._event_type
 
+        if copy_on_write:
+            current_message = self._event_message
+            if updates:
+                current_message = current_message.model_copy(update=updates)
+            return Event(new_event_type, current_message)
+
         # 如果有更新，创建新的消息实例
         if updates:
             # 根据当前消息类型创建新实例
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from array import array
+from copy import copy
+from itertools import compress
+from typing import Any, Iterator, Mapping, Sequence
+
+from pydantic_core import PydanticUndefined
+
+from src.event_types import EventType
+
+from .base import BaseEventMessage, Event, EventABC, message_model
+
+# 数值字段使用 array 存储，其余字段使用 list
+_ARRAY_TYPECODES: dict[Any, str] = {int: "q", float: "d"}
+
+
+def _make_column(annotation: Any, values: Sequence[Any]) -> Sequence[Any]:
+    if isinstance(values, array):
+        return values
+    typecode = _ARRAY_TYPECODES.get(annotation)
+    if typecode is not None:
+        try:
+            return array(typecode, values)
+        except (OverflowError, TypeError):
+            # 超出 64 位或混入其他类型时退回 list
+            pass
+    return values if isinstance(values, list) else list(values)
+
+
+class EventBatch:
+    """同一事件类型、同一消息类型的一组事件，按字段列存储。
+
+    整数与浮点字段存放在 ``array`` 中，其余字段存放在 ``list`` 中。条件可以
+    按列一次求出布尔掩码（见 ``EventCondition.evaluate_batch``），``select``
+    按掩码筛选出子批次；只有需要逐个处理时才通过 ``iter_events`` 物化为
+    轻量消息。
+    """
+
+    __slots__ = ("event_type", "message_type", "_columns", "_length")
+
+    def __init__(
+        self,
+        event_type: EventType,
+        message_type: type[BaseEventMessage],
+        columns: Mapping[str, Sequence[Any]],
+    ):
+        fields = message_type.model_fields
+        unknown = set(columns) - set(fields)
+        if unknown:
+            raise ValueError(
+                f"{message_type.__name__} 没有字段: {', '.join(sorted(unknown))}"
+            )
+        missing = [
+            name
+            for name, info in fields.items()
+            if info.is_required() and name not in columns
+        ]
+        if missing:
+            raise ValueError(f"缺少必填字段的列: {', '.join(missing)}")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("各列长度不一致")
+
+        self.event_type = event_type
+        self.message_type = message_type
+        self._columns: dict[str, Sequence[Any]] = {
+            name: _make_column(fields[name].annotation, values)
+            for name, values in columns.items()
+        }
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_columns(
+        cls,
+        event_type: EventType,
+        message_type: type[BaseEventMessage],
+        **columns: Sequence[Any],
+    ) -> "EventBatch":
+        return cls(event_type, message_type, columns)
+
+    @classmethod
+    def from_events(cls, events: Sequence[EventABC[BaseEventMessage]]) -> "EventBatch":
+        """把同类型事件转为列存储，事件类型或消息类型不一致时报错。"""
+        if not events:
+            raise ValueError("无法从空序列推断批次类型")
+        event_type = events[0].event_type
+        message_type = message_model(events[0].event_message)
+        messages = []
+        for event in events:
+            message = event.event_message
+            if event.event_type is not event_type:
+                raise ValueError("批次内的事件类型必须一致")
+            if message_model(message) is not message_type:
+                raise ValueError("批次内的消息类型必须一致")
+            messages.append(message)
+        columns = {
+            name: [getattr(message, name) for message in messages]
+            for name in message_type.model_fields
+        }
+        return cls(event_type, message_type, columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return (
+            f"EventBatch({self.event_type.value!r}, "
+            f"{self.message_type.__name__}, size={self._length})"
+        )
+
+    @property
+    def columns(self) -> Mapping[str, Sequence[Any]]:
+        return self._columns
+
+    def column(self, name: str) -> Sequence[Any]:
+        """返回字段列；未提供的可选字段按默认值补齐并缓存。"""
+        values = self._columns.get(name)
+        if values is not None:
+            return values
+        info = self.message_type.model_fields.get(name)
+        if info is None:
+            raise KeyError(name)
+        if info.default_factory is not None:
+            factory = info.default_factory
+            values = [factory() for _ in range(self._length)]  # type: ignore[call-arg]
+        elif isinstance(info.default, (list, dict, set)):
+            values = [copy(info.default) for _ in range(self._length)]
+        elif info.default is not PydanticUndefined:
+            values = [info.default] * self._length
+        else:
+            raise KeyError(name)
+        values = self._columns[name] = _make_column(info.annotation, values)
+        return values
+
+    def select(self, mask: Sequence[bool]) -> "EventBatch":
+        """按布尔掩码筛选行，全部命中时直接返回自身。"""
+        if len(mask) != self._length:
+            raise ValueError("掩码长度与批次大小不一致")
+        if all(mask):
+            return self
+        columns: dict[str, Sequence[Any]] = {}
+        for name, values in self._columns.items():
+            if isinstance(values, array):
+                columns[name] = array(values.typecode, compress(values, mask))
+            else:
+                columns[name] = list(compress(values, mask))
+        selected = EventBatch.__new__(EventBatch)
+        selected.event_type = self.event_type
+        selected.message_type = self.message_type
+        selected._columns = columns
+        selected._length = sum(mask)
+        return selected
+
+    def iter_events(self) -> Iterator[Event[Any]]:
+        """逐行物化为使用轻量消息的 ``Event``。"""
+        # 先补齐带默认工厂的列（如 event_id），保证多次物化得到相同的 ID
+        for name, info in self.message_type.model_fields.items():
+            if info.default_factory is not None and name not in self._columns:
+                self.column(name)
+        names = tuple(self._columns)
+        compact = self.message_type.compact
+        event_type = self.event_type
+        for row in zip(*self._columns.values()):
+            yield Event(event_type, compact(**dict(zip(names, row))))
+
+    def to_events(self) -> list[Event[Any]]:
+        return list(self.iter_events())
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, get_args, get_origin
+
+from src.event_types import EventType, all_event_types
+
+from .base import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    all_message_types,
+    message_model,
+)
+from .ids import EventId
+
+# 帧头：schema ID、事件类型 ID
+_HEADER = struct.Struct("<HH")
+# 批量格式：魔数 + 事件数量
+_BATCH_MAGIC = b"EVB1"
+_BATCH_HEADER = struct.Struct("<4sI")
+_U32 = struct.Struct("<I")
+_NONE_LENGTH = 0xFFFFFFFF
+
+# 字段类型 -> 帧结构中的 struct 格式
+_FIXED_FORMATS: dict[Any, str] = {int: "q", bool: "?", float: "d"}
+# 字段编码方式（同时决定字段在帧内的排列顺序）
+_FIXED, _OPTIONAL_FIXED, _STR, _OPTIONAL_STR, _STR_LIST, _EVENT_ID = range(6)
+_KIND_FORMATS = {_STR: "I", _OPTIONAL_STR: "I", _STR_LIST: "I", _EVENT_ID: "BqI"}
+# event_id 的类型标记
+_ID_STR, _ID_INT, _ID_COUNTER = range(3)
+
+
+class CodecError(ValueError):
+    """事件无法编码（字段值超出范围等），或二进制数据无法解码（未知 schema、
+    数据截断等）。"""
+
+
+@dataclass(frozen=True, slots=True)
+class _Schema:
+    schema_id: int
+    model: type[BaseEventMessage]
+    # 每个字段：(字段名, 编码方式, 在 frame 解包结果中的起始下标)，按编码方式
+    # 分组排列；字符串区的顺序与之一致
+    fields: tuple[tuple[str, int, int], ...]
+    # 定长区：标量值以及所有变长字段的长度/数量
+    frame: struct.Struct
+    # 按编码方式索引的 (字段名, 下标) 分组，供解码使用
+    groups: tuple[tuple[tuple[str, int], ...], ...]
+
+
+def _stable_id(text: str) -> int:
+    return zlib.crc32(text.encode()) & 0xFFFF
+
+
+def _classify(annotation: Any) -> tuple[int, str]:
+    """返回字段的 (编码方式, 定长区格式)。"""
+    if annotation is EventId:
+        return _EVENT_ID, _KIND_FORMATS[_EVENT_ID]
+    if annotation is str:
+        return _STR, _KIND_FORMATS[_STR]
+    if annotation in _FIXED_FORMATS:
+        return _FIXED, _FIXED_FORMATS[annotation]
+    args = get_args(annotation)
+    if get_origin(annotation) is list and args == (str,):
+        return _STR_LIST, _KIND_FORMATS[_STR_LIST]
+    if len(args) == 2 and type(None) in args:
+        inner = args[0] if args[1] is type(None) else args[1]
+        if inner is str:
+            return _OPTIONAL_STR, _KIND_FORMATS[_OPTIONAL_STR]
+        if inner in _FIXED_FORMATS:
+            return _OPTIONAL_FIXED, "?" + _FIXED_FORMATS[inner]
+    raise TypeError(f"二进制编码不支持的字段类型: {annotation!r}")
+
+
+class BinaryEventCodec:
+    """按消息类型的固定布局编码 ``Event``，可直接从共享缓冲区解码。
+
+    每帧为 ``schema ID | 事件类型 ID | 定长区 | 字符串区``：定长区按字段顺序
+    写入整数、布尔、浮点（及其 Optional）以及各字符串字段的字节长度，解码时
+    一次 ``unpack_from`` 即可得到全部标量与长度，字符串区按长度依次切片。
+    schema ID 由消息类型的全名与字段布局哈希得到，布局变化的旧数据会被拒绝
+    而不是被错误解码。解码时直接在 ``memoryview`` 上读取，不复制中间字节。
+
+    ``compact=True`` 时解码出 ``BaseEventMessage.compact`` 轻量消息并跳过校验，
+    适合读取本系统自己写出的数据。
+    """
+
+    def __init__(
+        self,
+        message_types: Iterable[type[BaseEventMessage]] | None = None,
+        *,
+        compact: bool = False,
+    ):
+        self._compact = compact
+        self._schemas: dict[int, _Schema] = {}
+        self._schemas_by_model: dict[type[BaseEventMessage], _Schema] = {}
+        self._event_type_ids: dict[EventType, int] = {}
+        self._event_types: dict[int, EventType] = {}
+        for event_type in all_event_types():
+            self.register_event_type(event_type)
+        if message_types is not None:
+            for message_type in message_types:
+                self.register(message_type)
+            return
+        # 默认登记所有已定义的消息类型，跳过含不支持字段类型的消息
+        for message_type in all_message_types():
+            try:
+                self.register(message_type)
+            except TypeError:
+                continue
+
+    def register_event_type(self, event_type: EventType) -> int:
+        type_id = _stable_id(event_type.value)
+        existing = self._event_types.get(type_id)
+        if existing is not None and existing is not event_type:
+            raise ValueError(f"事件类型 ID 冲突: {existing!r} / {event_type!r}")
+        self._event_types[type_id] = event_type
+        self._event_type_ids[event_type] = type_id
+        return type_id
+
+    def register(
+        self, message_type: type[BaseEventMessage], schema_id: int | None = None
+    ) -> int:
+        """登记消息类型并返回其 schema ID。"""
+        classified = sorted(
+            (
+                (name, *_classify(info.annotation))
+                for name, info in message_type.model_fields.items()
+            ),
+            key=lambda item: item[1],
+        )
+        fields: list[tuple[str, int, int]] = []
+        formats: list[str] = []
+        groups: list[list[tuple[str, int]]] = [[] for _ in range(_EVENT_ID + 1)]
+        index = 0
+        for name, kind, fmt in classified:
+            fields.append((name, kind, index))
+            groups[kind].append((name, index))
+            formats.append(fmt)
+            index += len(fmt)
+
+        if schema_id is None:
+            layout = ",".join(
+                f"{name}:{fmt}" for (name, _, _), fmt in zip(fields, formats)
+            )
+            schema_id = _stable_id(
+                f"{message_type.__module__}.{message_type.__qualname__}|{layout}"
+            )
+        existing = self._schemas.get(schema_id)
+        if existing is not None and existing.model is not message_type:
+            raise ValueError(
+                f"schema ID 冲突: {existing.model.__name__} / {message_type.__name__}"
+            )
+
+        schema = _Schema(
+            schema_id=schema_id,
+            model=message_type,
+            fields=tuple(fields),
+            frame=struct.Struct("<" + "".join(formats)),
+            groups=tuple(tuple(group) for group in groups),
+        )
+        self._schemas[schema_id] = schema
+        self._schemas_by_model[message_type] = schema
+        return schema_id
+
+    # ------------------------------------------------------------------ 编码
+
+    def encode(self, event: EventABC[BaseEventMessage]) -> bytes:
+        out = bytearray()
+        self.encode_into(event, out)
+        return bytes(out)
+
+    def encode_many(self, events: Iterable[EventABC[BaseEventMessage]]) -> bytes:
+        """批量编码为 ``魔数 | 数量 | 帧...`` 格式。"""
+        out = bytearray(_BATCH_HEADER.size)
+        count = 0
+        encode_into = self.encode_into
+        for event in events:
+            encode_into(event, out)
+            count += 1
+        _BATCH_HEADER.pack_into(out, 0, _BATCH_MAGIC, count)
+        return bytes(out)
+
+    def encode_into(self, event: EventABC[BaseEventMessage], out: bytearray) -> None:
+        """将一帧追加写入 ``out``。"""
+        message = event.event_message
+        model = message_model(message)
+        schema = self._schemas_by_model.get(model)
+        if schema is None:
+            raise TypeError(f"未登记的消息类型: {model.__name__}")
+        try:
+            type_id = self._event_type_ids[event.event_type]
+        except KeyError:
+            raise TypeError(f"未登记的事件类型: {event.event_type!r}") from None
+
+        values: list[Any] = []
+        strings: list[bytes] = []
+        for name, kind, _ in schema.fields:
+            value = getattr(message, name)
+            if kind == _FIXED:
+                values.append(value)
+            elif kind == _STR:
+                data = value.encode()
+                values.append(len(data))
+                strings.append(data)
+            elif kind == _EVENT_ID:
+                _pack_event_id(value, values, strings)
+            elif kind == _OPTIONAL_FIXED:
+                values.append(value is not None)
+                values.append(0 if value is None else value)
+            elif kind == _OPTIONAL_STR:
+                if value is None:
+                    values.append(_NONE_LENGTH)
+                else:
+                    data = value.encode()
+                    values.append(len(data))
+                    strings.append(data)
+            else:
+                # 列表项长度写在字符串区内，每项带 u32 长度前缀
+                values.append(len(value))
+                for item in value:
+                    data = item.encode()
+                    strings.append(_U32.pack(len(data)))
+                    strings.append(data)
+
+        try:
+            frame = schema.frame.pack(*values)
+        except struct.error as exc:
+            raise CodecError(f"{model.__name__} 的字段值无法编码: {exc}") from exc
+        out += _HEADER.pack(schema.schema_id, type_id)
+        out += frame
+        out += b"".join(strings)
+
+    # ------------------------------------------------------------------ 解码
+
+    def decode(self, buffer: bytes | bytearray | memoryview) -> Event[Any]:
+        """解码单帧。"""
+        event, _ = self.decode_from(memoryview(buffer), 0)
+        return event
+
+    def decode_many(self, buffer: bytes | bytearray | memoryview) -> list[Event[Any]]:
+        return list(self.iter_decode(buffer))
+
+    def iter_decode(
+        self, buffer: bytes | bytearray | memoryview
+    ) -> Iterator[Event[Any]]:
+        """逐个解码 ``encode_many`` 产生的批量数据。"""
+        view = memoryview(buffer)
+        try:
+            magic, count = _BATCH_HEADER.unpack_from(view, 0)
+        except struct.error as exc:
+            raise CodecError("批量数据头不完整") from exc
+        if magic != _BATCH_MAGIC:
+            raise CodecError("不是批量事件数据")
+        offset = _BATCH_HEADER.size
+        decode_from = self.decode_from
+        for _ in range(count):
+            event, offset = decode_from(view, offset)
+            yield event
+
+    def decode_from(self, view: memoryview, offset: int) -> tuple[Event[Any], int]:
+        """从 ``view`` 的 ``offset`` 处解码一帧，返回事件与下一帧的偏移量。
+
+        字符串直接从 ``view`` 的切片解码，不产生中间 ``bytes``。
+        """
+        start = offset
+        try:
+            schema_id, type_id = _HEADER.unpack_from(view, offset)
+            schema = self._schemas.get(schema_id)
+            if schema is None:
+                raise CodecError(f"未知的 schema ID: {schema_id}")
+            event_type = self._event_types.get(type_id)
+            if event_type is None:
+                raise CodecError(f"未知的事件类型 ID: {type_id}")
+            offset += _HEADER.size
+            values = schema.frame.unpack_from(view, offset)
+            offset += schema.frame.size
+
+            (
+                scalars,
+                optional_scalars,
+                strings,
+                optional_strings,
+                string_lists,
+                event_ids,
+            ) = schema.groups
+            fields: dict[str, Any] = {name: values[index] for name, index in scalars}
+            for name, index in optional_scalars:
+                fields[name] = values[index + 1] if values[index] else None
+            for name, index in strings:
+                end = offset + values[index]
+                fields[name] = str(view[offset:end], "utf-8")
+                offset = end
+            for name, index in optional_strings:
+                length = values[index]
+                if length == _NONE_LENGTH:
+                    fields[name] = None
+                    continue
+                end = offset + length
+                fields[name] = str(view[offset:end], "utf-8")
+                offset = end
+            for name, index in string_lists:
+                items: list[str] = []
+                for _ in range(values[index]):
+                    (length,) = _U32.unpack_from(view, offset)
+                    offset += _U32.size
+                    end = offset + length
+                    items.append(str(view[offset:end], "utf-8"))
+                    offset = end
+                fields[name] = items
+            for name, index in event_ids:
+                tag, number, length = values[index : index + 3]
+                if tag == _ID_INT:
+                    fields[name] = number
+                    continue
+                end = offset + length
+                text = str(view[offset:end], "utf-8")
+                offset = end
+                # 旧版本把计数器 ID 拆成前缀与序号编码，解码为其字符串形式
+                fields[name] = f"{text}-{number:x}" if tag == _ID_COUNTER else text
+            if offset > len(view):
+                raise CodecError(f"偏移 {start} 处的帧被截断")
+        except (struct.error, UnicodeDecodeError) as exc:
+            raise CodecError(f"偏移 {start} 处的帧损坏或被截断") from exc
+
+        if self._compact:
+            message = schema.model.compact(**fields)
+        else:
+            message = schema.model(**fields)
+        return Event(event_type, message), offset
+
+
+def _pack_event_id(value: EventId, values: list[Any], strings: list[bytes]) -> None:
+    if isinstance(value, int):
+        values.extend((_ID_INT, value, 0))
+    else:
+        data = value.encode()
+        values.extend((_ID_STR, 0, len(data)))
+        strings.append(data)
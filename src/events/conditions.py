@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import operator
+from abc import ABC, abstractmethod
+from itertools import repeat
+from typing import Any, Callable, Hashable, Mapping, Sequence
+
+from .base import BaseEventMessage, CompactMessage, EventABC, EventContext
+from .batch import EventBatch
+from .tree import EventCondition
+
+ConditionFn = Callable[[EventABC[BaseEventMessage], EventContext], bool]
+OperandFn = Callable[[EventABC[BaseEventMessage], EventContext], Any]
+
+
+class _Missing:
+    """消息缺少字段时的占位值。
+
+    缺失字段的规则：``!=`` 对任何值（包括另一个缺失值）成立，``==`` 与大小
+    比较一律不成立。单事件与批量两条求值路径都遵循这一规则。
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        return False
+
+    def __ne__(self, other: object) -> bool:
+        return True
+
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING: Any = _Missing()
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+class Operand(ABC):
+    """声明式条件中的取值表达式，比较运算符会生成 ``Comparison``。"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def compile(self) -> OperandFn: ...
+
+    @abstractmethod
+    def batch_values(self, batch: EventBatch, context: EventContext) -> Any:
+        """批量求值：返回整列（``Sequence``）或对所有行相同的标量。"""
+
+    # batch_values 是否返回整列
+    per_row = False
+
+    def __eq__(self, other: object) -> Comparison:  # type: ignore[override]
+        return Comparison(self, "==", other)
+
+    def __ne__(self, other: object) -> Comparison:  # type: ignore[override]
+        return Comparison(self, "!=", other)
+
+    def __lt__(self, other: object) -> Comparison:
+        return Comparison(self, "<", other)
+
+    def __le__(self, other: object) -> Comparison:
+        return Comparison(self, "<=", other)
+
+    def __gt__(self, other: object) -> Comparison:
+        return Comparison(self, ">", other)
+
+    def __ge__(self, other: object) -> Comparison:
+        return Comparison(self, ">=", other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class MessageField(Operand):
+    """引用事件消息上的字段。"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    per_row = True
+
+    def compile(self) -> OperandFn:
+        name = self.name
+        return lambda event, context: getattr(event.event_message, name, _MISSING)
+
+    def batch_values(self, batch: EventBatch, context: EventContext) -> Any:
+        try:
+            return batch.column(self.name)
+        except KeyError:
+            return _MISSING
+
+    def __repr__(self) -> str:
+        return f"MessageField({self.name!r})"
+
+
+class ContextAttribute(Operand):
+    """引用 ``EventContext.attributes`` 中的值。"""
+
+    __slots__ = ("name", "default")
+
+    def __init__(self, name: str, default: Any = None):
+        self.name = name
+        self.default = default
+
+    def compile(self) -> OperandFn:
+        name, default = self.name, self.default
+        return lambda event, context: context.attributes.get(name, default)
+
+    def batch_values(self, batch: EventBatch, context: EventContext) -> Any:
+        return context.attributes.get(self.name, self.default)
+
+    def __repr__(self) -> str:
+        return f"ContextAttribute({self.name!r}, default={self.default!r})"
+
+
+class Const(Operand):
+    """常量。"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def compile(self) -> OperandFn:
+        value = self.value
+        return lambda event, context: value
+
+    def batch_values(self, batch: EventBatch, context: EventContext) -> Any:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"Const({self.value!r})"
+
+
+def _as_operand(value: object) -> Operand:
+    return value if isinstance(value, Operand) else Const(value)
+
+
+class DeclarativeCondition(EventCondition):
+    """可检查结构的条件，构造时编译为闭包以便快速求值。
+
+    支持 ``&``、``|``、``~`` 组合；``equality_constraints`` 暴露条件成立
+    所必需的“消息字段 == 常量”约束，供叶子节点建立索引。
+    """
+
+    def __init__(self) -> None:
+        self._fn = self.compile()
+
+    @abstractmethod
+    def compile(self) -> ConditionFn: ...
+
+    def __getstate__(self) -> dict[str, Any]:
+        # 编译出的闭包无法 pickle，反序列化时重新编译
+        state = self.__dict__.copy()
+        state.pop("_fn", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._fn = self.compile()
+
+    def evaluate(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> bool:
+        return self._fn(event, context)
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        # 子类按列实现时覆盖；这里保留逐行求值作为兜底
+        fn = self._fn
+        return [fn(event, context) for event in batch.iter_events()]
+
+    def __and__(self, other: DeclarativeCondition) -> AllOf:
+        return AllOf(self, other)
+
+    def __or__(self, other: DeclarativeCondition) -> AnyOf:
+        return AnyOf(self, other)
+
+    def __invert__(self) -> Not:
+        return Not(self)
+
+
+class Always(DeclarativeCondition):
+    """恒真条件，编译树时会被折叠。"""
+
+    constant_true = True
+
+    def compile(self) -> ConditionFn:
+        return lambda event, context: True
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        return [True] * len(batch)
+
+    def __repr__(self) -> str:
+        return "Always()"
+
+
+class Comparison(DeclarativeCondition):
+    """两个取值表达式之间的比较。"""
+
+    def __init__(self, left: object, op: str, right: object):
+        if op not in _OPERATORS:
+            raise ValueError(f"不支持的比较运算符: {op}")
+        self.left = _as_operand(left)
+        self.op = op
+        self.right = _as_operand(right)
+        super().__init__()
+
+    def compile(self) -> ConditionFn:
+        compare = _OPERATORS[self.op]
+        left = self.left.compile()
+
+        # 右侧为常量时直接内联，省去一次函数调用
+        if isinstance(self.right, Const):
+            value = self.right.value
+
+            def evaluate_const(
+                event: EventABC[BaseEventMessage], context: EventContext
+            ) -> bool:
+                try:
+                    return bool(compare(left(event, context), value))
+                except TypeError:
+                    return False
+
+            return evaluate_const
+
+        right = self.right.compile()
+
+        def evaluate(event: EventABC[BaseEventMessage], context: EventContext) -> bool:
+            try:
+                return bool(compare(left(event, context), right(event, context)))
+            except TypeError:
+                return False
+
+        return evaluate
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        """按列比较：``map`` 配合 ``operator`` 函数在 C 层完成逐行循环。"""
+        size = len(batch)
+        left = self.left.batch_values(batch, context)
+        right = self.right.batch_values(batch, context)
+        if left is _MISSING or right is _MISSING:
+            # 与 _Missing 的比较规则一致：只有 != 成立
+            return [self.op == "!="] * size
+        compare = _OPERATORS[self.op]
+        try:
+            if not self.left.per_row and not self.right.per_row:
+                return [bool(compare(left, right))] * size
+            if not self.right.per_row:
+                right = repeat(right, size)
+            elif not self.left.per_row:
+                left = repeat(left, size)
+            return list(map(compare, left, right))
+        except TypeError:
+            # 个别行类型不可比较，逐行求值以保持与单事件路径一致
+            return super().evaluate_batch(batch, context)
+
+    def equality_constraints(self) -> Mapping[str, Hashable]:
+        if self.op != "==":
+            return {}
+        pairs = ((self.left, self.right), (self.right, self.left))
+        for field_side, value_side in pairs:
+            if isinstance(field_side, MessageField) and isinstance(value_side, Const):
+                if isinstance(value_side.value, Hashable):
+                    return {field_side.name: value_side.value}
+        return {}
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} {self.op} {self.right!r})"
+
+
+class IsInstance(DeclarativeCondition):
+    """检查事件消息的类型；轻量消息按其对应的模型类判断。"""
+
+    def __init__(self, *message_types: type[BaseEventMessage]):
+        self.message_types = message_types
+        super().__init__()
+
+    def compile(self) -> ConditionFn:
+        message_types = self.message_types
+
+        def matches(event: EventABC[Any], context: EventContext) -> bool:
+            message = event.event_message
+            if isinstance(message, CompactMessage):
+                return issubclass(message.model_type, message_types)
+            return isinstance(message, message_types)
+
+        return matches
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        return [issubclass(batch.message_type, self.message_types)] * len(batch)
+
+    def __repr__(self) -> str:
+        names = ", ".join(message_type.__name__ for message_type in self.message_types)
+        return f"IsInstance({names})"
+
+
+class AllOf(DeclarativeCondition):
+    """所有子条件都成立（短路求值）。"""
+
+    def __init__(self, *conditions: DeclarativeCondition):
+        # 拍平嵌套的 AllOf，减少求值时的调用层数
+        flattened: list[DeclarativeCondition] = []
+        for condition in conditions:
+            if isinstance(condition, AllOf):
+                flattened.extend(condition.conditions)
+            elif not condition.constant_true:
+                flattened.append(condition)
+        self.conditions = tuple(flattened)
+        self.constant_true = not self.conditions
+        super().__init__()
+
+    def compile(self) -> ConditionFn:
+        fns = tuple(condition._fn for condition in self.conditions)
+        if not fns:
+            return lambda event, context: True
+        if len(fns) == 2:
+            first, second = fns
+            return lambda event, context: (
+                first(event, context) and second(event, context)
+            )
+        return lambda event, context: all(fn(event, context) for fn in fns)
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        mask: Sequence[bool] = [True] * len(batch)
+        for condition in self.conditions:
+            # 已全部不成立时不再计算后续条件
+            if not any(mask):
+                break
+            mask = list(
+                map(operator.and_, mask, condition.evaluate_batch(batch, context))
+            )
+        return mask
+
+    def equality_constraints(self) -> Mapping[str, Hashable]:
+        constraints: dict[str, Hashable] = {}
+        for condition in self.conditions:
+            constraints.update(condition.equality_constraints())
+        return constraints
+
+    def __repr__(self) -> str:
+        return " & ".join(repr(condition) for condition in self.conditions)
+
+
+class AnyOf(DeclarativeCondition):
+    """任一子条件成立（短路求值）。"""
+
+    def __init__(self, *conditions: DeclarativeCondition):
+        flattened: list[DeclarativeCondition] = []
+        for condition in conditions:
+            if isinstance(condition, AnyOf):
+                flattened.extend(condition.conditions)
+            else:
+                flattened.append(condition)
+        self.conditions = tuple(flattened)
+        self.constant_true = any(
+            condition.constant_true for condition in self.conditions
+        )
+        super().__init__()
+
+    def compile(self) -> ConditionFn:
+        if self.constant_true:
+            return lambda event, context: True
+        fns = tuple(condition._fn for condition in self.conditions)
+        return lambda event, context: any(fn(event, context) for fn in fns)
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        mask: Sequence[bool] = [False] * len(batch)
+        for condition in self.conditions:
+            if all(mask):
+                break
+            mask = list(
+                map(operator.or_, mask, condition.evaluate_batch(batch, context))
+            )
+        return mask
+
+    def __repr__(self) -> str:
+        return "(" + " | ".join(repr(condition) for condition in self.conditions) + ")"
+
+
+class Not(DeclarativeCondition):
+    """对子条件取反。"""
+
+    def __init__(self, condition: DeclarativeCondition):
+        self.condition = condition
+        super().__init__()
+
+    def compile(self) -> ConditionFn:
+        fn = self.condition._fn
+        return lambda event, context: not fn(event, context)
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        return list(map(operator.not_, self.condition.evaluate_batch(batch, context)))
+
+    def __repr__(self) -> str:
+        return f"~{self.condition!r}"
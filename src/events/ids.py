@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import itertools
+import os
+import secrets
+import threading
+import time
+import weakref
+from typing import Any, Callable, Protocol
+from uuid import uuid4
+
+
+# event_id 默认是 str；只有显式启用 SnowflakeIdGenerator 时才是 int
+type EventId = str | int
+
+
+class EventIdGenerator(Protocol):
+    """事件 ID 生成策略；每次调用返回一个新的、全局唯一的 ID。"""
+
+    def __call__(self) -> EventId: ...
+
+
+class UuidIdGenerator:
+    """随机 UUID 字符串（旧的默认行为）。"""
+
+    def __call__(self) -> EventId:
+        return str(uuid4())
+
+
+class CounterIdGenerator:
+    """进程内单调递增计数器 + 节点前缀，生成 ``"{前缀}-{序号:x}"`` 形式的字符串。
+
+    默认前缀由随机令牌与进程号组成，保证跨主机、跨工作进程唯一；fork 出的
+    子进程会自动换用新的前缀并重新计数。
+    """
+
+    def __init__(self, prefix: str | None = None):
+        self._fixed_prefix = prefix
+        self._reset()
+        if prefix is None:
+            _FORK_RESETS.add(self)
+
+    def _reset(self) -> None:
+        prefix = self._fixed_prefix or f"{secrets.token_hex(4)}{os.getpid():x}"
+        self._prefix = f"{prefix}-"
+        self._counter = itertools.count(1)
+
+    def __call__(self) -> EventId:
+        # next() 作用于 itertools.count 在持有 GIL 时是原子的
+        return f"{self._prefix}{next(self._counter):x}"
+
+
+class SnowflakeIdGenerator:
+    """Snowflake 风格的 64 位整数 ID：41 位毫秒时间戳 | 10 位节点 | 12 位序号。
+
+    ``node_id`` 必须由调用方分配，且在同时生成 ID 的所有进程（包括 fork 出的
+    子进程）之间互不相同：10 位节点号只有 1024 个取值，随机分配时几十个进程
+    就很可能冲突，冲突的节点在同一毫秒内会生成相同的 ID。
+    """
+
+    EPOCH_MS = 1_700_000_000_000
+    NODE_BITS = 10
+    SEQUENCE_BITS = 12
+
+    def __init__(self, node_id: int, *, clock: Callable[[], float] = time.time):
+        if not 0 <= node_id < 1 << self.NODE_BITS:
+            raise ValueError(f"node_id must fit in {self.NODE_BITS} bits")
+        self._node_bits = node_id << self.SEQUENCE_BITS
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def __call__(self) -> EventId:
+        sequence_mask = (1 << self.SEQUENCE_BITS) - 1
+        with self._lock:
+            now = int(self._clock() * 1000) - self.EPOCH_MS
+            if now < self._last_ms:
+                # 时钟回拨：沿用上一个时间戳，靠序号继续保证单调
+                now = self._last_ms
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & sequence_mask
+                if self._sequence == 0:
+                    # 当前毫秒序号用尽，借用下一毫秒
+                    now = self._last_ms + 1
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (
+                (now << (self.NODE_BITS + self.SEQUENCE_BITS))
+                | self._node_bits
+                | self._sequence
+            )
+
+
+# fork 后需要在子进程中重置状态的生成器
+_FORK_RESETS: weakref.WeakSet[Any] = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for generator in list(_FORK_RESETS):
+        generator._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+_generator: EventIdGenerator = CounterIdGenerator()
+
+
+def get_event_id_generator() -> EventIdGenerator:
+    return _generator
+
+
+def set_event_id_generator(generator: EventIdGenerator) -> EventIdGenerator:
+    """替换全局事件 ID 生成器，返回之前的生成器以便恢复。"""
+    global _generator
+    previous, _generator = _generator, generator
+    return previous
+
+
+def next_event_id() -> EventId:
+    return _generator()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+R = TypeVar("R")
+
+# 直方图桶的上界（纳秒），按 1-2-5 递增到 1 秒，最后一个桶收纳更慢的调用
+_BUCKET_BOUNDS_NS: tuple[int, ...] = tuple(
+    base * scale
+    for scale in (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+    for base in (1, 2, 5)
+) + (1_000_000_000,)
+
+
+class LatencyHistogram:
+    """单个计时点的调用次数、总耗时、最大值与对数分桶直方图。"""
+
+    __slots__ = ("count", "total_ns", "max_ns", "buckets", "_lock")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS_NS) + 1)
+
+    def record(self, elapsed_ns: int) -> None:
+        bucket = bisect_left(_BUCKET_BOUNDS_NS, elapsed_ns)
+        with self._lock:
+            self.count += 1
+            self.total_ns += elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+            self.buckets[bucket] += 1
+
+    def percentile(self, fraction: float) -> int:
+        """按分桶估算分位数，返回所在桶的上界（不超过最大值）。"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for bound, hits in zip(_BUCKET_BOUNDS_NS, self.buckets):
+            seen += hits
+            if seen >= target:
+                return min(bound, self.max_ns)
+        return self.max_ns
+
+
+@dataclass(frozen=True)
+class HotSpot:
+    """``Instrumentation.hot_spots`` 返回的一行统计。"""
+
+    kind: str
+    name: str
+    count: int
+    total_ns: int
+    max_ns: int
+    p50_ns: int
+    p99_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class Instrumentation:
+    """按 (类别, 名称) 记录调用次数与延迟直方图。
+
+    类别包括 ``handler``（处理器）、``node``（树节点，含其下的条件与动作）、
+    ``condition`` 与 ``action``（叶子配置中的条件与动作，以及分支转移条件）。
+    计时通过在编译处理器链与分派表时包装可调用对象实现，未启用时分派路径
+    上不存在任何计时代码。
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        self.clock = clock
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, kind: str, name: str) -> LatencyHistogram:
+        """获取（必要时创建）计时点的直方图。"""
+        key = (kind, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def record(self, kind: str, name: str, elapsed_ns: int) -> None:
+        self.histogram(kind, name).record(elapsed_ns)
+
+    @contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[None]:
+        """计时一段代码块。"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(kind, name, self.clock() - start)
+
+    def timed(self, kind: str, name: str, fn: Callable[..., R]) -> Callable[..., R]:
+        """包装返回普通值的调用（如条件判断）。"""
+        record = self.histogram(kind, name).record
+        clock = self.clock
+
+        def timed(*args: Any) -> R:
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                record(clock() - start)
+
+        return timed
+
+    def timed_iter(
+        self, kind: str, name: str, fn: Callable[..., Iterable[R]]
+    ) -> Callable[..., Iterator[R]]:
+        """包装返回可迭代对象的调用，返回惰性的生成器。
+
+        计入调用本身与每次取下一项的耗时，不计消费方处理各项的时间；结果取完
+        或生成器被关闭时记录一次。生成器处理器因此也能计入，且不改变惰性。
+        """
+        record = self.histogram(kind, name).record
+        clock = self.clock
+
+        def timed(*args: Any) -> Iterator[R]:
+            elapsed = 0
+            running = True
+            start = clock()
+            try:
+                for item in fn(*args):
+                    elapsed += clock() - start
+                    running = False
+                    yield item
+                    running = True
+                    start = clock()
+            finally:
+                if running:
+                    elapsed += clock() - start
+                record(elapsed)
+
+        return timed
+
+    def hot_spots(
+        self, kind: str | None = None, limit: int | None = None
+    ) -> list[HotSpot]:
+        """按总耗时从高到低返回各计时点的统计，未被调用过的计时点不列出。"""
+        spots = [
+            HotSpot(
+                kind=spot_kind,
+                name=name,
+                count=histogram.count,
+                total_ns=histogram.total_ns,
+                max_ns=histogram.max_ns,
+                p50_ns=histogram.percentile(0.5),
+                p99_ns=histogram.percentile(0.99),
+            )
+            for (spot_kind, name), histogram in list(self._histograms.items())
+            if histogram.count and (kind is None or spot_kind == kind)
+        ]
+        spots.sort(key=lambda spot: spot.total_ns, reverse=True)
+        return spots[:limit] if limit is not None else spots
+
+    def report(self, kind: str | None = None, limit: int | None = 20) -> str:
+        """格式化 ``hot_spots`` 为文本表格。"""
+        lines = [
+            f"{'kind':<10}{'calls':>9}{'total ms':>11}{'mean us':>10}"
+            f"{'p50 us':>10}{'p99 us':>10}{'max us':>10}  name"
+        ]
+        for spot in self.hot_spots(kind, limit):
+            lines.append(
+                f"{spot.kind:<10}{spot.count:>9}{spot.total_ns / 1e6:>11.3f}"
+                f"{spot.mean_ns / 1e3:>10.2f}{spot.p50_ns / 1e3:>10.2f}"
+                f"{spot.p99_ns / 1e3:>10.2f}{spot.max_ns / 1e3:>10.2f}  {spot.name}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """清零所有计数；已包装的调用继续写入同一批直方图。"""
+        for histogram in list(self._histograms.values()):
+            with histogram._lock:
+                histogram.clear()
+
+
+def describe(obj: object) -> str:
+    """计时点名称：有自定义 ``__repr__`` 时使用它，否则使用类名。"""
+    if type(obj).__repr__ is object.__repr__:
+        return type(obj).__qualname__
+    return repr(obj)
+
+
+# 启用或关闭计时时需要重新编译的对象（处理器注册表、状态树）
+_LISTENERS: weakref.WeakSet[Any] = weakref.WeakSet()
+_instrumentation: Instrumentation | None = None
+
+
+def add_instrumentation_listener(listener: Any) -> None:
+    """登记一个在计时开关变化时调用 ``_instrumentation_changed()`` 的对象。"""
+    _LISTENERS.add(listener)
+
+
+def get_instrumentation() -> Instrumentation | None:
+    """当前生效的计时器，未启用时为 ``None``。"""
+    return _instrumentation
+
+
+def enable_instrumentation(
+    instrumentation: Instrumentation | None = None,
+) -> Instrumentation:
+    """启用计时，已编译的处理器链与分派表会重新编译为带计时的版本。"""
+    global _instrumentation
+    _instrumentation = instrumentation or _instrumentation or Instrumentation()
+    _notify()
+    return _instrumentation
+
+
+def disable_instrumentation() -> Instrumentation | None:
+    """关闭计时并恢复未包装的分派路径，返回之前的计时器以便读取报告。"""
+    global _instrumentation
+    previous, _instrumentation = _instrumentation, None
+    _notify()
+    return previous
+
+
+def _notify() -> None:
+    for listener in list(_LISTENERS):
+        listener._instrumentation_changed()
@@ -1,24 +1,94 @@
 from __future__ import annotations
 
-from typing import Sequence
+import threading
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Iterable, Mapping, Sequence
 
-from .tree import EventConfigRepository, LeafConfiguration
+from .tree import (
+    BulkEventConfigRepository,
+    LeafConfiguration,
+    VersionedEventConfigRepository,
+)
 
 
-class InMemoryEventConfigRepository(EventConfigRepository):
-    """Lightweight repository emulating persisted configuration."""
+class InMemoryEventConfigRepository(
+    VersionedEventConfigRepository, BulkEventConfigRepository
+):
+    """Lightweight repository emulating persisted configuration.
 
-    def __init__(self, snapshot: dict[str, Sequence[LeafConfiguration]] | None = None):
-        self._snapshot: dict[str, list[LeafConfiguration]] = {
-            node_id: list(configurations)
+    Every write bumps a global version and appends to a change log, so trees can
+    pick up new rows via ``EventStateTree.refresh``. Rows are replaced
+    copy-on-write; readers never observe a partially updated node.
+
+    The change log keeps the latest ``max_change_log`` entries (trimmed in
+    batches, so up to twice as many between trims). A reader whose version
+    predates the oldest kept entry gets every node ID back, i.e. a full reload.
+    """
+
+    def __init__(
+        self,
+        snapshot: dict[str, Sequence[LeafConfiguration]] | None = None,
+        *,
+        max_change_log: int = 4096,
+    ):
+        if max_change_log <= 0:
+            raise ValueError("max_change_log 必须为正数")
+        self._snapshot: dict[str, tuple[LeafConfiguration, ...]] = {
+            node_id: tuple(configurations)
             for node_id, configurations in (snapshot or {}).items()
         }
+        self._version = 0
+        self._change_log: list[tuple[int, str]] = []
+        self._max_change_log = max_change_log
+        self._write_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     def register(
         self, node_id: str, configuration: LeafConfiguration
     ) -> "InMemoryEventConfigRepository":
-        self._snapshot.setdefault(node_id, []).append(configuration)
+        with self._write_lock:
+            self._commit(node_id, (*self._snapshot.get(node_id, ()), configuration))
+        return self
+
+    def replace(
+        self, node_id: str, configurations: Sequence[LeafConfiguration]
+    ) -> "InMemoryEventConfigRepository":
+        """整体替换某个节点的配置行。"""
+        with self._write_lock:
+            self._commit(node_id, tuple(configurations))
         return self
 
     def load_leaf_config(self, node_id: str) -> Sequence[LeafConfiguration]:
-        return tuple(self._snapshot.get(node_id, ()))
+        return self._snapshot.get(node_id, ())
+
+    def load_many(
+        self, node_ids: Iterable[str]
+    ) -> Mapping[str, Sequence[LeafConfiguration]]:
+        snapshot = self._snapshot
+        return {
+            node_id: snapshot[node_id] for node_id in node_ids if node_id in snapshot
+        }
+
+    def changes_since(self, version: int) -> tuple[int, frozenset[str]]:
+        # 先读版本号再读日志：日志先于版本号写入，因此不会漏掉变更
+        current = self._version
+        log = self._change_log
+        if current > version and (not log or log[0][0] > version + 1):
+            # 每次写入的版本号连续，日志开头有缺口说明所需条目已被截断
+            return current, frozenset(self._snapshot)
+        start = bisect_right(log, version, key=itemgetter(0))
+        return current, frozenset(node_id for _, node_id in log[start:])
+
+    def _commit(self, node_id: str, rows: tuple[LeafConfiguration, ...]) -> None:
+        version = self._version + 1
+        self._snapshot[node_id] = rows
+        log = self._change_log
+        if len(log) >= 2 * self._max_change_log:
+            # 截断时换成新列表，读者手中的旧列表保持不变；按半数截断均摊复制代价
+            log = self._change_log = log[-self._max_change_log :]
+        log.append((version, node_id))
+        self._version = version
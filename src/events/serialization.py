@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence, TypeVar
+
+from src.event_types import event_type_from_value
+
+from .base import BaseEventMessage, all_message_types
+from .conditions import (
+    AllOf,
+    Always,
+    AnyOf,
+    Comparison,
+    ContextAttribute,
+    DeclarativeCondition,
+    IsInstance,
+    MessageField,
+    Not,
+    Operand,
+    _as_operand,
+)
+from .tree import EventAction, EventCondition, LeafConfiguration
+
+ConditionBuilder = Callable[..., EventCondition]
+ActionBuilder = Callable[..., EventAction]
+B = TypeVar("B", bound=Callable[..., Any])
+
+# 计划格式变化时递增，使旧的磁盘缓存自动失效
+_PLAN_FORMAT = 2
+_COMPARISON_OPS = frozenset({"==", "!=", "<", "<=", ">", ">="})
+_CONDITION_KINDS = frozenset(
+    {"all", "any", "not", "always", "is_instance", "compare", "builder"}
+)
+
+
+class ConfigFormatError(ValueError):
+    """配置行不符合序列化格式。"""
+
+
+class BuilderRegistry:
+    """按名称登记条件与动作的构建函数，以及可在条件中引用的消息类型。
+
+    配置行只保存名称和 JSON 参数，加载时调用对应的构建函数生成对象。
+    """
+
+    def __init__(self) -> None:
+        self._conditions: dict[str, ConditionBuilder] = {}
+        self._actions: dict[str, ActionBuilder] = {}
+        self._message_types: dict[str, type[BaseEventMessage]] = {}
+        for message_type in all_message_types():
+            self.register_message_type(message_type)
+
+    def register_condition(self, name: str, builder: ConditionBuilder) -> None:
+        self._conditions[name] = builder
+
+    def register_action(self, name: str, builder: ActionBuilder) -> None:
+        self._actions[name] = builder
+
+    def register_message_type(self, message_type: type[BaseEventMessage]) -> None:
+        self._message_types[message_type.__name__] = message_type
+
+    def fingerprint(self) -> bytes:
+        """已登记名称的摘要，用于区分不同注册表下生成的缓存。"""
+        names = (
+            sorted(self._conditions),
+            sorted(self._actions),
+            sorted(self._message_types),
+        )
+        return json.dumps(names).encode()
+
+    def condition(self, name: str) -> Callable[[B], B]:
+        """装饰器形式的 ``register_condition``。"""
+
+        def decorator(builder: B) -> B:
+            self.register_condition(name, builder)
+            return builder
+
+        return decorator
+
+    def action(self, name: str) -> Callable[[B], B]:
+        """装饰器形式的 ``register_action``。"""
+
+        def decorator(builder: B) -> B:
+            self.register_action(name, builder)
+            return builder
+
+        return decorator
+
+
+# 全局构建函数注册表实例
+_global_builders: BuilderRegistry | None = None
+
+
+def get_global_builders() -> BuilderRegistry:
+    """获取全局构建函数注册表实例。"""
+    global _global_builders
+    if _global_builders is None:
+        _global_builders = BuilderRegistry()
+    return _global_builders
+
+
+def condition_builder(name: str) -> Callable[[B], B]:
+    """把条件构建函数注册到全局注册表。
+
+    Example:
+        @condition_builder("damage_at_least")
+        def damage_at_least(threshold: int) -> EventCondition:
+            return MessageField("damage") >= threshold
+    """
+    return get_global_builders().condition(name)
+
+
+def action_builder(name: str) -> Callable[[B], B]:
+    """把动作构建函数注册到全局注册表。"""
+    return get_global_builders().action(name)
+
+
+class LeafConfigLoader:
+    """把 JSON 文档解析为按节点分组的 ``LeafConfiguration``。
+
+    文档格式为 ``{"<node_id>": [<row>, ...]}``，每行形如::
+
+        {
+            "listen_event": "skill.on_hit",
+            "condition": {"all": [
+                {"is_instance": ["SkillHitMessage"]},
+                {"compare": [{"field": "damage"}, ">=",
+                             {"context": "damage_threshold", "default": 0}]}
+            ]},
+            "actions": [{"action": "emit_health_change", "params": {}}]
+        }
+
+    条件还支持 ``{"any": [...]}``、``{"not": ...}``、``{"always": true}``
+    （``false`` 表示永不满足）和 ``{"builder": "<name>", "params": {...}}``。
+    每个条件对象恰好包含一个上述键（``builder`` 可另带 ``params``），值的类型
+    不符时抛出 ``ConfigFormatError``。解析校验后的结果是只含基础
+    类型的“计划”；指定 ``cache_dir`` 时计划以 ``marshal`` 格式、以文档内容
+    哈希为键缓存到磁盘，热启动直接读取计划，跳过 JSON 解析与校验，只需调用
+    构建函数。计划只含基础类型，读取缓存不会执行任何代码。
+    """
+
+    def __init__(
+        self,
+        builders: BuilderRegistry | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+    ):
+        self._builders = builders or get_global_builders()
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    def load_file(
+        self, path: str | os.PathLike[str]
+    ) -> dict[str, tuple[LeafConfiguration, ...]]:
+        return self.load(Path(path).read_bytes())
+
+    def load(self, document: str | bytes) -> dict[str, tuple[LeafConfiguration, ...]]:
+        raw = document.encode() if isinstance(document, str) else document
+        # 批量创建大量小对象时暂停循环垃圾回收，避免反复触发全代扫描
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            plan = self._cached_plan(raw)
+            # 声明式条件不可变，相同的计划在整个文档内共享同一个实例
+            memo: dict[tuple[Any, ...], EventCondition] = {}
+            return {
+                node_id: tuple(self._build_row(row_plan, memo) for row_plan in rows)
+                for node_id, rows in plan.items()
+            }
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def load_row(self, row: str | bytes | Mapping[str, Any]) -> LeafConfiguration:
+        """解析单行配置（不经过磁盘缓存）。"""
+        data = row if isinstance(row, Mapping) else json.loads(row)
+        return self._build_row(self._plan_row(data), {})
+
+    def _cached_plan(self, raw: bytes) -> dict[str, list[tuple[Any, ...]]]:
+        cache_path: Path | None = None
+        if self._cache_dir is not None:
+            # 注册表内容也参与哈希：构建函数增删后旧计划不会再被命中
+            digest = hashlib.sha256(raw + self._builders.fingerprint()).hexdigest()
+            cache_path = self._cache_dir / f"{digest}.v{_PLAN_FORMAT}.plan"
+            try:
+                cached = marshal.loads(cache_path.read_bytes())
+            except (OSError, EOFError, ValueError, TypeError):
+                # 文件不存在、无法读取，或截断、损坏：都按未命中处理
+                pass
+            else:
+                if isinstance(cached, dict):
+                    return cached
+
+        plan = self._plan_document(json.loads(raw))
+
+        if cache_path is not None:
+            self._write_plan(cache_path, plan)
+        return plan
+
+    @staticmethod
+    def _write_plan(cache_path: Path, plan: dict[str, list[tuple[Any, ...]]]) -> None:
+        """先写同目录下的唯一临时文件再原子替换，并发启动不会读到半个文件。
+
+        缓存只是加速手段，写入失败（例如目录只读）不影响本次加载。
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=cache_path.parent, suffix=".plan.tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                cache_file.write(marshal.dumps(plan))
+            os.replace(temporary, cache_path)
+        except BaseException as error:
+            os.unlink(temporary)
+            if not isinstance(error, OSError):
+                raise
+
+    def _plan_document(self, data: Any) -> dict[str, list[tuple[Any, ...]]]:
+        if not isinstance(data, dict):
+            raise ConfigFormatError("配置文档必须是以节点 ID 为键的对象")
+        plan: dict[str, list[tuple[Any, ...]]] = {}
+        for node_id, rows in data.items():
+            if not isinstance(rows, list):
+                raise ConfigFormatError(f"节点 {node_id} 的配置必须是数组")
+            plan[node_id] = [self._plan_row(row) for row in rows]
+        return plan
+
+    def _plan_row(self, row: Any) -> tuple[Any, ...]:
+        if not isinstance(row, dict) or "listen_event" not in row:
+            raise ConfigFormatError(f"配置行缺少 listen_event: {row!r}")
+        listen_event = row["listen_event"]
+        try:
+            event_type_from_value(listen_event)
+        except (TypeError, ValueError):
+            raise ConfigFormatError(f"未知的事件类型: {listen_event!r}") from None
+        condition = self._plan_condition(row.get("condition", {"always": True}))
+        actions = tuple(self._plan_action(action) for action in row.get("actions", []))
+        # 计划只保存事件类型的值，构建时再查找枚举；原始行以紧凑 JSON 文本
+        # 保存，缓存读取时只是一个字符串对象
+        source = json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+        return (listen_event, condition, actions, source)
+
+    def _plan_condition(self, spec: Any) -> tuple[Any, ...]:
+        if not isinstance(spec, dict):
+            raise ConfigFormatError(f"无法识别的条件: {spec!r}")
+        # builder 之外的条件只能有一个键；builder 可额外带 params
+        keys = spec.keys() - {"params"} if "builder" in spec else spec.keys()
+        if len(keys) != 1 or not keys <= _CONDITION_KINDS:
+            raise ConfigFormatError(f"条件必须恰好包含一个可识别的键: {spec!r}")
+        (kind,) = keys
+        value = spec[kind]
+        if kind in ("all", "any"):
+            if not isinstance(value, list):
+                raise ConfigFormatError(f"{kind} 需要条件数组: {spec!r}")
+            return (kind, tuple(self._plan_condition(child) for child in value))
+        if kind == "not":
+            return ("not", self._plan_condition(value))
+        if kind == "always":
+            if not isinstance(value, bool):
+                raise ConfigFormatError(f"always 需要布尔值: {spec!r}")
+            return ("always",) if value else ("not", ("always",))
+        if kind == "is_instance":
+            names = [value] if isinstance(value, str) else value
+            if not isinstance(names, list) or not all(
+                isinstance(name, str) for name in names
+            ):
+                raise ConfigFormatError(f"is_instance 需要类型名或类型名数组: {spec!r}")
+            for name in names:
+                if name not in self._builders._message_types:
+                    raise ConfigFormatError(f"未知的消息类型: {name}")
+            return ("is_instance", tuple(names))
+        if kind == "compare":
+            if not isinstance(value, list) or len(value) != 3:
+                raise ConfigFormatError(f"compare 需要 [left, op, right]: {spec!r}")
+            left, op, right = value
+            if op not in _COMPARISON_OPS:
+                raise ConfigFormatError(f"不支持的比较运算符: {op}")
+            return ("compare", _plan_operand(left), op, _plan_operand(right))
+        params = spec.get("params", {})
+        if not isinstance(value, str) or not isinstance(params, dict):
+            raise ConfigFormatError(f"builder 需要名称与 params 对象: {spec!r}")
+        if value not in self._builders._conditions:
+            raise ConfigFormatError(f"未注册的条件构建函数: {value}")
+        return ("builder", value, dict(params))
+
+    def _plan_action(self, spec: Any) -> tuple[Any, ...]:
+        if not isinstance(spec, dict) or "action" not in spec:
+            raise ConfigFormatError(f"无法识别的动作: {spec!r}")
+        name = spec["action"]
+        if name not in self._builders._actions:
+            raise ConfigFormatError(f"未注册的动作构建函数: {name}")
+        return (name, dict(spec.get("params", {})))
+
+    def _build_row(
+        self, plan: tuple[Any, ...], memo: dict[tuple[Any, ...], EventCondition]
+    ) -> LeafConfiguration:
+        listen_event, condition, actions, source = plan
+        return LeafConfiguration(
+            listen_event=event_type_from_value(listen_event),
+            condition=self._build_condition(condition, memo),
+            actions=tuple(
+                self._builders._actions[name](**params) for name, params in actions
+            ),
+            source=source,
+        )
+
+    def _build_condition(
+        self, plan: tuple[Any, ...], memo: dict[tuple[Any, ...], EventCondition]
+    ) -> EventCondition:
+        kind = plan[0]
+        if kind == "builder":
+            # 构建函数可能返回有状态的对象，不做共享
+            return self._builders._conditions[plan[1]](**plan[2])
+        try:
+            return memo[plan]
+        except KeyError:
+            pass
+        except TypeError:  # 含不可哈希常量（如列表）的计划无法共享
+            return self._new_condition(plan, memo)
+        condition = memo[plan] = self._new_condition(plan, memo)
+        return condition
+
+    def _new_condition(
+        self, plan: tuple[Any, ...], memo: dict[tuple[Any, ...], EventCondition]
+    ) -> EventCondition:
+        kind = plan[0]
+        if kind == "compare":
+            _, left, op, right = plan
+            return Comparison(_build_operand(left), op, _build_operand(right))
+        if kind == "is_instance":
+            return IsInstance(
+                *(self._builders._message_types[name] for name in plan[1])
+            )
+        if kind == "always":
+            return Always()
+        if kind == "not":
+            return Not(self._as_declarative(self._build_condition(plan[1], memo)))
+        children = [
+            self._as_declarative(self._build_condition(child, memo))
+            for child in plan[1]
+        ]
+        return AllOf(*children) if kind == "all" else AnyOf(*children)
+
+    @staticmethod
+    def _as_declarative(condition: EventCondition) -> DeclarativeCondition:
+        if isinstance(condition, DeclarativeCondition):
+            return condition
+        return _WrappedCondition(condition)
+
+
+class _WrappedCondition(DeclarativeCondition):
+    """让构建函数返回的任意条件可以参与布尔组合。"""
+
+    def __init__(self, condition: EventCondition):
+        self.condition = condition
+        self.constant_true = condition.constant_true
+        super().__init__()
+
+    def compile(self) -> Callable[..., bool]:
+        return self.condition.evaluate
+
+    def equality_constraints(self) -> Mapping[str, Any]:
+        return self.condition.equality_constraints()
+
+
+def _plan_operand(spec: Any) -> tuple[Any, ...]:
+    if isinstance(spec, dict):
+        if "field" in spec:
+            return ("field", spec["field"])
+        if "context" in spec:
+            return ("context", spec["context"], spec.get("default"))
+        if "const" in spec:
+            return ("const", spec["const"])
+        raise ConfigFormatError(f"无法识别的操作数: {spec!r}")
+    return ("const", spec)
+
+
+def _build_operand(plan: tuple[Any, ...]) -> Operand:
+    if plan[0] == "field":
+        return MessageField(plan[1])
+    if plan[0] == "context":
+        return ContextAttribute(plan[1], plan[2])
+    return _as_operand(plan[1])
+
+
+class JsonRowCodec:
+    """以 JSON 行格式存储配置的 ``LeafRowCodec``，可用于 SQLite 仓库。
+
+    只能编码由 ``LeafConfigLoader`` 构建（带有 ``source``）的配置。解码结果
+    按行内容缓存最近的 ``max_cached_rows`` 行，未变化的行在重复加载时不再
+    解析与校验；相同内容的行因此共享同一个配置对象。
+    """
+
+    def __init__(
+        self, loader: LeafConfigLoader | None = None, *, max_cached_rows: int = 4096
+    ):
+        self._loader = loader or LeafConfigLoader()
+        self._load_row = lru_cache(maxsize=max_cached_rows)(self._loader.load_row)
+
+    def encode(self, configuration: LeafConfiguration) -> bytes:
+        if configuration.source is None:
+            raise ValueError("配置不是由 LeafConfigLoader 构建的，无法序列化为 JSON")
+        return configuration.source.encode()
+
+    def decode(self, payload: bytes) -> LeafConfiguration:
+        return self._load_row(bytes(payload))
+
+
+def dump_rows(
+    configurations: Mapping[str, Sequence[LeafConfiguration]],
+) -> str:
+    """把由加载器构建的配置重新序列化为 JSON 文档。"""
+    document: dict[str, list[Any]] = {}
+    for node_id, rows in configurations.items():
+        for configuration in rows:
+            if configuration.source is None:
+                raise ValueError(f"节点 {node_id} 存在无法序列化的配置")
+            document.setdefault(node_id, []).append(json.loads(configuration.source))
+    return json.dumps(document, ensure_ascii=False, indent=2)
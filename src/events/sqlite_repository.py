@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sqlite3
+import threading
+from contextlib import AbstractContextManager, nullcontext
+from time import monotonic
+from typing import Iterable, Mapping, Protocol, Sequence
+
+from .tree import (
+    BulkEventConfigRepository,
+    LeafConfiguration,
+    VersionedEventConfigRepository,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaf_config (
+    node_id  TEXT    NOT NULL,
+    position INTEGER NOT NULL,
+    payload  BLOB    NOT NULL,
+    PRIMARY KEY (node_id, position)
+);
+CREATE TABLE IF NOT EXISTS leaf_change_log (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    node_id TEXT NOT NULL
+);
+"""
+
+
+class LeafRowCodec(Protocol):
+    """把 ``LeafConfiguration`` 转换为可存储的字节串。"""
+
+    def encode(self, configuration: LeafConfiguration) -> bytes: ...
+
+    def decode(self, payload: bytes) -> LeafConfiguration: ...
+
+
+class PickleRowCodec:
+    """基于 pickle 的编解码器。
+
+    条件与动作中的函数必须是模块级可导入对象；pickle 可执行任意代码，
+    只应用于可信的数据库。
+    """
+
+    def encode(self, configuration: LeafConfiguration) -> bytes:
+        return pickle.dumps(configuration, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, payload: bytes) -> LeafConfiguration:
+        return pickle.loads(payload)
+
+
+class SQLiteEventConfigRepository(
+    VersionedEventConfigRepository, BulkEventConfigRepository
+):
+    """以 SQLite 持久化叶子配置行的仓库。
+
+    每个线程复用一个连接；``load_many`` 用一条查询加载任意数量的节点，
+    ``EventStateTree.compile``/``preload`` 会在建树时调用它一次，避免逐节点查询。
+    每次写入都会追加变更记录，可配合 ``EventStateTree.refresh`` 热更新，
+    其他连接（包括其他进程）提交的修改同样能被发现。
+
+    ``version`` 在每次分派前都会被读取，因此返回缓存值：本实例的写入直接
+    更新缓存，其他连接的提交通过 ``PRAGMA data_version`` 发现，每个线程至多
+    每 ``poll_interval`` 秒检查一次，期间不访问数据库。
+    """
+
+    def __init__(
+        self, database: str, codec: LeafRowCodec, *, poll_interval: float = 0.1
+    ):
+        self._database = database
+        self._codec = codec
+        self._poll_interval = poll_interval
+        self._local = threading.local()
+        # 内存数据库只存在于单个连接中，所有线程共享同一个连接，语句需串行执行
+        self._shared: sqlite3.Connection | None = None
+        self._lock: AbstractContextManager[object] = nullcontext()
+        if database == ":memory:":
+            self._shared = sqlite3.connect(database, check_same_thread=False)
+            self._lock = threading.RLock()
+        self._version_lock = threading.Lock()
+        with self._lock:
+            connection = self._connection()
+            connection.executescript(_SCHEMA)
+            self._version = self._query_version(connection)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._shared is not None:
+            return self._shared
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._database)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _query_version(connection: sqlite3.Connection) -> int:
+        row = connection.execute(
+            "SELECT COALESCE(MAX(version), 0) FROM leaf_change_log"
+        ).fetchone()
+        return int(row[0])
+
+    def _observe_version(self, version: int) -> None:
+        with self._version_lock:
+            if version > self._version:
+                self._version = version
+
+    @property
+    def version(self) -> int:
+        local = self._local
+        now = monotonic()
+        if now < getattr(local, "poll_at", 0.0):
+            return self._version
+        local.poll_at = now + self._poll_interval
+        with self._lock:
+            connection = self._connection()
+            # data_version 只在其他连接提交后变化，未变化时无需查询变更记录
+            (data_version,) = connection.execute("PRAGMA data_version").fetchone()
+            if data_version != getattr(local, "data_version", None):
+                local.data_version = data_version
+                self._observe_version(self._query_version(connection))
+        return self._version
+
+    def changes_since(self, version: int) -> tuple[int, frozenset[str]]:
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT version, node_id FROM leaf_change_log WHERE version > ?",
+                    (version,),
+                )
+                .fetchall()
+            )
+        if not rows:
+            return version, frozenset()
+        return max(row[0] for row in rows), frozenset(row[1] for row in rows)
+
+    def register(
+        self, node_id: str, configuration: LeafConfiguration
+    ) -> "SQLiteEventConfigRepository":
+        self.register_many(node_id, [configuration])
+        return self
+
+    def register_many(
+        self, node_id: str, configurations: Iterable[LeafConfiguration]
+    ) -> "SQLiteEventConfigRepository":
+        """在节点已有配置之后追加多行。"""
+        with self._lock:
+            connection = self._connection()
+            with connection:
+                (start,) = connection.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM leaf_config"
+                    " WHERE node_id = ?",
+                    (node_id,),
+                ).fetchone()
+                version = self._insert(connection, node_id, configurations, start)
+        self._observe_version(version)
+        return self
+
+    def replace(
+        self, node_id: str, configurations: Sequence[LeafConfiguration]
+    ) -> "SQLiteEventConfigRepository":
+        """在一个事务中整体替换某个节点的配置行。"""
+        with self._lock:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "DELETE FROM leaf_config WHERE node_id = ?", (node_id,)
+                )
+                version = self._insert(connection, node_id, configurations, 0)
+        self._observe_version(version)
+        return self
+
+    def _insert(
+        self,
+        connection: sqlite3.Connection,
+        node_id: str,
+        configurations: Iterable[LeafConfiguration],
+        start: int,
+    ) -> int:
+        """写入配置行与变更记录，返回新的版本号（提交后才对其他连接可见）。"""
+        connection.executemany(
+            "INSERT INTO leaf_config (node_id, position, payload) VALUES (?, ?, ?)",
+            (
+                (node_id, position, self._codec.encode(configuration))
+                for position, configuration in enumerate(configurations, start)
+            ),
+        )
+        cursor = connection.execute(
+            "INSERT INTO leaf_change_log (node_id) VALUES (?)", (node_id,)
+        )
+        return int(cursor.lastrowid or 0)
+
+    def load_leaf_config(self, node_id: str) -> Sequence[LeafConfiguration]:
+        return self.load_many([node_id]).get(node_id, ())
+
+    def load_many(
+        self, node_ids: Iterable[str]
+    ) -> Mapping[str, Sequence[LeafConfiguration]]:
+        # 通过 json_each 把任意数量的节点 ID 作为单个参数传入，不受参数个数限制
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT node_id, payload FROM leaf_config"
+                    " WHERE node_id IN (SELECT value FROM json_each(?))"
+                    " ORDER BY node_id, position",
+                    (json.dumps(list(node_ids)),),
+                )
+                .fetchall()
+            )
+        grouped: dict[str, list[LeafConfiguration]] = {}
+        decode = self._codec.decode
+        for node_id, payload in rows:
+            grouped.setdefault(node_id, []).append(decode(payload))
+        return {
+            node_id: tuple(configurations)
+            for node_id, configurations in grouped.items()
+        }
+
+    def close(self) -> None:
+        """关闭当前线程（或共享）的连接。"""
+        if self._shared is not None:
+            with self._lock:
+                self._shared.close()
+                self._shared = None
+            return
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -1,14 +1,38 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Callable, Iterable, Protocol, Sequence, TypeVar, cast
+import threading
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Protocol,
+    Sequence,
+    TypeVar,
+    cast,
+    runtime_checkable,
+)
 
 from src.event_types import EventType
 
 from .base import BaseEventMessage, EventABC, EventContext
+from .batch import EventBatch
+from .instrumentation import (
+    Instrumentation,
+    add_instrumentation_listener,
+    describe,
+    get_instrumentation,
+)
 
 T = TypeVar("T", bound=BaseEventMessage)
+# 批量路径上的产出：单个事件或整批事件
+EventOrBatch = EventABC[BaseEventMessage] | EventBatch
 T_contra = TypeVar("T_contra", bound=BaseEventMessage, contravariant=True)
 
 
@@ -20,6 +44,14 @@ class EventConditionFn(Protocol):
     ) -> bool: ...
 
 
+class EventBatchActionFn(Protocol):
+    """批量动作处理函数协议。"""
+
+    def __call__(
+        self, batch: EventBatch, context: EventContext
+    ) -> Iterable[EventOrBatch]: ...
+
+
 class EventActionFn(Protocol[T_contra]):
     """事件动作处理函数协议。"""
 
@@ -29,23 +61,40 @@ class EventActionFn(Protocol[T_contra]):
 
 
 class EventCondition(ABC):
+    # 标记为恒真的条件会在 EventStateTree.compile 时被折叠掉
+    constant_true: bool = False
+
     @abstractmethod
     def evaluate(
         self, event: EventABC[BaseEventMessage], context: EventContext
     ) -> bool: ...
 
+    def equality_constraints(self) -> Mapping[str, Hashable]:
+        """条件成立所必需的“消息字段 == 常量”约束，无法分析时返回空。"""
+        return {}
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        """对批次逐行求值，返回布尔掩码；可按列计算的条件应覆盖此方法。"""
+        return [self.evaluate(event, context) for event in batch.iter_events()]
+
 
 class CallableCondition(EventCondition):
     """包装最基本的函数判断器"""
 
-    def __init__(self, fn: EventConditionFn):
+    def __init__(self, fn: EventConditionFn, *, constant_true: bool = False):
         self._fn = fn
+        self.constant_true = constant_true
 
     def evaluate(
         self, event: EventABC[BaseEventMessage], context: EventContext
     ) -> bool:
         return bool(self._fn(event, context))
 
+    def __repr__(self) -> str:
+        return f"CallableCondition({_callable_name(self._fn)})"
+
 
 class EventAction(ABC):
     """当节点的条件得到满足时，会生成新的事件。"""
@@ -55,12 +104,30 @@ class EventAction(ABC):
         self, event: EventABC[BaseEventMessage], context: EventContext
     ) -> Iterable[EventABC[BaseEventMessage]]: ...
 
+    def produce_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Iterable[EventOrBatch]:
+        """处理整批事件；默认逐行物化后调用 ``produce``。"""
+        produced: list[EventOrBatch] = []
+        for event in batch.iter_events():
+            produced.extend(self.produce(event, context))
+        return produced
+
 
 class CallableAction(EventAction):
-    """包装函数触发器"""
+    """包装函数触发器；``batch_fn`` 可提供按列处理整批事件的实现。"""
 
-    def __init__(self, fn: EventActionFn[T_contra]):
+    def __init__(
+        self,
+        fn: EventActionFn[T_contra],
+        *,
+        batch_fn: EventBatchActionFn | None = None,
+    ):
         self._fn = fn
+        self._batch_fn = batch_fn
+
+    def __repr__(self) -> str:
+        return f"CallableAction({_callable_name(self._fn)})"
 
     def produce(
         self, event: EventABC[BaseEventMessage], context: EventContext
@@ -74,6 +141,94 @@ class CallableAction(EventAction):
         )
         return list(fn(event, context))
 
+    def produce_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Iterable[EventOrBatch]:
+        if self._batch_fn is None:
+            return super().produce_batch(batch, context)
+        return list(self._batch_fn(batch, context))
+
+
+def _callable_name(fn: Callable[..., Any]) -> str:
+    return getattr(fn, "__qualname__", None) or describe(fn)
+
+
+class _TimedCondition(EventCondition):
+    """启用计时后编译分派表时包装条件，记录每次求值的耗时。"""
+
+    def __init__(
+        self, condition: EventCondition, instrumentation: Instrumentation, name: str
+    ):
+        self.condition = condition
+        self.constant_true = condition.constant_true
+        self._evaluate = instrumentation.timed("condition", name, condition.evaluate)
+        self._evaluate_batch = instrumentation.timed(
+            "condition", f"{name} (batch)", condition.evaluate_batch
+        )
+
+    def evaluate(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> bool:
+        return self._evaluate(event, context)
+
+    def evaluate_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Sequence[bool]:
+        return self._evaluate_batch(batch, context)
+
+    def equality_constraints(self) -> Mapping[str, Hashable]:
+        return self.condition.equality_constraints()
+
+
+class _TimedAction(EventAction):
+    """启用计时后编译分派表时包装动作，计入动作产出各项的耗时。"""
+
+    def __init__(
+        self, action: EventAction, instrumentation: Instrumentation, name: str
+    ):
+        self.action = action
+        self._produce = instrumentation.timed_iter("action", name, action.produce)
+        self._produce_batch = instrumentation.timed_iter(
+            "action", f"{name} (batch)", action.produce_batch
+        )
+
+    def produce(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return self._produce(event, context)
+
+    def produce_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> Iterable[EventOrBatch]:
+        return self._produce_batch(batch, context)
+
+
+class AsyncEventAction(EventAction):
+    """异步动作，只能由 ``EventStateTree.dispatch_async`` 执行。"""
+
+    @abstractmethod
+    async def produce(  # type: ignore[override]
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]: ...
+
+
+class AsyncCallableAction(AsyncEventAction):
+    """包装异步函数触发器"""
+
+    def __init__(
+        self,
+        fn: Callable[
+            [EventABC[BaseEventMessage], EventContext],
+            Awaitable[Iterable[EventABC[BaseEventMessage]]],
+        ],
+    ):
+        self._fn = fn
+
+    async def produce(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return list(await self._fn(event, context))
+
 
 @dataclass(frozen=True)
 class LeafConfiguration:
@@ -82,6 +237,61 @@ class LeafConfiguration:
     listen_event: EventType
     condition: EventCondition
     actions: Sequence[EventAction] = field(default_factory=tuple)
+    # 由 events.serialization 构建时保留的原始 JSON 行，用于再次序列化
+    source: str | None = field(default=None, compare=False, repr=False)
+
+
+class ConfigurationIndex:
+    """按消息字段的等值约束对叶子配置分桶。
+
+    选取被最多配置约束的字段作为索引键，每个桶内预先合并未受约束的配置并
+    保持原有顺序，查找只需一次字典访问。条件本身仍会在命中后完整求值。
+    """
+
+    def __init__(self, configurations: Sequence[LeafConfiguration]):
+        self.configurations = tuple(configurations)
+        self._field: str | None = None
+        self._buckets: dict[Hashable, tuple[LeafConfiguration, ...]] = {}
+        self._unindexed = self.configurations
+
+        counts: Counter[str] = Counter(
+            name
+            for config in self.configurations
+            for name in config.condition.equality_constraints()
+        )
+        if not counts:
+            return
+        field_name, indexed_count = counts.most_common(1)[0]
+        if indexed_count < 2:
+            return
+
+        keyed: dict[Hashable, list[tuple[int, LeafConfiguration]]] = {}
+        unindexed: list[tuple[int, LeafConfiguration]] = []
+        for position, config in enumerate(self.configurations):
+            constraints = config.condition.equality_constraints()
+            if field_name in constraints:
+                keyed.setdefault(constraints[field_name], []).append((position, config))
+            else:
+                unindexed.append((position, config))
+
+        self._field = field_name
+        self._unindexed = tuple(config for _, config in unindexed)
+        self._buckets = {
+            value: tuple(config for _, config in sorted(entries + unindexed))
+            for value, entries in keyed.items()
+        }
+
+    def candidates(
+        self, event: EventABC[BaseEventMessage]
+    ) -> tuple[LeafConfiguration, ...]:
+        """返回可能对该事件成立的配置，顺序与原始配置一致。"""
+        if self._field is None:
+            return self.configurations
+        value = getattr(event.event_message, self._field, None)
+        try:
+            return self._buckets.get(value, self._unindexed)
+        except TypeError:  # 不可哈希的字段值无法命中任何桶
+            return self._unindexed
 
 
 class EventConfigRepository(Protocol):
@@ -90,6 +300,52 @@ class EventConfigRepository(Protocol):
     def load_leaf_config(self, node_id: str) -> Sequence[LeafConfiguration]: ...
 
 
+@runtime_checkable
+class VersionedEventConfigRepository(EventConfigRepository, Protocol):
+    """支持热更新的配置仓库：提供单调递增的全局版本号与变更记录。"""
+
+    @property
+    def version(self) -> int: ...
+
+    def changes_since(self, version: int) -> tuple[int, frozenset[str]]:
+        """返回当前版本号，以及 ``version`` 之后行发生变化的节点。"""
+        ...
+
+
+@runtime_checkable
+class BulkEventConfigRepository(EventConfigRepository, Protocol):
+    """支持一次查询加载多个节点配置的仓库。"""
+
+    def load_many(
+        self, node_ids: Iterable[str]
+    ) -> Mapping[str, Sequence[LeafConfiguration]]: ...
+
+
+@dataclass(frozen=True)
+class LeafSnapshot:
+    """叶子某一时刻加载的配置及其索引，整体替换以保证分派看到一致的视图。"""
+
+    version: int
+    configurations: tuple[LeafConfiguration, ...]
+    index: dict[EventType, ConfigurationIndex]
+
+    @classmethod
+    def build(
+        cls, version: int, configurations: Sequence[LeafConfiguration]
+    ) -> "LeafSnapshot":
+        grouped: dict[EventType, list[LeafConfiguration]] = {}
+        for config in configurations:
+            grouped.setdefault(config.listen_event, []).append(config)
+        return cls(
+            version=version,
+            configurations=tuple(configurations),
+            index={
+                event_type: ConfigurationIndex(rows)
+                for event_type, rows in grouped.items()
+            },
+        )
+
+
 @dataclass
 class EventTransition:
     """表示一个状态机风格的、指向另一个节点（可扩展为多子节点）"""
@@ -113,11 +369,56 @@ class EventTreeNode(ABC):
         node_context = context.with_state(self.node_id)
         yield from self._handle(event, node_context)
 
+    async def handle_async(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        node_context = context.with_state(self.node_id)
+        return await self._handle_async(event, node_context)
+
+    def handle_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> list[tuple[EventOrBatch, EventContext]]:
+        node_context = context.with_state(self.node_id)
+        return self._handle_batch(batch, node_context)
+
     @abstractmethod
     def _handle(
         self, event: EventABC[BaseEventMessage], context: EventContext
     ) -> Iterable[tuple[EventABC[BaseEventMessage], EventContext]]: ...
 
+    async def _handle_async(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        """默认退化为同步实现，包含异步动作的节点需要覆盖。"""
+        return list(self._handle(event, context))
+
+    def _handle_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> list[tuple[EventOrBatch, EventContext]]:
+        """默认逐行物化后走单事件路径，支持按列处理的节点需要覆盖。"""
+        results: list[tuple[EventOrBatch, EventContext]] = []
+        for event in batch.iter_events():
+            results.extend(self._handle(event, context))
+        return results
+
+    def listen_events(self) -> set[EventType]:
+        """该节点（含子树）可能响应的事件类型，未知时返回空集合。"""
+        return set()
+
+    def iter_nodes(self) -> Iterator["EventTreeNode"]:
+        """遍历该节点及其子树中的所有节点（共享节点可能重复出现）。"""
+        yield self
+
+    def _compile_routes(
+        self,
+        event_type: EventType,
+        parent_path: tuple[str, ...],
+        guards: tuple[tuple[EventCondition, tuple[str, ...]], ...],
+        routes: list["CompiledRoute"],
+    ) -> None:
+        """把子树展开为扁平路由；未知节点类型保留为整体调用。"""
+        routes.append(CompiledRoute(guards, parent_path, node=self))
+
 
 class EventBranchNode(EventTreeNode):
     def __init__(self, node_id: str):
@@ -129,6 +430,37 @@ class EventBranchNode(EventTreeNode):
     ) -> None:
         self._transitions.setdefault(listen_event, []).append(transition)
 
+    def iter_nodes(self) -> Iterator[EventTreeNode]:
+        yield self
+        for transitions in self._transitions.values():
+            for transition in transitions:
+                yield from transition.target.iter_nodes()
+
+    def listen_events(self) -> set[EventType]:
+        events = set(self._transitions)
+        for transitions in self._transitions.values():
+            for transition in transitions:
+                events |= transition.target.listen_events()
+        return events
+
+    def _compile_routes(
+        self,
+        event_type: EventType,
+        parent_path: tuple[str, ...],
+        guards: tuple[tuple[EventCondition, tuple[str, ...]], ...],
+        routes: list[CompiledRoute],
+    ) -> None:
+        path = parent_path + (self.node_id,)
+        for transition in self._transitions.get(event_type, []):
+            transition_guards = (
+                guards
+                if transition.condition.constant_true
+                else guards + ((transition.condition, path),)
+            )
+            transition.target._compile_routes(
+                event_type, path, transition_guards, routes
+            )
+
     def _handle(
         self, event: EventABC[BaseEventMessage], context: EventContext
     ) -> Iterable[tuple[EventABC[BaseEventMessage], EventContext]]:
@@ -137,37 +469,641 @@ class EventBranchNode(EventTreeNode):
             if transition.matches(event, context):
                 yield from transition.target.handle(event, context)
 
+    async def _handle_async(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        results: list[tuple[EventABC[BaseEventMessage], EventContext]] = []
+        for transition in self._transitions.get(event.event_type, []):
+            if transition.matches(event, context):
+                results.extend(await transition.target.handle_async(event, context))
+        return results
+
+    def _handle_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> list[tuple[EventOrBatch, EventContext]]:
+        results: list[tuple[EventOrBatch, EventContext]] = []
+        for transition in self._transitions.get(batch.event_type, []):
+            selected = _select(batch, transition.condition, context)
+            if selected is not None:
+                results.extend(transition.target.handle_batch(selected, context))
+        return results
+
 
 class DynamicLeafNode(EventTreeNode):
     def __init__(self, node_id: str, repository: EventConfigRepository):
         super().__init__(node_id)
         self._repository = repository
-        self._config: Sequence[LeafConfiguration] | None = None
+        self._snapshot: LeafSnapshot | None = None
+
+    @property
+    def repository(self) -> EventConfigRepository:
+        return self._repository
+
+    @property
+    def snapshot(self) -> LeafSnapshot | None:
+        """当前生效的配置快照，尚未加载时为 ``None``。"""
+        return self._snapshot
+
+    def reload(
+        self,
+        configurations: Sequence[LeafConfiguration] | None = None,
+        *,
+        version: int | None = None,
+    ) -> LeafSnapshot:
+        """重新加载配置，构建完成后一次性替换快照。
+
+        未提供 ``configurations`` 时从仓库读取；批量预加载时由调用方传入。
+        分派路径只读取 ``_snapshot`` 引用，因此无需加锁：进行中的分派继续
+        使用旧快照，之后的事件看到新快照。
+        """
+        if version is None:
+            version = (
+                self._repository.version
+                if isinstance(self._repository, VersionedEventConfigRepository)
+                else 0
+            )
+        if configurations is None:
+            configurations = self._repository.load_leaf_config(self.node_id)
+        snapshot = LeafSnapshot.build(version, configurations)
+        self._snapshot = snapshot
+        return snapshot
 
     def _ensure_config_loaded(self) -> Sequence[LeafConfiguration]:
-        if self._config is None:
-            self._config = self._repository.load_leaf_config(self.node_id)
-        return self._config
+        return (self._snapshot or self.reload()).configurations
+
+    def _ensure_index_loaded(self) -> dict[EventType, ConfigurationIndex]:
+        """按监听的事件类型分组配置，每次加载只构建一次。"""
+        return (self._snapshot or self.reload()).index
+
+    def listen_events(self) -> set[EventType]:
+        return set(self._ensure_index_loaded())
+
+    def _compile_routes(
+        self,
+        event_type: EventType,
+        parent_path: tuple[str, ...],
+        guards: tuple[tuple[EventCondition, tuple[str, ...]], ...],
+        routes: list[CompiledRoute],
+    ) -> None:
+        index = self._ensure_index_loaded().get(event_type)
+        if index is not None:
+            routes.append(
+                CompiledRoute(guards, parent_path + (self.node_id,), index=index)
+            )
 
     def _handle(
         self, event: EventABC[BaseEventMessage], context: EventContext
     ) -> Iterable[tuple[EventABC[BaseEventMessage], EventContext]]:
-        for config in self._ensure_config_loaded():
-            if config.listen_event != event.event_type:
-                continue
+        index = self._ensure_index_loaded().get(event.event_type)
+        if index is None:
+            return
+        for config in index.candidates(event):
             if not config.condition.evaluate(event, context):
                 continue
             for action in config.actions:
                 for produced in action.produce(event, context):
                     yield produced, context
 
+    async def _handle_async(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        results: list[tuple[EventABC[BaseEventMessage], EventContext]] = []
+        index = self._ensure_index_loaded().get(event.event_type)
+        if index is None:
+            return results
+        for config in index.candidates(event):
+            if not config.condition.evaluate(event, context):
+                continue
+            for action in config.actions:
+                if isinstance(action, AsyncEventAction):
+                    produced = await action.produce(event, context)
+                else:
+                    produced = action.produce(event, context)
+                results.extend((item, context) for item in produced)
+        return results
+
+    def _handle_batch(
+        self, batch: EventBatch, context: EventContext
+    ) -> list[tuple[EventOrBatch, EventContext]]:
+        results: list[tuple[EventOrBatch, EventContext]] = []
+        index = self._ensure_index_loaded().get(batch.event_type)
+        if index is not None:
+            _run_batch(index, batch, context, results)
+        return results
+
+
+def _select(
+    batch: EventBatch, condition: EventCondition, context: EventContext
+) -> EventBatch | None:
+    """按条件掩码筛选批次，没有任何行成立时返回 ``None``。"""
+    if condition.constant_true:
+        return batch
+    mask = condition.evaluate_batch(batch, context)
+    if not any(mask):
+        return None
+    return batch.select(mask)
+
+
+def _run_batch(
+    index: ConfigurationIndex,
+    batch: EventBatch,
+    context: EventContext,
+    results: list[tuple[EventOrBatch, EventContext]],
+) -> None:
+    # 条件会被完整求值，批量路径直接遍历全部配置，不使用等值索引预筛
+    for config in index.configurations:
+        selected = _select(batch, config.condition, context)
+        if selected is None:
+            continue
+        for action in config.actions:
+            for produced in action.produce_batch(selected, context):
+                results.append((produced, context))
+
+
+@dataclass(frozen=True)
+class CompiledRoute:
+    """``EventStateTree.compile`` 产出的一条从根到叶子的扁平路径。
+
+    ``guards`` 为途经的非恒真转移条件及其所在节点的状态路径；
+    ``node`` 非空时表示无法展开的节点，以 ``state_path`` 作为父路径整体调用。
+    ``shared_guards`` 是与表中上一条路由相同（来自同一组转移）的前缀守卫数，
+    分派时这些守卫沿用上一条路由的结果，同一分支下的多个叶子只求值一次。
+    """
+
+    guards: tuple[tuple[EventCondition, tuple[str, ...]], ...]
+    state_path: tuple[str, ...]
+    index: ConfigurationIndex | None = None
+    node: EventTreeNode | None = None
+    shared_guards: int = 0
+
+
+def _share_guard_prefixes(routes: list[CompiledRoute]) -> list[CompiledRoute]:
+    """为每条路由记录与上一条路由共有的守卫前缀长度。"""
+    shared_routes: list[CompiledRoute] = []
+    previous: tuple[tuple[EventCondition, tuple[str, ...]], ...] = ()
+    for route in routes:
+        shared = 0
+        for mine, theirs in zip(route.guards, previous):
+            # 展开时同一转移的守卫项是同一个元组对象
+            if mine is not theirs:
+                break
+            shared += 1
+        shared_routes.append(replace(route, shared_guards=shared))
+        previous = route.guards
+    return shared_routes
+
+
+def _instrument_route(
+    route: CompiledRoute, instrumentation: Instrumentation, event_type: EventType
+) -> CompiledRoute:
+    """把路由中的转移条件、叶子条件与动作替换为带计时的包装。"""
+    guards = tuple(
+        (
+            _TimedCondition(
+                condition, instrumentation, f"{path[-1]}: {describe(condition)}"
+            ),
+            path,
+        )
+        for condition, path in route.guards
+    )
+    index = route.index
+    if index is not None:
+        leaf_id = route.state_path[-1]
+        configurations = []
+        for row, config in enumerate(index.configurations):
+            prefix = f"{leaf_id}/{event_type.value}#{row}"
+            configurations.append(
+                LeafConfiguration(
+                    listen_event=config.listen_event,
+                    condition=_TimedCondition(
+                        config.condition,
+                        instrumentation,
+                        f"{prefix}: {describe(config.condition)}",
+                    ),
+                    actions=tuple(
+                        _TimedAction(
+                            action,
+                            instrumentation,
+                            f"{prefix}.{position}: {describe(action)}",
+                        )
+                        for position, action in enumerate(config.actions)
+                    ),
+                    source=config.source,
+                )
+            )
+        index = ConfigurationIndex(configurations)
+    return replace(route, guards=guards, index=index)
+
+
+def _load_leaves(
+    repository: EventConfigRepository, leaves: Sequence[DynamicLeafNode]
+) -> None:
+    """为同一仓库的一组叶子加载配置，尽量合并为一次批量查询。"""
+    if not leaves:
+        return
+    if not isinstance(repository, BulkEventConfigRepository):
+        for leaf in leaves:
+            leaf.reload()
+        return
+    version = (
+        repository.version
+        if isinstance(repository, VersionedEventConfigRepository)
+        else 0
+    )
+    rows = repository.load_many({leaf.node_id for leaf in leaves})
+    for leaf in leaves:
+        leaf.reload(rows.get(leaf.node_id, ()), version=version)
+
+
+class _RepositoryWatch:
+    """记录某个可热更新仓库的已同步版本及其对应的叶子。"""
+
+    __slots__ = ("repository", "seen_version", "leaves")
+
+    def __init__(self, repository: VersionedEventConfigRepository, seen_version: int):
+        self.repository = repository
+        self.seen_version = seen_version
+        self.leaves: dict[str, list[DynamicLeafNode]] = {}
+
 
 class EventStateTree:
     def __init__(self, root: EventTreeNode):
         self._root = root
+        self._compiled: dict[EventType, tuple[CompiledRoute, ...]] | None = None
+        self._watches: list[_RepositoryWatch] | None = None
+        self._refresh_lock = threading.Lock()
+        add_instrumentation_listener(self)
+        if get_instrumentation() is not None:
+            self._instrumentation_changed()
+
+    def compile(self) -> None:
+        """把树展开为按事件类型索引的扁平分派表。
+
+        之后的 ``dispatch`` 只需一次字典查找，再依次检查必要的转移条件与
+        叶子条件，不再逐层构造上下文。树结构变化后需重新调用；叶子配置的
+        热更新由 ``refresh`` 负责重新编译。
+        """
+        self.preload()
+        self._compiled = self._build_table()
+        self._watch_repositories()
+
+    def preload(self) -> None:
+        """加载所有尚未加载的叶子；支持 ``load_many`` 的仓库只查询一次。"""
+        repositories: dict[int, EventConfigRepository] = {}
+        pending: dict[int, list[DynamicLeafNode]] = {}
+        for leaf in self._iter_leaves():
+            if leaf.snapshot is None:
+                repositories[id(leaf.repository)] = leaf.repository
+                pending.setdefault(id(leaf.repository), []).append(leaf)
+        for key, leaves in pending.items():
+            _load_leaves(repositories[key], leaves)
+
+    def _iter_leaves(self) -> Iterator[DynamicLeafNode]:
+        seen: set[int] = set()
+        for node in self._root.iter_nodes():
+            if id(node) in seen or not isinstance(node, DynamicLeafNode):
+                continue
+            seen.add(id(node))
+            yield node
+
+    def _build_table(self) -> dict[EventType, tuple[CompiledRoute, ...]]:
+        instrumentation = get_instrumentation()
+        return {
+            event_type: self._build_routes(event_type, instrumentation)
+            for event_type in self._root.listen_events()
+        }
+
+    def _rebuild_routes(
+        self,
+        compiled: dict[EventType, tuple[CompiledRoute, ...]],
+        event_types: set[EventType],
+    ) -> dict[EventType, tuple[CompiledRoute, ...]]:
+        """复制分派表，只重新展开给定事件类型的路由，其余路由原样沿用。"""
+        instrumentation = get_instrumentation()
+        listened = self._root.listen_events()
+        table = dict(compiled)
+        for event_type in event_types:
+            if event_type in listened:
+                table[event_type] = self._build_routes(event_type, instrumentation)
+            else:
+                table.pop(event_type, None)
+        return table
+
+    def _build_routes(
+        self, event_type: EventType, instrumentation: Instrumentation | None
+    ) -> tuple[CompiledRoute, ...]:
+        routes: list[CompiledRoute] = []
+        self._root._compile_routes(event_type, (), (), routes)
+        # 先按原始守卫计算共享前缀，计时包装会为每条路由生成新的守卫对象
+        routes = _share_guard_prefixes(routes)
+        if instrumentation is not None:
+            routes = [
+                _instrument_route(route, instrumentation, event_type)
+                for route in routes
+            ]
+        return tuple(routes)
+
+    def _instrumentation_changed(self) -> None:
+        """计时开关变化时切换节点计时并重建分派表。
+
+        节点计时通过实例属性遮蔽 ``_run_route`` / ``_dispatch_root`` 实现，
+        关闭后删除实例属性即恢复原方法，分派路径不需要任何判断。
+        """
+        instrumentation = get_instrumentation()
+        if instrumentation is None:
+            self.__dict__.pop("_run_route", None)
+            self.__dict__.pop("_dispatch_root", None)
+        else:
+            self._run_route = self._timed_run_route(instrumentation)  # type: ignore[method-assign]
+            self._dispatch_root = self._timed_dispatch_root(instrumentation)  # type: ignore[method-assign]
+        with self._refresh_lock:
+            if self._compiled is not None:
+                self._compiled = self._build_table()
+
+    def _timed_run_route(self, instrumentation: Instrumentation) -> Callable[..., None]:
+        run_route = EventStateTree._run_route.__get__(self)
+        record = instrumentation.record
+        clock = instrumentation.clock
+
+        def timed(
+            route: CompiledRoute,
+            event: EventABC[BaseEventMessage],
+            base_path: tuple[str, ...],
+            attributes: dict[str, Any],
+            results: list[tuple[EventABC[BaseEventMessage], EventContext]],
+        ) -> None:
+            start = clock()
+            try:
+                run_route(route, event, base_path, attributes, results)
+            finally:
+                node_id = (
+                    route.node.node_id
+                    if route.node is not None
+                    else route.state_path[-1]
+                )
+                record("node", node_id, clock() - start)
+
+        return timed
+
+    def _timed_dispatch_root(
+        self, instrumentation: Instrumentation
+    ) -> Callable[..., list[tuple[EventABC[BaseEventMessage], EventContext]]]:
+        # 未编译的树只能整体计入根节点
+        return instrumentation.timed(
+            "node", self._root.node_id, EventStateTree._dispatch_root.__get__(self)
+        )
+
+    def refresh(self) -> frozenset[str]:
+        """拉取仓库变更，只重新加载行发生变化的叶子。
+
+        未发生变化时只比较各仓库的版本号；有变化时在锁内重新加载受影响的
+        叶子，并（如已编译）只重新展开这些叶子在重载前后监听的事件类型的
+        路由，随后以单次引用赋值生效。
+        返回被重新加载的节点 ID。
+        """
+        watches = self._watches
+        if watches is None:
+            watches = self._watch_repositories()
+        for watch in watches:
+            if watch.repository.version != watch.seen_version:
+                break
+        else:
+            return frozenset()
+
+        reloaded: set[str] = set()
+        affected: set[EventType] = set()
+        with self._refresh_lock:
+            for watch in watches:
+                version, changed = watch.repository.changes_since(watch.seen_version)
+                # 尚未加载的叶子会在首次使用时读到最新配置
+                stale = [
+                    leaf
+                    for node_id in changed
+                    for leaf in watch.leaves.get(node_id, ())
+                    if leaf.snapshot is not None
+                ]
+                for leaf in stale:
+                    affected.update(leaf.snapshot.index)
+                _load_leaves(watch.repository, stale)
+                for leaf in stale:
+                    affected.update(leaf.snapshot.index)
+                reloaded.update(leaf.node_id for leaf in stale)
+                watch.seen_version = version
+            if affected and self._compiled is not None:
+                self._compiled = self._rebuild_routes(self._compiled, affected)
+        return frozenset(reloaded)
+
+    def _watch_repositories(self) -> list[_RepositoryWatch]:
+        """收集树中可热更新的叶子，按仓库分组。
+
+        已同步版本取已加载叶子快照中最旧的版本，保证加载之后的变更都能被
+        下一次 ``refresh`` 发现；重复收集时保留此前的同步进度。
+        """
+        previous = {id(watch.repository): watch for watch in self._watches or ()}
+        watches: dict[int, _RepositoryWatch] = {}
+        for node in self._iter_leaves():
+            repository = node.repository
+            if not isinstance(repository, VersionedEventConfigRepository):
+                continue
+            watch = watches.get(id(repository))
+            if watch is None:
+                prior = previous.get(id(repository))
+                watch = watches[id(repository)] = _RepositoryWatch(
+                    repository,
+                    prior.seen_version if prior else repository.version,
+                )
+            watch.leaves.setdefault(node.node_id, []).append(node)
+            if node.snapshot is not None:
+                watch.seen_version = min(watch.seen_version, node.snapshot.version)
+        self._watches = list(watches.values())
+        return self._watches
 
     def dispatch(
         self, event: EventABC[BaseEventMessage], context: EventContext | None = None
     ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
         ctx = context or EventContext()
-        return list(self._root.handle(event, ctx))
+        compiled = self._compiled
+        if compiled is not None:
+            routes = compiled.get(event.event_type)
+            if routes is not None:
+                return self._dispatch_compiled(routes, event, ctx)
+        return self._dispatch_root(event, ctx)
+
+    def _dispatch_root(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        return list(self._root.handle(event, context))
+
+    def _dispatch_compiled(
+        self,
+        routes: tuple[CompiledRoute, ...],
+        event: EventABC[BaseEventMessage],
+        context: EventContext,
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        results: list[tuple[EventABC[BaseEventMessage], EventContext]] = []
+        base_path = context.state_path
+        attributes = context.attributes
+        # 上一条路由开头连续成立的守卫数，以及紧随其后的守卫是否不成立
+        passed = 0
+        blocked = False
+
+        for route in routes:
+            shared = route.shared_guards
+            if shared > passed:
+                # 共享前缀中有守卫已不成立（blocked 必为真），整条路由跳过
+                continue
+            passed = shared
+            blocked = False
+            guards = route.guards
+            for position in range(shared, len(guards)):
+                condition, path = guards[position]
+                # 路径已在编译期确定，跳过 pydantic 校验直接构造上下文
+                guard_context = EventContext.model_construct(
+                    state_path=base_path + path, attributes=attributes
+                )
+                if not condition.evaluate(event, guard_context):
+                    blocked = True
+                    break
+                passed += 1
+            if not blocked:
+                self._run_route(route, event, base_path, attributes, results)
+
+        return results
+
+    def _run_route(
+        self,
+        route: CompiledRoute,
+        event: EventABC[BaseEventMessage],
+        base_path: tuple[str, ...],
+        attributes: dict[str, Any],
+        results: list[tuple[EventABC[BaseEventMessage], EventContext]],
+    ) -> None:
+        route_context = EventContext.model_construct(
+            state_path=base_path + route.state_path, attributes=attributes
+        )
+        if route.node is not None:
+            results.extend(route.node.handle(event, route_context))
+            return
+
+        assert route.index is not None
+        for config in route.index.candidates(event):
+            if not config.condition.evaluate(event, route_context):
+                continue
+            for action in config.actions:
+                for produced in action.produce(event, route_context):
+                    results.append((produced, route_context))
+
+    def iter_dispatch(
+        self, event: EventABC[BaseEventMessage], context: EventContext | None = None
+    ) -> Iterator[tuple[EventABC[BaseEventMessage], EventContext]]:
+        """惰性版本的 ``dispatch``：条件与动作在取下一个产出时才执行。
+
+        调用方不再读取时剩余的路由不会被求值。启用计时时节点整体耗时不计入
+        （条件与动作的计时照常记录）。
+        """
+        ctx = context or EventContext()
+        compiled = self._compiled
+        if compiled is not None:
+            routes = compiled.get(event.event_type)
+            if routes is not None:
+                return self._iter_compiled(routes, event, ctx)
+        return iter(self._root.handle(event, ctx))
+
+    def _iter_compiled(
+        self,
+        routes: tuple[CompiledRoute, ...],
+        event: EventABC[BaseEventMessage],
+        context: EventContext,
+    ) -> Iterator[tuple[EventABC[BaseEventMessage], EventContext]]:
+        base_path = context.state_path
+        attributes = context.attributes
+        # 共享守卫前缀的处理与 _dispatch_compiled 相同
+        passed = 0
+        blocked = False
+        for route in routes:
+            shared = route.shared_guards
+            if shared > passed:
+                continue
+            passed = shared
+            blocked = False
+            guards = route.guards
+            for position in range(shared, len(guards)):
+                condition, path = guards[position]
+                guard_context = EventContext.model_construct(
+                    state_path=base_path + path, attributes=attributes
+                )
+                if not condition.evaluate(event, guard_context):
+                    blocked = True
+                    break
+                passed += 1
+            if not blocked:
+                route_context = EventContext.model_construct(
+                    state_path=base_path + route.state_path, attributes=attributes
+                )
+                if route.node is not None:
+                    yield from route.node.handle(event, route_context)
+                    continue
+                assert route.index is not None
+                for config in route.index.candidates(event):
+                    if not config.condition.evaluate(event, route_context):
+                        continue
+                    for action in config.actions:
+                        for produced in action.produce(event, route_context):
+                            yield produced, route_context
+
+    def dispatch_batch(
+        self, batch: EventBatch, context: EventContext | None = None
+    ) -> list[tuple[EventOrBatch, EventContext]]:
+        """批量版本的 ``dispatch``：条件按列求出掩码，动作按批次产出。
+
+        产出可以是整批事件（``EventBatch``）也可以是单个事件，取决于动作是否
+        提供了批量实现。
+        """
+        ctx = context or EventContext()
+        if not len(batch):
+            return []
+        compiled = self._compiled
+        routes = compiled.get(batch.event_type) if compiled is not None else None
+        if routes is None:
+            return self._root.handle_batch(batch, ctx)
+
+        results: list[tuple[EventOrBatch, EventContext]] = []
+        base_path = ctx.state_path
+        attributes = ctx.attributes
+        # selections[k] 为上一条路由经过前 k 个守卫筛选后的批次；最后一个守卫
+        # 筛空时不再追加，因此共享前缀超出其长度的路由可以直接跳过
+        selections: list[EventBatch] = [batch]
+        for route in routes:
+            shared = route.shared_guards
+            if shared >= len(selections):
+                continue
+            del selections[shared + 1 :]
+            selected: EventBatch | None = selections[shared]
+            guards = route.guards
+            for position in range(shared, len(guards)):
+                condition, path = guards[position]
+                guard_context = EventContext.model_construct(
+                    state_path=base_path + path, attributes=attributes
+                )
+                selected = _select(selections[-1], condition, guard_context)
+                if selected is None:
+                    break
+                selections.append(selected)
+            if selected is None:
+                continue
+            route_context = EventContext.model_construct(
+                state_path=base_path + route.state_path, attributes=attributes
+            )
+            if route.node is not None:
+                results.extend(route.node.handle_batch(selected, route_context))
+                continue
+            assert route.index is not None
+            _run_batch(route.index, selected, route_context, results)
+        return results
+
+    async def dispatch_async(
+        self, event: EventABC[BaseEventMessage], context: EventContext | None = None
+    ) -> list[tuple[EventABC[BaseEventMessage], EventContext]]:
+        """与 ``dispatch`` 相同，但会等待叶子中的 ``AsyncEventAction``。"""
+        ctx = context or EventContext()
+        return await self._root.handle_async(event, ctx)
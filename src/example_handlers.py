@@ -4,6 +4,7 @@ from typing import Iterable
 
 from src.event_handlers.base import EventHandler
 from src.event_handlers.decorator import auto_register, event_handler
+from src.event_handlers.log_sink import log
 from src.event_types import EventTypes, SkillEventTypes
 from src.events import (
     BaseEventMessage,
@@ -23,8 +24,12 @@ def log_player_creation(
 ) -> Iterable[EventABC[BaseEventMessage]]:
     """记录玩家创建事件的处理器。"""
     message = event.event_message
-    print(
-        f"[Player Created] 玩家 {message.player_id} ({message.player_name}) 已创建，等级: {message.initial_level}"
+    log(
+        "Player Created",
+        "玩家 {} ({}) 已创建，等级: {}",
+        message.player_id,
+        message.player_name,
+        message.initial_level,
     )
     return []
 
@@ -37,8 +42,14 @@ def log_skill_damage(
     message = event.event_message
     critical_text = " (暴击!)" if message.is_critical else ""
     extra_text = " (额外伤害)" if message.is_extra_damage else ""
-    print(
-        f"[Skill Hit] 技能 {message.skill_id} 对玩家 {message.target_id} 造成 {message.damage} 点伤害{critical_text}{extra_text}"
+    log(
+        "Skill Hit",
+        "技能 {} 对玩家 {} 造成 {} 点伤害{}{}",
+        message.skill_id,
+        message.target_id,
+        message.damage,
+        critical_text,
+        extra_text,
     )
     return []
 
@@ -48,6 +59,8 @@ def log_skill_damage(
 class PlayerStateEventHandler(EventHandler[PlayerStateChangedMessage]):
     """玩家状态变更事件处理器。"""
 
+    type_exact = True
+
     def supports(self, event: EventABC[PlayerStateChangedMessage]) -> bool:
         return event.event_type == EventTypes.PLAYER_STATE_CHANGED
 
@@ -56,8 +69,12 @@ class PlayerStateEventHandler(EventHandler[PlayerStateChangedMessage]):
     ) -> Iterable[EventABC[BaseEventMessage]]:
         message = event.event_message
         trail_text = f" (路径: {message.trail})" if message.trail else ""
-        print(
-            f"[State Change] 玩家 {message.player_id} 状态变更为: {message.state}{trail_text}"
+        log(
+            "State Change",
+            "玩家 {} 状态变更为: {}{}",
+            message.player_id,
+            message.state,
+            trail_text,
         )
         return []
 
@@ -66,6 +83,8 @@ class PlayerStateEventHandler(EventHandler[PlayerStateChangedMessage]):
 class PlayerHealthEventHandler(EventHandler[PlayerHealthChangedMessage]):
     """玩家生命值变更事件处理器。"""
 
+    type_exact = True
+
     def supports(self, event: EventABC[PlayerHealthChangedMessage]) -> bool:
         return event.event_type == EventTypes.PLAYER_HEALTH_CHANGED
 
@@ -74,7 +93,11 @@ class PlayerHealthEventHandler(EventHandler[PlayerHealthChangedMessage]):
     ) -> Iterable[EventABC[BaseEventMessage]]:
         message = event.event_message
         source_text = f" (来源: {message.source_event})" if message.source_event else ""
-        print(
-            f"[Health Change] 玩家 {message.player_id} 生命值变更为: {message.value}{source_text}"
+        log(
+            "Health Change",
+            "玩家 {} 生命值变更为: {}{}",
+            message.player_id,
+            message.value,
+            source_text,
         )
         return []
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+import warnings
+from typing import Iterable
+
+from src.event_handlers.base import AsyncEventHandler, EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.async_dispatcher import AsyncEventDispatcher
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+)
+
+
+class _Recorder(EventHandler[BaseEventMessage]):
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        self.seen.append(event.event_message.player_id)
+        return ()
+
+
+class _AsyncRecorder(AsyncEventHandler[BaseEventMessage]):
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return True
+
+    async def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        await asyncio.sleep(0)
+        self.seen.append(event.event_message.player_id)
+        return ()
+
+
+def _health(player_id: str) -> Event[PlayerHealthChangedMessage]:
+    return Event(
+        EventTypes.PLAYER_HEALTH_CHANGED,
+        PlayerHealthChangedMessage(player_id=player_id, value=10),
+    )
+
+
+class AsyncHandlersInSyncDispatcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = EventStateTree(EventBranchNode("root"))
+        self.tree.compile()
+        self.sync_handler = _Recorder()
+        self.async_handler = _AsyncRecorder()
+        self.registry = EventHandlerRegistry()
+        self.registry.register(EventTypes.PLAYER_HEALTH_CHANGED, self.async_handler)
+        self.registry.register(EventTypes.PLAYER_HEALTH_CHANGED, self.sync_handler)
+
+    def test_sync_dispatch_skips_async_handlers(self) -> None:
+        dispatcher = EventDispatcher(self.tree, self.registry)
+        with warnings.catch_warnings():
+            # 协程被创建却未等待时会产生 RuntimeWarning
+            warnings.simplefilter("error", RuntimeWarning)
+            dispatcher.emit(_health("a"))
+            dispatcher.emit_many([_health("b"), _health("c")])
+            list(dispatcher.iter_emit(_health("d")))
+        self.assertEqual(self.sync_handler.seen, ["a", "b", "c", "d"])
+        self.assertEqual(self.async_handler.seen, [])
+
+    def test_async_dispatch_runs_both(self) -> None:
+        dispatcher = AsyncEventDispatcher(self.tree, self.registry)
+        asyncio.run(dispatcher.emit(_health("a")))
+        self.assertEqual(self.sync_handler.seen, ["a"])
+        self.assertEqual(self.async_handler.seen, ["a"])
+
+
+class _SlowAsync(AsyncEventHandler[BaseEventMessage]):
+    """记录处理时同时存在的任务数。"""
+
+    type_exact = True
+
+    def __init__(self, peaks: list[int]) -> None:
+        self.peaks = peaks
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return True
+
+    async def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        # 减去运行 emit 的主任务
+        self.peaks.append(len(asyncio.all_tasks()) - 1)
+        await asyncio.sleep(0.001)
+        return ()
+
+
+class AsyncDispatcherLimitTest(unittest.TestCase):
+    HANDLERS = 8
+
+    def setUp(self) -> None:
+        tree = EventStateTree(EventBranchNode("root"))
+        tree.compile()
+        self.peaks: list[int] = []
+        registry = EventHandlerRegistry()
+        for _ in range(self.HANDLERS):
+            registry.register(EventTypes.PLAYER_HEALTH_CHANGED, _SlowAsync(self.peaks))
+        self.registry = registry
+        self.tree = tree
+
+    def test_max_in_flight_bounds_created_tasks(self) -> None:
+        dispatcher = AsyncEventDispatcher(self.tree, self.registry, max_in_flight=2)
+        asyncio.run(dispatcher.emit(_health("a")))
+        self.assertEqual(len(self.peaks), self.HANDLERS)
+        self.assertLessEqual(max(self.peaks), 2)
+
+    def test_dispatcher_survives_a_new_event_loop(self) -> None:
+        dispatcher = AsyncEventDispatcher(self.tree, self.registry, max_in_flight=1)
+        for player_id in ("a", "b"):
+            # 名额争用会让信号量绑定到当前循环
+            asyncio.run(dispatcher.emit(_health(player_id)))
+        self.assertEqual(len(self.peaks), 2 * self.HANDLERS)
+
+
+if __name__ == "__main__":
+    unittest.main()
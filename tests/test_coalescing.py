@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import unittest
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.coalescing import EventCoalescer, by_field
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.scheduling import SchedulingMode
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+    SkillHitMessage,
+)
+
+
+class _ApplyDamage(EventHandler[SkillHitMessage]):
+    type_exact = True
+
+    def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        message = event.event_message
+        return [
+            Event(
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                PlayerHealthChangedMessage(
+                    player_id=message.target_id, value=100 - message.damage
+                ),
+            )
+        ]
+
+
+class _Recorder(EventHandler[PlayerHealthChangedMessage]):
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.seen: list[tuple[str, int]] = []
+
+    def supports(self, event: EventABC[PlayerHealthChangedMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[PlayerHealthChangedMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        message = event.event_message
+        self.seen.append((message.player_id, message.value))
+        return ()
+
+
+def _hit(target: str, damage: int) -> Event[SkillHitMessage]:
+    return Event(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage(skill_id="nova", target_id=target, damage=damage),
+    )
+
+
+class DerivedCoalescingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tree = EventStateTree(EventBranchNode("root"))
+        self.tree.compile()
+        self.recorder = _Recorder()
+        self.registry = EventHandlerRegistry()
+        self.registry.register(SkillEventTypes.ON_HIT, _ApplyDamage())
+        self.registry.register(EventTypes.PLAYER_HEALTH_CHANGED, self.recorder)
+        self.coalescer = EventCoalescer()
+        self.coalescer.register(EventTypes.PLAYER_HEALTH_CHANGED, by_field("player_id"))
+
+    def _emit(self, mode: SchedulingMode) -> list[list[EventABC[BaseEventMessage]]]:
+        dispatcher = EventDispatcher(
+            self.tree, self.registry, scheduling=mode, coalescing=self.coalescer
+        )
+        return dispatcher.emit_many([_hit("a", 1), _hit("b", 2), _hit("a", 3)])
+
+    def test_derived_events_merge_at_last_position(self) -> None:
+        results = self._emit(SchedulingMode.BFS)
+        # a 的两次生命值变化合并为一次，排在 b 之后并归入最后一次命中
+        self.assertEqual(self.recorder.seen, [("b", 98), ("a", 97)])
+        self.assertEqual([len(processed) for processed in results], [1, 2, 2])
+        self.assertEqual(
+            self.coalescer.coalesced_counts[EventTypes.PLAYER_HEALTH_CHANGED.value], 1
+        )
+
+    def test_depth_first_has_nothing_waiting_to_merge(self) -> None:
+        # 深度优先时每个生命值事件在下一次命中之前就已处理
+        self._emit(SchedulingMode.DFS)
+        self.assertEqual(self.recorder.seen, [("a", 99), ("b", 98), ("a", 97)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import unittest
+
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    BinaryEventCodec,
+    CodecError,
+    CompactMessage,
+    Event,
+    EventABC,
+    PlayerHealthChangedMessage,
+    PlayerStateChangedMessage,
+    SkillEndMessage,
+    SkillHitMessage,
+    SystemTickMessage,
+)
+
+
+def _events() -> list[EventABC[BaseEventMessage]]:
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(
+                player_id="玩家-1", value=-5, source_event="skill.on_hit"
+            ),
+        ),
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(event_id=42, player_id="p", value=0),
+        ),
+        Event(
+            EventTypes.PLAYER_STATE_CHANGED,
+            PlayerStateChangedMessage(player_id="p", state="dead", trail=["a", ""]),
+        ),
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(skill_id="nova", target_id="p", damage=7, is_critical=True),
+        ),
+        Event(SkillEventTypes.ON_END, SkillEndMessage(skill_id="nova")),
+        Event(EventTypes.SYSTEM_TICK, SystemTickMessage(tick_count=3, timestamp=1.5)),
+    ]
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.codec = BinaryEventCodec()
+
+    def assertSameEvents(
+        self,
+        decoded: list[EventABC[BaseEventMessage]],
+        expected: list[EventABC[BaseEventMessage]],
+    ) -> None:
+        self.assertEqual(
+            [(event.event_type, event.event_message.model_dump()) for event in decoded],
+            [
+                (event.event_type, event.event_message.model_dump())
+                for event in expected
+            ],
+        )
+
+    def test_single_frames(self) -> None:
+        for event in _events():
+            with self.subTest(message=type(event.event_message).__name__):
+                decoded = self.codec.decode(self.codec.encode(event))
+                self.assertIs(type(decoded.event_message), type(event.event_message))
+                self.assertSameEvents([decoded], [event])
+
+    def test_batches_from_a_memoryview(self) -> None:
+        events = _events()
+        data = bytearray(self.codec.encode_many(events))
+        self.assertSameEvents(self.codec.decode_many(memoryview(data)), events)
+
+    def test_compact_messages(self) -> None:
+        events = [
+            Event(
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                PlayerHealthChangedMessage.compact(player_id="p", value=3),
+            )
+        ]
+        data = self.codec.encode_many(events)
+        self.assertSameEvents(self.codec.decode_many(data), events)
+        decoded = BinaryEventCodec(compact=True).decode_many(data)
+        self.assertIsInstance(decoded[0].event_message, CompactMessage)
+        self.assertSameEvents(decoded, events)
+
+
+class MalformedInputTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.codec = BinaryEventCodec()
+        self.frame = self.codec.encode(_events()[0])
+
+    def test_truncated_frames(self) -> None:
+        for length in (0, 3, 10, len(self.frame) - 1):
+            with self.subTest(length=length), self.assertRaises(CodecError):
+                self.codec.decode(self.frame[:length])
+
+    def test_truncated_batches(self) -> None:
+        data = self.codec.encode_many(_events())
+        for length in (2, len(data) - 1):
+            with self.subTest(length=length), self.assertRaises(CodecError):
+                self.codec.decode_many(data[:length])
+
+    def test_corrupt_headers(self) -> None:
+        unknown_schema = bytes([self.frame[0] ^ 0xFF]) + self.frame[1:]
+        unknown_type = self.frame[:2] + bytes([self.frame[2] ^ 0xFF]) + self.frame[3:]
+        for data in (unknown_schema, unknown_type):
+            with self.assertRaises(CodecError):
+                self.codec.decode(data)
+        with self.assertRaises(CodecError):
+            self.codec.decode_many(b"XXXX" + bytes(4))
+
+    def test_out_of_range_integers_raise_codec_error(self) -> None:
+        event = Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(player_id="p", value=2**63),
+        )
+        with self.assertRaises(CodecError):
+            self.codec.encode(event)
+        out = bytearray()
+        with self.assertRaises(CodecError):
+            self.codec.encode_into(event, out)
+        self.assertEqual(out, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import copy
+import pickle
+import unittest
+
+from src.events import (
+    BaseEventMessage,
+    CompactMessage,
+    Event,
+    EventContext,
+    IsInstance,
+    PlayerHealthChangedMessage,
+    PlayerStateChangedMessage,
+    message_model,
+)
+from src.event_types import EventTypes
+
+
+class CompactMessageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.message = PlayerHealthChangedMessage.compact(player_id="p1", value=5)
+
+    def test_is_not_a_pydantic_model(self) -> None:
+        self.assertIsInstance(self.message, CompactMessage)
+        self.assertNotIsInstance(self.message, PlayerHealthChangedMessage)
+        self.assertNotIsInstance(self.message, BaseEventMessage)
+        self.assertIs(message_model(self.message), PlayerHealthChangedMessage)
+        self.assertFalse(hasattr(self.message, "__dict__"))
+        self.assertFalse(hasattr(self.message, "model_dump_json"))
+
+    def test_to_model_validates(self) -> None:
+        model = self.message.to_model()
+        self.assertIs(type(model), PlayerHealthChangedMessage)
+        self.assertEqual(model.model_dump(), self.message.model_dump())
+        self.assertIn('"value":5', model.model_dump_json())
+
+        invalid = PlayerHealthChangedMessage.compact(player_id="p1", value="x")
+        with self.assertRaises(ValueError):
+            invalid.to_model()
+
+    def test_model_copy_keeps_the_compact_type(self) -> None:
+        updated = self.message.model_copy(update={"value": 7})
+        self.assertIs(type(updated), type(self.message))
+        self.assertEqual((updated.value, self.message.value), (7, 5))
+        self.assertEqual(updated.event_id, self.message.event_id)
+
+    def test_mutable_defaults_are_not_shared(self) -> None:
+        first = PlayerStateChangedMessage.compact(player_id="p1", state="dead")
+        second = PlayerStateChangedMessage.compact(player_id="p2", state="dead")
+        first.trail.append("root")
+        self.assertEqual(second.trail, [])
+
+    def test_pickle_and_deepcopy_round_trip(self) -> None:
+        self.assertEqual(pickle.loads(pickle.dumps(self.message)), self.message)
+        self.assertEqual(copy.deepcopy(self.message), self.message)
+
+    def test_is_instance_condition_uses_the_model(self) -> None:
+        event = Event(EventTypes.PLAYER_HEALTH_CHANGED, self.message)
+        context = EventContext()
+        self.assertTrue(
+            IsInstance(PlayerHealthChangedMessage).compile()(event, context)
+        )
+        self.assertTrue(IsInstance(BaseEventMessage).compile()(event, context))
+        self.assertFalse(
+            IsInstance(PlayerStateChangedMessage).compile()(event, context)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
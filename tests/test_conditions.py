@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import unittest
+
+from src.event_types import SkillEventTypes
+from src.events import (
+    Event,
+    EventBatch,
+    EventContext,
+    MessageField,
+    SkillHitMessage,
+)
+from src.events.conditions import DeclarativeCondition
+
+
+def _hits() -> list[Event[SkillHitMessage]]:
+    return [
+        Event(
+            SkillEventTypes.ON_HIT,
+            SkillHitMessage(skill_id="fireball", target_id=f"p{index}", damage=index),
+        )
+        for index in range(3)
+    ]
+
+
+class MissingFieldParityTest(unittest.TestCase):
+    """缺失字段在单事件与批量求值路径上的结果必须一致。"""
+
+    def assert_parity(self, condition: DeclarativeCondition, expected: bool) -> None:
+        events = _hits()
+        context = EventContext()
+        per_event = [condition.evaluate(event, context) for event in events]
+        batched = list(
+            condition.evaluate_batch(EventBatch.from_events(events), context)
+        )
+        self.assertEqual(per_event, [expected] * len(events))
+        self.assertEqual(batched, per_event)
+
+    def test_not_equal_missing_field(self) -> None:
+        self.assert_parity(MessageField("player_id") != "p1", True)
+
+    def test_other_operators_missing_field(self) -> None:
+        self.assert_parity(MessageField("player_id") == "p1", False)
+        self.assert_parity(MessageField("player_id") < 5, False)
+        self.assert_parity(MessageField("player_id") >= 5, False)
+
+    def test_both_sides_missing(self) -> None:
+        self.assert_parity(MessageField("player_id") != MessageField("value"), True)
+        self.assert_parity(MessageField("player_id") == MessageField("value"), False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.limits import (
+    DispatchLimitExceeded,
+    DispatchLimits,
+    EventSpill,
+    OverflowPolicy,
+)
+from src.event_types import EventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+)
+
+ROOTS = 5
+MAX_QUEUE = 2
+
+
+def _events() -> list[EventABC[BaseEventMessage]]:
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(player_id=f"player-{index}", value=index),
+        )
+        for index in range(ROOTS)
+    ]
+
+
+def _dispatcher(limits: DispatchLimits) -> EventDispatcher:
+    tree = EventStateTree(EventBranchNode("root"))
+    tree.compile()
+    return EventDispatcher(tree, EventHandlerRegistry(), limits=limits)
+
+
+class OverflowPolicyTest(unittest.TestCase):
+    """根事件同样经过限额检查：一次发送超过 ``max_queue`` 个根事件即可触发。"""
+
+    def test_reject_drops_new_events(self) -> None:
+        dispatcher = _dispatcher(
+            DispatchLimits(max_queue=MAX_QUEUE, policy=OverflowPolicy.REJECT)
+        )
+        events = _events()
+        results = dispatcher.emit_many(events)
+        self.assertEqual(results, [[events[0]], [events[1]], [], [], []])
+        self.assertEqual(dispatcher.overflow_counts["queue"], ROOTS - MAX_QUEUE)
+
+    def test_drop_oldest_evicts_the_queue_head(self) -> None:
+        dispatcher = _dispatcher(
+            DispatchLimits(max_queue=MAX_QUEUE, policy=OverflowPolicy.DROP_OLDEST)
+        )
+        events = _events()
+        results = dispatcher.emit_many(events)
+        self.assertEqual(results, [[], [], [], [events[3]], [events[4]]])
+        self.assertEqual(dispatcher.overflow_counts["queue"], ROOTS - MAX_QUEUE)
+
+    def test_spill_writes_events_for_later_re_emission(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        spill = EventSpill(os.path.join(directory.name, "overflow.spill"))
+        dispatcher = _dispatcher(
+            DispatchLimits(
+                max_queue=MAX_QUEUE, policy=OverflowPolicy.SPILL, spill=spill
+            )
+        )
+        events = _events()
+        results = dispatcher.emit_many(events)
+        self.assertEqual(results, [[events[0]], [events[1]], [], [], []])
+        self.assertEqual(len(spill), ROOTS - MAX_QUEUE)
+
+        records = spill.drain()
+        self.assertEqual(len(spill), 0)
+        self.assertFalse(os.path.exists(spill.path))
+        self.assertEqual(
+            [(item.event_message, depth) for item, _, depth in records],
+            [(event.event_message, 0) for event in events[MAX_QUEUE:]],
+        )
+        self.assertEqual(spill.drain(), [])
+
+    def test_raise_interrupts_the_dispatch(self) -> None:
+        dispatcher = _dispatcher(DispatchLimits(max_queue=MAX_QUEUE))
+        with self.assertRaises(DispatchLimitExceeded) as raised:
+            dispatcher.emit_many(_events())
+        self.assertEqual(raised.exception.limit, "queue")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.coalescing import EventCoalescer
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.limits import DispatchLimits
+from src.event_router.scheduling import SchedulingMode
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+    SkillHitMessage,
+)
+
+THREADS = 8
+ROUNDS = 50
+
+
+class _SlowDamage(EventHandler[SkillHitMessage]):
+    """每次命中派生一个生命值事件，产出前后让出 GIL 以便线程交错。"""
+
+    type_exact = True
+
+    def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        # 队列为空时让出 GIL，其他线程此时开始的批次会看到空队列
+        time.sleep(0.0005)
+        message = event.event_message
+        yield Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(
+                player_id=message.target_id, value=message.damage
+            ),
+        )
+        # 派生事件入队后再次让出 GIL，让其他线程从同一队列出队
+        time.sleep(0.0005)
+
+
+def _owner(event: EventABC[BaseEventMessage]) -> str:
+    message = event.event_message
+    if isinstance(message, SkillHitMessage):
+        return message.target_id
+    return message.player_id
+
+
+class ConcurrentEmitTest(unittest.TestCase):
+    def test_concurrent_emit_many_keeps_batches_apart(self) -> None:
+        tree = EventStateTree(EventBranchNode("root"))
+        tree.compile()
+        registry = EventHandlerRegistry()
+        registry.register(SkillEventTypes.ON_HIT, _SlowDamage())
+        dispatcher = EventDispatcher(tree, registry)
+
+        barrier = threading.Barrier(THREADS)
+
+        def worker(index: int) -> list[list[EventABC[BaseEventMessage]]]:
+            barrier.wait()
+            # 单个根事件的批次在处理器运行时队列为空，最容易被其他线程复用
+            return [
+                dispatcher.emit_many(
+                    [
+                        Event(
+                            SkillEventTypes.ON_HIT,
+                            SkillHitMessage(
+                                skill_id="nova", target_id=f"player-{index}", damage=hit
+                            ),
+                        )
+                    ]
+                )[0]
+                for hit in range(ROUNDS)
+            ]
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            outcomes = list(pool.map(worker, range(THREADS)))
+
+        for index in range(THREADS):
+            results = outcomes[index]
+            self.assertEqual(len(results), ROUNDS)
+            for hit, processed in enumerate(results):
+                self.assertEqual(len(processed), 2)
+                self.assertEqual(
+                    {_owner(event) for event in processed}, {f"player-{index}"}
+                )
+                self.assertEqual(processed[1].event_message.value, hit)
+
+    def test_reentrant_emit_many_uses_a_separate_queue(self) -> None:
+        tree = EventStateTree(EventBranchNode("root"))
+        tree.compile()
+        registry = EventHandlerRegistry()
+        dispatcher = EventDispatcher(tree, registry)
+        nested: list[list[list[EventABC[BaseEventMessage]]]] = []
+
+        class _Nested(EventHandler[SkillHitMessage]):
+            type_exact = True
+
+            def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+                return True
+
+            def handle(
+                self, event: EventABC[SkillHitMessage], context: EventContext
+            ) -> Iterable[EventABC[BaseEventMessage]]:
+                message = event.event_message
+                health = Event(
+                    EventTypes.PLAYER_HEALTH_CHANGED,
+                    PlayerHealthChangedMessage(
+                        player_id=message.target_id, value=message.damage
+                    ),
+                )
+                nested.append(dispatcher.emit_many([health]))
+                return ()
+
+        registry.register(SkillEventTypes.ON_HIT, _Nested())
+        hits = [
+            Event(
+                SkillEventTypes.ON_HIT,
+                SkillHitMessage(skill_id="nova", target_id="player-1", damage=hit),
+            )
+            for hit in range(3)
+        ]
+        results = dispatcher.emit_many(hits)
+        self.assertEqual([len(processed) for processed in results], [1, 1, 1])
+        self.assertEqual([len(inner[0]) for inner in nested], [1, 1, 1])
+
+
+class IterEmitTest(unittest.TestCase):
+    def test_unsupported_configurations_raise(self) -> None:
+        tree = EventStateTree(EventBranchNode("root"))
+        tree.compile()
+        health = Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage(player_id="player-1", value=1),
+        )
+        for options in (
+            {"scheduling": SchedulingMode.PRIORITY},
+            {"limits": DispatchLimits(max_queue=8)},
+            {"coalescing": EventCoalescer()},
+        ):
+            with self.subTest(options=options):
+                dispatcher = EventDispatcher(tree, EventHandlerRegistry(), **options)
+                with self.assertRaises(ValueError):
+                    list(dispatcher.iter_emit(health))
+        dispatcher = EventDispatcher(
+            tree, EventHandlerRegistry(), limits=DispatchLimits(max_depth=1)
+        )
+        self.assertEqual(list(dispatcher.iter_emit(health)), [health])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import os
+import unittest
+
+from src.events import (
+    CounterIdGenerator,
+    PlayerHealthChangedMessage,
+    SnowflakeIdGenerator,
+    get_event_id_generator,
+)
+
+
+class EventIdTest(unittest.TestCase):
+    def test_default_event_id_is_a_plain_str(self) -> None:
+        message = PlayerHealthChangedMessage(player_id="player-1", value=1)
+        self.assertIs(type(message.event_id), str)
+        self.assertEqual(json.loads(json.dumps(message.event_id)), message.event_id)
+        self.assertEqual(
+            message.model_validate_json(message.model_dump_json()).event_id,
+            message.event_id,
+        )
+
+    def test_counter_ids_are_unique_and_prefixed(self) -> None:
+        generator = CounterIdGenerator("node")
+        ids = [generator() for _ in range(1000)]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids[:2], ["node-1", "node-2"])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "需要 os.fork")
+    def test_forked_child_uses_a_new_prefix(self) -> None:
+        generator = get_event_id_generator()
+        parent_id = generator()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.write(write_end, str(generator()).encode())
+            os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end, "rb") as pipe:
+            child_id = pipe.read().decode()
+        os.waitpid(pid, 0)
+        self.assertNotEqual(child_id.rsplit("-", 1)[0], parent_id.rsplit("-", 1)[0])
+
+    def test_snowflake_requires_a_node_id(self) -> None:
+        with self.assertRaises(TypeError):
+            SnowflakeIdGenerator()  # type: ignore[call-arg]
+        with self.assertRaises(ValueError):
+            SnowflakeIdGenerator(1 << SnowflakeIdGenerator.NODE_BITS)
+
+        ticks = iter([1_700_000_000.0] * 5000)
+        generator = SnowflakeIdGenerator(3, clock=lambda: next(ticks))
+        ids = [generator() for _ in range(5000)]
+        self.assertEqual(ids, sorted(set(ids)))
+        node_mask = (1 << SnowflakeIdGenerator.NODE_BITS) - 1
+        self.assertEqual(ids[0] >> SnowflakeIdGenerator.SEQUENCE_BITS & node_mask, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import unittest
+
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    Always,
+    DynamicLeafNode,
+    EventBranchNode,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+)
+
+
+def _row(listen_event: object) -> LeafConfiguration:
+    return LeafConfiguration(listen_event=listen_event, condition=Always(), actions=[])
+
+
+class ChangeLogTest(unittest.TestCase):
+    def test_change_log_is_trimmed(self) -> None:
+        repo = InMemoryEventConfigRepository(max_change_log=2)
+        for version in range(1, 11):
+            repo.replace(f"node-{version % 5}", [_row(SkillEventTypes.ON_HIT)])
+            self.assertLessEqual(len(repo._change_log), 4)
+        self.assertEqual(repo.changes_since(9), (10, frozenset({"node-0"})))
+        self.assertEqual(repo.changes_since(10), (10, frozenset()))
+
+    def test_reader_behind_the_log_gets_every_node(self) -> None:
+        repo = InMemoryEventConfigRepository(max_change_log=2)
+        for version in range(1, 11):
+            repo.replace(f"node-{version % 5}", [_row(SkillEventTypes.ON_HIT)])
+        expected = frozenset(f"node-{index}" for index in range(5))
+        self.assertEqual(repo.changes_since(0), (10, expected))
+
+    def test_refresh_after_trimming_reloads_changed_leaves(self) -> None:
+        repo = InMemoryEventConfigRepository(max_change_log=1)
+        repo.register("leaf", _row(SkillEventTypes.ON_HIT))
+        root = EventBranchNode("root")
+        leaf = DynamicLeafNode("leaf", repo)
+        root.add_transition(SkillEventTypes.ON_HIT, EventTransition(Always(), leaf))
+        tree = EventStateTree(root)
+        tree.compile()
+        for _ in range(3):
+            repo.register("other", _row(SkillEventTypes.ON_HIT))
+        repo.register("leaf", _row(SkillEventTypes.ON_HIT))
+        self.assertEqual(tree.refresh(), frozenset({"leaf"}))
+        self.assertEqual(len(leaf.snapshot.configurations), 2)
+
+
+class RefreshRebuildTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.repo = InMemoryEventConfigRepository()
+        self.repo.register("hits", _row(SkillEventTypes.ON_HIT))
+        self.repo.register("health", _row(EventTypes.PLAYER_HEALTH_CHANGED))
+        root = EventBranchNode("root")
+        for event_type, node_id in (
+            (SkillEventTypes.ON_HIT, "hits"),
+            (EventTypes.PLAYER_HEALTH_CHANGED, "health"),
+        ):
+            root.add_transition(
+                event_type,
+                EventTransition(Always(), DynamicLeafNode(node_id, self.repo)),
+            )
+        self.tree = EventStateTree(root)
+        self.tree.compile()
+
+    def test_unaffected_routes_are_kept(self) -> None:
+        hits = self.tree._compiled[SkillEventTypes.ON_HIT]
+        health = self.tree._compiled[EventTypes.PLAYER_HEALTH_CHANGED]
+        self.repo.register("health", _row(EventTypes.PLAYER_HEALTH_CHANGED))
+        self.assertEqual(self.tree.refresh(), frozenset({"health"}))
+        self.assertIs(self.tree._compiled[SkillEventTypes.ON_HIT], hits)
+        rebuilt = self.tree._compiled[EventTypes.PLAYER_HEALTH_CHANGED]
+        self.assertIsNot(rebuilt, health)
+        self.assertEqual(len(rebuilt[0].index.configurations), 2)
+
+    def test_event_types_left_by_a_leaf_are_rebuilt(self) -> None:
+        self.repo.replace("hits", [_row(EventTypes.PLAYER_HEALTH_CHANGED)])
+        self.tree.refresh()
+        # 分支仍监听技能命中，但叶子不再有对应配置
+        self.assertEqual(self.tree._compiled[SkillEventTypes.ON_HIT], ())
+        self.assertEqual(self.tree._compiled, self.tree._build_table())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import unittest
+from typing import Iterable, Iterator
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    CallableCondition,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    SkillHitMessage,
+)
+from src.events.instrumentation import (
+    Instrumentation,
+    disable_instrumentation,
+    enable_instrumentation,
+)
+from src.events.tree import _TimedAction, _TimedCondition
+
+
+class TimedIterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0
+        self.instrumentation = Instrumentation(clock=lambda: self.now)
+        self.started = False
+
+    def _produce(self, count: int) -> Iterator[int]:
+        self.started = True
+        for item in range(count):
+            self.now += 5
+            yield item
+
+    def test_results_stay_lazy_and_consumer_time_is_excluded(self) -> None:
+        timed = self.instrumentation.timed_iter("action", "produce", self._produce)
+        produced = timed(3)
+        self.assertFalse(self.started)
+        for _ in produced:
+            # 消费方的耗时不计入
+            self.now += 100
+        histogram = self.instrumentation.histogram("action", "produce")
+        self.assertEqual((histogram.count, histogram.total_ns), (1, 15))
+
+    def test_closed_generator_is_recorded(self) -> None:
+        timed = self.instrumentation.timed_iter("action", "produce", self._produce)
+        produced = timed(3)
+        next(produced)
+        self.now += 100
+        produced.close()
+        histogram = self.instrumentation.histogram("action", "produce")
+        self.assertEqual((histogram.count, histogram.total_ns), (1, 5))
+
+
+class _Counting(EventHandler[SkillHitMessage]):
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        self.calls += 1
+        return ()
+
+
+def _never(event: EventABC[BaseEventMessage], context: EventContext) -> bool:
+    return False
+
+
+def _no_events(
+    event: EventABC[BaseEventMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    return ()
+
+
+class RecompileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        repo = InMemoryEventConfigRepository()
+        repo.register(
+            "leaf",
+            LeafConfiguration(
+                listen_event=SkillEventTypes.ON_HIT,
+                condition=Always(),
+                actions=[CallableAction(_no_events)],
+            ),
+        )
+        root = EventBranchNode("root")
+        root.add_transition(
+            SkillEventTypes.ON_HIT,
+            EventTransition(CallableCondition(_never), EventBranchNode("idle")),
+        )
+        root.add_transition(
+            SkillEventTypes.ON_HIT,
+            EventTransition(Always(), DynamicLeafNode("leaf", repo)),
+        )
+        self.tree = EventStateTree(root)
+        self.tree.compile()
+        self.handler = _Counting()
+        registry = EventHandlerRegistry()
+        registry.register(SkillEventTypes.ON_HIT, self.handler)
+        self.dispatcher = EventDispatcher(self.tree, registry)
+        self.addCleanup(disable_instrumentation)
+
+    def _emit(self) -> None:
+        self.dispatcher.emit(
+            Event(
+                SkillEventTypes.ON_HIT,
+                SkillHitMessage(skill_id="nova", target_id="player-1", damage=1),
+            )
+        )
+
+    def _wrapped(self) -> list[object]:
+        wrapped: list[object] = []
+        for route in self.tree._compiled[SkillEventTypes.ON_HIT]:
+            wrapped.extend(
+                condition
+                for condition, _ in route.guards
+                if isinstance(condition, _TimedCondition)
+            )
+            if route.index is not None:
+                for config in route.index.configurations:
+                    wrapped.extend(
+                        action
+                        for action in config.actions
+                        if isinstance(action, _TimedAction)
+                    )
+        return wrapped
+
+    def test_enable_and_disable_rebuild_dispatch_paths(self) -> None:
+        self.assertEqual(self._wrapped(), [])
+        instrumentation = enable_instrumentation()
+        self.assertNotEqual(self._wrapped(), [])
+        self._emit()
+        kinds = {spot.kind for spot in instrumentation.hot_spots()}
+        self.assertEqual(kinds, {"handler", "node", "condition", "action"})
+
+        self.assertIs(disable_instrumentation(), instrumentation)
+        self.assertEqual(self._wrapped(), [])
+        instrumentation.reset()
+        self._emit()
+        self.assertEqual(instrumentation.hot_spots(), [])
+        self.assertEqual(self.handler.calls, 2)
+
+    def test_tree_compiled_while_enabled_is_instrumented(self) -> None:
+        instrumentation = enable_instrumentation()
+        self.tree.compile()
+        self.assertNotEqual(self._wrapped(), [])
+        self._emit()
+        self.assertIn("leaf", {spot.name for spot in instrumentation.hot_spots("node")})
+
+
+if __name__ == "__main__":
+    unittest.main()
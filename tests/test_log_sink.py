@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import io
+import threading
+import unittest
+
+from src.event_handlers.log_sink import EventLogSink
+
+
+def _sink(**options: object) -> tuple[EventLogSink, io.StringIO]:
+    stream = io.StringIO()
+    # 写出间隔足够长，只在显式 flush 时写出
+    return EventLogSink(stream, flush_interval=60, **options), stream
+
+
+class EventLogSinkTest(unittest.TestCase):
+    def test_mutable_arguments_are_snapshotted(self) -> None:
+        sink, stream = _sink()
+        attributes = {"tick_count": 1}
+        sink.log("debug", "属性: {}", attributes)
+        attributes["tick_count"] = 2
+        sink.close()
+        self.assertEqual(stream.getvalue(), "[debug] 属性: {'tick_count': 1}\n")
+
+    def test_log_after_close_is_dropped_and_counted(self) -> None:
+        sink, stream = _sink()
+        sink.log("tag", "before")
+        sink.close()
+        self.assertFalse(sink.log("tag", "after"))
+        self.assertEqual(sink.dropped, 1)
+        self.assertEqual(stream.getvalue(), "[tag] before\n")
+
+    def test_concurrent_drops_are_all_counted(self) -> None:
+        sink, _ = _sink(max_buffered=1)
+        sink.log("tag", "fill")
+        threads, per_thread = 8, 2_000
+
+        def drop() -> None:
+            for _ in range(per_thread):
+                sink.log("tag", "drop")
+
+        workers = [threading.Thread(target=drop) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(sink.dropped, threads * per_thread)
+        sink.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.partitioned import PartitionedDispatcher, partition_of
+from src.event_types import SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    SkillHitMessage,
+)
+
+CALLERS = 4
+HITS = 20
+
+
+class _Exclusive(EventHandler[SkillHitMessage]):
+    """记录处理顺序，并检测是否有两个线程同时进入同一个调度器。"""
+
+    type_exact = True
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.overlaps = 0
+        self.seen: list[tuple[int, int]] = []
+        self._lock = threading.Lock()
+
+    def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        with self._lock:
+            self.active += 1
+            self.overlaps += self.active > 1
+        time.sleep(0.0005)
+        message = event.event_message
+        self.seen.append((int(message.skill_id), message.damage))
+        with self._lock:
+            self.active -= 1
+        return ()
+
+
+class PartitionedDispatcherTest(unittest.TestCase):
+    def test_partition_of_is_stable_across_processes(self) -> None:
+        keys = ["player-1", "player-2", b"raw", 42, ("zone", 3)]
+        script = (
+            "from src.event_router.partitioned import partition_of;"
+            f"print([partition_of(key, 7) for key in {keys!r}])"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            for seed in ("1", "2")
+        }
+        self.assertEqual(outputs, {f"{[partition_of(key, 7) for key in keys]}\n"})
+        self.assertEqual(partition_of("player-1", 7), zlib.crc32(b"player-1") % 7)
+
+    def test_overlapping_calls_do_not_share_a_partition(self) -> None:
+        handlers: list[_Exclusive] = []
+
+        def factory() -> EventDispatcher:
+            tree = EventStateTree(EventBranchNode("root"))
+            tree.compile()
+            registry = EventHandlerRegistry()
+            handler = _Exclusive()
+            handlers.append(handler)
+            registry.register(SkillEventTypes.ON_HIT, handler)
+            return EventDispatcher(tree, registry)
+
+        def call(caller: int) -> None:
+            # 所有事件同键，落在同一个分区
+            dispatcher.emit_many(
+                Event(
+                    SkillEventTypes.ON_HIT,
+                    SkillHitMessage(skill_id=str(caller), target_id="p", damage=hit),
+                )
+                for hit in range(HITS)
+            )
+
+        with PartitionedDispatcher(factory, workers=2) as dispatcher:
+            with ThreadPoolExecutor(max_workers=CALLERS) as callers:
+                list(callers.map(call, range(CALLERS)))
+
+        self.assertEqual(sum(handler.overlaps for handler in handlers), 0)
+        (busy,) = [handler for handler in handlers if handler.seen]
+        self.assertEqual(len(busy.seen), CALLERS * HITS)
+        for caller in range(CALLERS):
+            damages = [damage for owner, damage in busy.seen if owner == caller]
+            self.assertEqual(damages, list(range(HITS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.events.serialization import JsonRowCodec, LeafConfigLoader
+
+DOCUMENT = json.dumps(
+    {
+        "skill.fireball": [
+            {
+                "listen_event": "skill.on_hit",
+                "condition": {"compare": [{"field": "damage"}, ">", 10]},
+            }
+        ]
+    }
+)
+
+
+class PlanCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _load(self) -> list[str]:
+        loaded = LeafConfigLoader(cache_dir=self.cache_dir).load(DOCUMENT)
+        return [repr(row.condition) for row in loaded["skill.fireball"]]
+
+    def test_corrupt_cache_is_rebuilt(self) -> None:
+        expected = self._load()
+        (cache_file,) = self.cache_dir.glob("*.plan")
+        for corrupt in (b"", cache_file.read_bytes()[:10], b"not a plan"):
+            cache_file.write_bytes(corrupt)
+            self.assertEqual(self._load(), expected)
+        # 重新生成的缓存可以再次命中，且不留下临时文件
+        self.assertEqual(self._load(), expected)
+        self.assertEqual(
+            [path.name for path in self.cache_dir.iterdir()], [cache_file.name]
+        )
+
+    def test_cache_is_not_unpickled(self) -> None:
+        expected = self._load()
+        (cache_file,) = self.cache_dir.glob("*.plan")
+        # 能写缓存目录的人写入恶意 pickle 时不应执行其中的代码
+        cache_file.write_bytes(pickle.dumps(_Exploit()))
+        self.assertEqual(self._load(), expected)
+        self.assertEqual(_EXPLOITED, [])
+
+
+_EXPLOITED: list[str] = []
+
+
+def _mark_exploited(tag: str) -> None:
+    _EXPLOITED.append(tag)
+
+
+class _Exploit:
+    def __reduce__(self) -> tuple[object, ...]:
+        return _mark_exploited, ("unpickled",)
+
+
+class JsonRowCodecTest(unittest.TestCase):
+    def test_decode_reuses_parsed_rows(self) -> None:
+        codec = JsonRowCodec()
+        row = codec.decode(
+            json.dumps(json.loads(DOCUMENT)["skill.fireball"][0]).encode()
+        )
+        payload = codec.encode(row)
+        self.assertIs(codec.decode(payload), codec.decode(bytes(payload)))
+        self.assertEqual(codec.decode(payload).source, row.source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import unittest
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry, compile_subscription
+from src.event_types import EventTypes, SkillEventTypes, all_event_types
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventContext,
+    PlayerCreatedMessage,
+)
+
+
+class _Recording(EventHandler[BaseEventMessage]):
+    type_exact = True
+
+    def __init__(self, name: str, seen: list[str]) -> None:
+        self.name = name
+        self.seen = seen
+
+    def supports(self, event: EventABC[BaseEventMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        self.seen.append(self.name)
+        return ()
+
+
+class CompileSubscriptionTest(unittest.TestCase):
+    def _matched(self, subscription: object) -> set[object]:
+        matches = compile_subscription(subscription)  # type: ignore[arg-type]
+        return {event_type for event_type in all_event_types() if matches(event_type)}
+
+    def test_wildcards_match_every_event_type(self) -> None:
+        for subscription in ("*", EventTypes.DEFAULT):
+            with self.subTest(subscription=subscription):
+                self.assertEqual(self._matched(subscription), set(all_event_types()))
+
+    def test_prefix_matches_whole_segments(self) -> None:
+        self.assertEqual(
+            self._matched("player.*"),
+            {
+                EventTypes.PLAYER_CREATED,
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                EventTypes.PLAYER_STATE_CHANGED,
+            },
+        )
+        self.assertEqual(self._matched("skill.on_hit.*"), set())
+        self.assertEqual(self._matched("play.*"), set())
+
+    def test_exact_subscriptions(self) -> None:
+        for subscription in (SkillEventTypes.ON_HIT, "skill.on_hit"):
+            with self.subTest(subscription=subscription):
+                self.assertEqual(self._matched(subscription), {SkillEventTypes.ON_HIT})
+
+    def test_unsupported_patterns_are_rejected(self) -> None:
+        for subscription in ("player*", "*.created", "player.*.changed"):
+            with self.subTest(subscription=subscription), self.assertRaises(ValueError):
+                compile_subscription(subscription)
+
+
+class HandlerChainTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.seen: list[str] = []
+        self.registry = EventHandlerRegistry()
+
+    def _register(self, subscription: object, name: str) -> None:
+        self.registry.register(
+            subscription,  # type: ignore[arg-type]
+            _Recording(name, self.seen),
+        )
+
+    def _names(self, event_type: object) -> list[str]:
+        return [handler.name for handler in self.registry.chain(event_type)]  # type: ignore[arg-type,attr-defined]
+
+    def test_chain_keeps_registration_order_across_subscription_kinds(self) -> None:
+        self._register("player.*", "prefix")
+        self._register(EventTypes.PLAYER_CREATED, "exact")
+        self._register(SkillEventTypes.ON_HIT, "other")
+        self._register("*", "wildcard")
+        self._register(EventTypes.PLAYER_CREATED, "exact-again")
+        self.assertEqual(
+            self._names(EventTypes.PLAYER_CREATED),
+            ["prefix", "exact", "wildcard", "exact-again"],
+        )
+        self.assertEqual(self._names(SkillEventTypes.ON_HIT), ["other", "wildcard"])
+
+    def test_register_invalidates_cached_chains(self) -> None:
+        event = Event(
+            EventTypes.PLAYER_CREATED,
+            PlayerCreatedMessage(player_id="p", player_name="Alice"),
+        )
+        self._register(EventTypes.PLAYER_CREATED, "first")
+        # 填充各类缓存
+        list(self.registry.handle(event, EventContext()))
+        self.registry.split_for(EventTypes.PLAYER_CREATED)
+        self.registry.async_split_for(EventTypes.PLAYER_CREATED)
+
+        self._register("player.*", "second")
+        self.seen.clear()
+        list(self.registry.handle(event, EventContext()))
+        self.assertEqual(self.seen, ["first", "second"])
+        self.seen.clear()
+        list(self.registry.handle_unbatched(event, EventContext()))
+        self.assertEqual(self.seen, ["first", "second"])
+        self.assertEqual(len(self.registry.handlers_for(EventTypes.PLAYER_CREATED)), 2)
+        self.assertEqual(
+            len(self.registry.async_split_for(EventTypes.PLAYER_CREATED)[0]), 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import unittest
+from typing import Iterable
+
+from src.event_handlers.base import EventHandler
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.limits import DispatchLimits, OverflowPolicy
+from src.event_router.scheduling import SchedulingMode
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+    PlayerStateChangedMessage,
+    SkillHitMessage,
+)
+
+CHILDREN = 5
+GRANDCHILDREN = 3
+
+
+class _SpawnChildren(EventHandler[SkillHitMessage]):
+    type_exact = True
+
+    def supports(self, event: EventABC[SkillHitMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[SkillHitMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        return [
+            Event(
+                EventTypes.PLAYER_HEALTH_CHANGED,
+                PlayerHealthChangedMessage(player_id=str(index), value=index),
+            )
+            for index in range(CHILDREN)
+        ]
+
+
+class _SpawnGrandchildren(EventHandler[PlayerHealthChangedMessage]):
+    type_exact = True
+
+    def supports(self, event: EventABC[PlayerHealthChangedMessage]) -> bool:
+        return True
+
+    def handle(
+        self, event: EventABC[PlayerHealthChangedMessage], context: EventContext
+    ) -> Iterable[EventABC[BaseEventMessage]]:
+        parent = event.event_message.value
+        return [
+            Event(
+                EventTypes.PLAYER_STATE_CHANGED,
+                PlayerStateChangedMessage(player_id=str(parent), state=str(index)),
+            )
+            for index in range(GRANDCHILDREN)
+        ]
+
+
+def _position(event: EventABC[BaseEventMessage]) -> tuple[int, int]:
+    """事件在先序遍历中的排序键：(子事件序号, 孙事件序号)，子事件自身为 -1。"""
+    message = event.event_message
+    if isinstance(message, PlayerHealthChangedMessage):
+        return (message.value, -1)
+    assert isinstance(message, PlayerStateChangedMessage)
+    return (int(message.player_id), int(message.state))
+
+
+class DepthFirstDropOldestTest(unittest.TestCase):
+    def test_eviction_keeps_pre_order(self) -> None:
+        tree = EventStateTree(EventBranchNode("root"))
+        tree.compile()
+        registry = EventHandlerRegistry()
+        registry.register(SkillEventTypes.ON_HIT, _SpawnChildren())
+        registry.register(EventTypes.PLAYER_HEALTH_CHANGED, _SpawnGrandchildren())
+        for max_queue in range(1, CHILDREN + GRANDCHILDREN - 1):
+            with self.subTest(max_queue=max_queue):
+                dispatcher = EventDispatcher(
+                    tree,
+                    registry,
+                    limits=DispatchLimits(
+                        max_queue=max_queue, policy=OverflowPolicy.DROP_OLDEST
+                    ),
+                    scheduling=SchedulingMode.DFS,
+                )
+                processed = dispatcher.emit(
+                    Event(
+                        SkillEventTypes.ON_HIT,
+                        SkillHitMessage(skill_id="nova", target_id="p", damage=1),
+                    )
+                )
+                self.assertEqual(processed[0].event_type, SkillEventTypes.ON_HIT)
+                positions = [_position(event) for event in processed[1:]]
+                # 存活下来的事件仍按先序排列：兄弟之间保持产出顺序，
+                # 孙事件紧跟在其父事件之后
+                self.assertEqual(positions, sorted(positions))
+                self.assertGreater(dispatcher.overflow_counts["queue"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
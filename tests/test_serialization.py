@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import unittest
+
+from src.event_types import SkillEventTypes
+from src.events import Event, EventContext, SkillHitMessage
+from src.events.serialization import ConfigFormatError, LeafConfigLoader
+
+HIT = Event(
+    SkillEventTypes.ON_HIT,
+    SkillHitMessage(skill_id="nova", target_id="player-1", damage=20),
+)
+
+
+def _row(condition: object) -> dict[str, object]:
+    return {"listen_event": "skill.on_hit", "condition": condition}
+
+
+class PlanConditionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loader = LeafConfigLoader()
+
+    def _matches(self, condition: object) -> bool:
+        row = self.loader.load_row(_row(condition))
+        return row.condition.evaluate(HIT, EventContext())
+
+    def test_always_follows_its_value(self) -> None:
+        self.assertTrue(self._matches({"always": True}))
+        self.assertFalse(self._matches({"always": False}))
+
+    def test_rejects_malformed_specs(self) -> None:
+        for condition in (
+            {"always": "false"},
+            {"always": 1},
+            {"all": [{"always": True}], "any": [{"always": True}]},
+            {"always": True, "compare": [{"field": "damage"}, ">", 1]},
+            {"all": {"always": True}},
+            {"is_instance": 3},
+            {"is_instance": ["SkillHitMessage", 3]},
+            {"builder": 3},
+            {"builder": "missing", "params": []},
+            {"unknown": True},
+            {},
+            [],
+        ):
+            with self.subTest(condition=condition):
+                with self.assertRaises(ConfigFormatError):
+                    self.loader.load_row(_row(condition))
+
+    def test_accepts_nested_specs(self) -> None:
+        condition = {
+            "all": [
+                {"is_instance": "SkillHitMessage"},
+                {"not": {"compare": [{"field": "damage"}, "<", 10]}},
+                {
+                    "any": [
+                        {"always": False},
+                        {"compare": [{"field": "damage"}, "==", 20]},
+                    ]
+                },
+            ]
+        }
+        self.assertTrue(self._matches(condition))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from src.event_handlers.registry import EventHandlerRegistry
+from src.event_router.dispatcher import EventDispatcher
+from src.event_router.timers import TickScheduler, TimerFactoryError
+from src.event_types import EventTypes
+from src.events import (
+    BaseEventMessage,
+    Event,
+    EventABC,
+    EventBranchNode,
+    EventStateTree,
+    PlayerHealthChangedMessage,
+)
+
+
+def _scheduler() -> TickScheduler:
+    tree = EventStateTree(EventBranchNode("root"))
+    tree.compile()
+    return TickScheduler(
+        EventDispatcher(tree, EventHandlerRegistry()), emit_tick_events=False
+    )
+
+
+def _health(value: int) -> EventABC[BaseEventMessage]:
+    return Event(
+        EventTypes.PLAYER_HEALTH_CHANGED,
+        PlayerHealthChangedMessage(player_id="player-1", value=value),
+    )
+
+
+class TickSchedulerTest(unittest.TestCase):
+    def test_schedule_racing_tick_still_fires(self) -> None:
+        scheduler = _scheduler()
+        handles = []
+        # 持有调度器的锁，让 schedule 在登记前等待，期间模拟 tick() 推进并取走
+        # 下一个 tick 的桶
+        with scheduler._lock:
+            thread = threading.Thread(
+                target=lambda: handles.append(scheduler.schedule(_health(1)))
+            )
+            thread.start()
+            time.sleep(0.05)
+            scheduler._tick += 1
+            scheduler._buckets.pop(scheduler._tick, None)
+        thread.join()
+
+        (timer,) = handles
+        self.assertEqual(timer.due, scheduler.current_tick + 1)
+        results = scheduler.tick()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(scheduler), 0)
+
+    def test_factory_error_keeps_other_results(self) -> None:
+        scheduler = _scheduler()
+
+        def broken(tick: int) -> EventABC[BaseEventMessage]:
+            raise KeyError(tick)
+
+        scheduler.schedule(_health(1))
+        scheduler.schedule(broken)
+        scheduler.schedule(_health(2))
+
+        with self.assertRaises(TimerFactoryError) as caught:
+            scheduler.tick()
+        error = caught.exception
+        self.assertIsInstance(error, ExceptionGroup)
+        self.assertEqual([type(e) for e in error.exceptions], [KeyError])
+        self.assertEqual(
+            [processed[0].event_message.value for processed in error.results], [1, 2]
+        )
+        self.assertEqual(len(scheduler), 0)
+
+        # except* 拆分出的子组仍带有分派结果
+        try:
+            scheduler.schedule(broken)
+            scheduler.tick()
+        except* KeyError as group:
+            self.assertIsInstance(group, TimerFactoryError)
+            self.assertEqual(group.results, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
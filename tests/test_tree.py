@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import unittest
+from typing import Iterable
+
+from src.event_types import EventTypes, SkillEventTypes
+from src.events import (
+    Always,
+    BaseEventMessage,
+    CallableAction,
+    CallableCondition,
+    DynamicLeafNode,
+    Event,
+    EventABC,
+    EventBatch,
+    EventBranchNode,
+    EventContext,
+    EventStateTree,
+    EventTransition,
+    InMemoryEventConfigRepository,
+    LeafConfiguration,
+    PlayerHealthChangedMessage,
+    SkillHitMessage,
+)
+from src.events.instrumentation import (
+    disable_instrumentation,
+    enable_instrumentation,
+    get_instrumentation,
+)
+
+LEAVES = 3
+ROWS = 4
+
+
+class _CountingGuard:
+    def __init__(self, result: bool) -> None:
+        self.result = result
+        self.calls = 0
+
+    def __call__(
+        self, event: EventABC[BaseEventMessage], context: EventContext
+    ) -> bool:
+        self.calls += 1
+        return self.result
+
+
+def _emit_health(
+    event: EventABC[SkillHitMessage], context: EventContext
+) -> Iterable[EventABC[BaseEventMessage]]:
+    return [
+        Event(
+            EventTypes.PLAYER_HEALTH_CHANGED,
+            PlayerHealthChangedMessage.compact(
+                player_id=event.event_message.target_id, value=0
+            ),
+        )
+    ]
+
+
+def _hit(damage: int = 1) -> Event[SkillHitMessage]:
+    return Event(
+        SkillEventTypes.ON_HIT,
+        SkillHitMessage(skill_id="nova", target_id="player-1", damage=damage),
+    )
+
+
+class SharedGuardTest(unittest.TestCase):
+    def _tree(self, outer: bool, inner: bool) -> EventStateTree:
+        """root -[outer]-> skills -[inner]-> leaf-0..n，以及一条恒真的旁路叶子。"""
+        repo = InMemoryEventConfigRepository()
+        skills = EventBranchNode("skills")
+        for index in range(LEAVES):
+            node_id = f"leaf-{index}"
+            repo.register(
+                node_id,
+                LeafConfiguration(
+                    listen_event=SkillEventTypes.ON_HIT,
+                    condition=Always(),
+                    actions=[CallableAction(_emit_health)],
+                ),
+            )
+            skills.add_transition(
+                SkillEventTypes.ON_HIT,
+                EventTransition(
+                    CallableCondition(self.inner), DynamicLeafNode(node_id, repo)
+                )
+                if index == LEAVES - 1
+                else EventTransition(Always(), DynamicLeafNode(node_id, repo)),
+            )
+        repo.register(
+            "bypass",
+            LeafConfiguration(
+                listen_event=SkillEventTypes.ON_HIT,
+                condition=Always(),
+                actions=[CallableAction(_emit_health)],
+            ),
+        )
+        root = EventBranchNode("root")
+        root.add_transition(
+            SkillEventTypes.ON_HIT,
+            EventTransition(CallableCondition(self.outer), skills),
+        )
+        root.add_transition(
+            SkillEventTypes.ON_HIT,
+            EventTransition(Always(), DynamicLeafNode("bypass", repo)),
+        )
+        self.outer.result = outer
+        self.inner.result = inner
+        tree = EventStateTree(root)
+        tree.compile()
+        return tree
+
+    def setUp(self) -> None:
+        self.outer = _CountingGuard(True)
+        self.inner = _CountingGuard(True)
+
+    def test_branch_guard_runs_once_per_event(self) -> None:
+        for outer, inner, produced in (
+            (True, True, LEAVES + 1),
+            (True, False, LEAVES),
+            (False, True, 1),
+        ):
+            with self.subTest(outer=outer, inner=inner):
+                tree = self._tree(outer, inner)
+                for dispatch in (tree.dispatch, tree.iter_dispatch):
+                    self.outer.calls = self.inner.calls = 0
+                    results = list(dispatch(_hit()))
+                    self.assertEqual(len(results), produced)
+                    self.assertEqual(self.outer.calls, 1)
+                    self.assertEqual(self.inner.calls, 1 if outer else 0)
+                    paths = [context.state_path[-1] for _, context in results]
+                    self.assertEqual(paths[-1], "bypass")
+
+    def test_branch_guard_runs_once_per_row_in_batches(self) -> None:
+        tree = self._tree(True, True)
+        batch = EventBatch.from_events([_hit(damage) for damage in range(ROWS)])
+        results = tree.dispatch_batch(batch)
+        self.assertEqual(self.outer.calls, ROWS)
+        self.assertEqual(self.inner.calls, ROWS)
+        self.assertEqual(len(results), ROWS * (LEAVES + 1))
+
+    def test_instrumented_tree_keeps_shared_guards(self) -> None:
+        tree = self._tree(True, True)
+        enable_instrumentation()
+        try:
+            self.assertEqual(len(tree.dispatch(_hit())), LEAVES + 1)
+            self.assertEqual(self.outer.calls, 1)
+            spots = {spot.name for spot in get_instrumentation().hot_spots("condition")}
+        finally:
+            disable_instrumentation()
+        self.assertTrue(any(name.startswith("root:") for name in spots), spots)
+
+
+if __name__ == "__main__":
+    unittest.main()